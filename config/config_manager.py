@@ -7,40 +7,58 @@ Centralized configuration management for all paths and settings
 import os
 import configparser
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 class ConfigManager:
     """Centralized configuration manager for Calgary Analytica project."""
     
+    # Resolved once per process and shared by every instance (most extractors create
+    # their own ConfigManager): the project root, and each INI file keyed by its mtime
+    _project_root: Optional[Path] = None
+    _parsed_configs: Dict[Path, Tuple[int, configparser.ConfigParser]] = {}
+    
     def __init__(self, config_file: str = None):
         self.project_root = self._find_project_root()
-        self.config_file = config_file or self.project_root / "config" / "calgary_analytica.ini"
+        self.config_file = Path(config_file) if config_file else self.project_root / "config" / "calgary_analytica.ini"
         self.config = self._load_config()
         
     def _find_project_root(self) -> Path:
         """Auto-detect project root by looking for markers."""
+        if ConfigManager._project_root is not None:
+            return ConfigManager._project_root
+        
         current = Path(__file__).parent.parent  # Start from config directory
         markers = ['CLAUDE.md', '.git', 'requirements.txt', 'data-lake']
         
+        root = None
         while current != current.parent:
             if any((current / marker).exists() for marker in markers):
-                return current
+                root = current
+                break
             current = current.parent
         
         # Fallback to environment variable or default
-        return Path(os.environ.get('CALGARY_ANALYTICA_ROOT', '/home/chris/calgary-analytica'))
+        if root is None:
+            root = Path(os.environ.get('CALGARY_ANALYTICA_ROOT', '/home/chris/calgary-analytica'))
+        
+        ConfigManager._project_root = root
+        return root
     
     def _load_config(self) -> configparser.ConfigParser:
         """Load configuration with interpolation support."""
-        config = configparser.ConfigParser()
-        
-        if self.config_file.exists():
-            config.read(self.config_file)
-        else:
+        if not self.config_file.exists():
             # Create default configuration
             self._create_default_config()
-            config.read(self.config_file)
-            
+        
+        # Re-parse only when the file has changed since it was last read
+        mtime = self.config_file.stat().st_mtime_ns
+        cached = ConfigManager._parsed_configs.get(self.config_file)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        config = configparser.ConfigParser()
+        config.read(self.config_file)
+        ConfigManager._parsed_configs[self.config_file] = (mtime, config)
         return config
     
     def _create_default_config(self):
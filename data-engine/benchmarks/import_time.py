@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Calgary Analytica - CLI Start-up Benchmark
+Times the quick data-engine commands in fresh interpreters and fails if any of them
+gets slower than the budget or starts importing a heavy library at start-up.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Any
+
+DATA_ENGINE_DIR = Path(__file__).parent.parent
+CLI_DIR = DATA_ENGINE_DIR / 'cli'
+
+# Commands that only list files or print status, run as a user would
+QUICK_COMMANDS = {
+    'validate_pending --list': [str(CLI_DIR / 'validate_pending.py'), '--list'],
+    'validate_pending --summary': [str(CLI_DIR / 'validate_pending.py'), '--summary'],
+    'monthly_update --status': [str(CLI_DIR / 'monthly_update.py'), '--status'],
+    'import load_csv_direct': ['-c', f"import sys; sys.path.insert(0, {str(CLI_DIR)!r}); import load_csv_direct"],
+}
+
+# Libraries none of the quick commands should pull in
+HEAVY_MODULES = ['pandas', 'numpy', 'pdfplumber', 'openpyxl', 'requests']
+
+DEFAULT_BUDGET_MS = 100
+
+
+def run_once(args: List[str]) -> Dict[str, Any]:
+    """Run a command under -X importtime, returning wall time and top-level imports."""
+    env = {**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'}
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + args, capture_output=True,
+                            text=True, env=env, cwd=DATA_ENGINE_DIR)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    # importtime lines look like "import time:   self |   cumulative | package.module"
+    imported = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)', line)
+        if match:
+            imported[match.group(4)] = int(match.group(2)) / 1000
+
+    return {'elapsed_ms': elapsed_ms, 'imports': imported, 'returncode': result.returncode,
+            'stderr': result.stderr}
+
+
+def benchmark(command: str, args: List[str], repeat: int) -> Dict[str, Any]:
+    """Best-of-N start-up time for a command and any heavy modules it imported."""
+    runs = [run_once(args) for _ in range(repeat)]
+    best = min(runs, key=lambda r: r['elapsed_ms'])
+    return {
+        'command': command,
+        'best_ms': best['elapsed_ms'],
+        'median_ms': sorted(r['elapsed_ms'] for r in runs)[len(runs) // 2],
+        'heavy': sorted(m for m in HEAVY_MODULES if m in best['imports']),
+        'slowest_imports': sorted(best['imports'].items(), key=lambda kv: -kv[1])[:5],
+        'returncode': best['returncode'],
+        'stderr': best['stderr']
+    }
+
+
+def main():
+    """Benchmark CLI start-up and exit non-zero on a regression."""
+    parser = argparse.ArgumentParser(description="Benchmark data-engine CLI start-up time")
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help=f'Maximum best-of-N start-up time per command (default: {DEFAULT_BUDGET_MS})')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per command (default: 5)')
+    parser.add_argument('--verbose', action='store_true', help='Show the slowest imports per command')
+
+    args = parser.parse_args()
+
+    print("⏱️  Data Engine CLI Start-up Benchmark")
+    print("=" * 50)
+
+    baseline = benchmark('python -c pass', ['-c', 'pass'], args.repeat)
+    print(f"Interpreter baseline: {baseline['best_ms']:.1f} ms")
+
+    failures = []
+    for command, command_args in QUICK_COMMANDS.items():
+        result = benchmark(command, command_args, args.repeat)
+        ok = result['returncode'] == 0 and result['best_ms'] <= args.budget_ms and not result['heavy']
+        print(f"  {'✅' if ok else '❌'} {command}: {result['best_ms']:.1f} ms "
+              f"(median {result['median_ms']:.1f} ms)")
+
+        if result['returncode'] != 0:
+            failures.append(f"{command} exited with {result['returncode']}")
+            last_error = [l for l in result['stderr'].splitlines() if not l.startswith('import time:')][-1:]
+            for line in last_error:
+                print(f"     {line}")
+        if result['best_ms'] > args.budget_ms:
+            failures.append(f"{command} took {result['best_ms']:.1f} ms (budget {args.budget_ms:.0f} ms)")
+        if result['heavy']:
+            failures.append(f"{command} imported {', '.join(result['heavy'])} at start-up")
+        if args.verbose or not ok:
+            for module, cumulative_ms in result['slowest_imports']:
+                print(f"     {cumulative_ms:7.1f} ms  {module}")
+
+    print("=" * 50)
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print(f"✅ All {len(QUICK_COMMANDS)} commands within {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
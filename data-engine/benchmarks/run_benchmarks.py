@@ -0,0 +1,614 @@
+#!/usr/bin/env python3
+"""
+Calgary Analytica - Pipeline Benchmarks
+Times extraction, validation, loading, aggregation and export on synthetic data at 1x,
+10x and 100x, and appends rows/s and peak RSS per stage to a results file so later runs
+can be compared against a baseline.
+
+Each benchmark runs in a fresh interpreter against a scratch workspace (its own config,
+database and validation directories), so nothing under the real project is touched.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import multiprocessing
+import platform
+import resource
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+from urllib.parse import parse_qs, urlparse
+
+DATA_ENGINE_DIR = Path(__file__).parent.parent
+PROJECT_ROOT = DATA_ENGINE_DIR.parent
+SCRIPTS_DIR = PROJECT_ROOT / 'product-engine' / 'dashboard-mvp' / 'scripts'
+
+sys.path.insert(0, str(Path(__file__).parent))
+from synthetic import SCALE_FACTORS, SEED
+
+DEFAULT_RESULTS = Path(__file__).parent / 'results.jsonl'
+
+STAGES = ['extract', 'validate', 'load', 'aggregate', 'export']
+
+# Table DDL for a scratch database: the data-lake schema plus each source's own tables
+SCHEMA_FILES = [
+    PROJECT_ROOT / 'data-lake' / 'schema.sql',
+    DATA_ENGINE_DIR / 'calgary_portal' / '311' / 'create_311_monthly_table.sql',
+    DATA_ENGINE_DIR / 'rentfaster' / 'schema.sql',
+    DATA_ENGINE_DIR / 'cmhc' / 'rent' / 'schema.sql',
+    DATA_ENGINE_DIR / 'calgary_portal' / 'scripts' / 'create_tables.sql',
+]
+
+# schema.sql predates the crime columns added on 2025-06-24 (data-lake/metadata/ddl-history.md)
+CRIME_COLUMNS = [('year', 'INTEGER'), ('ward', 'TEXT'), ('police_district', 'TEXT')]
+
+# Dashboard generators in generate_all_exports.py order (metadata last)
+EXPORT_GENERATORS = {
+    'generate_market_overview': 'MarketOverviewGenerator',
+    'generate_economic_indicators': 'EconomicIndicatorsGenerator',
+    'generate_district_data': 'DistrictDataGenerator',
+    'generate_rate_data': 'RateDataGenerator',
+    'generate_service_requests': 'ServiceRequestsGenerator',
+    'generate_rental_market': 'RentalMarketGenerator',
+    'generate_crime_statistics': 'CrimeStatisticsGenerator',
+    'generate_boundary_tiles': 'BoundaryTilesGenerator',
+    'generate_metadata': 'MetadataGenerator',
+}
+
+
+class Workspace:
+    """Scratch directories, config and database for one scale factor."""
+
+    def __init__(self, root: Path, scale: int):
+        self.root = Path(root)
+        self.scale = scale
+        self.raw_dir = self.root / 'raw'
+        self.validation_dir = self.root / 'validation'
+        self.pending_dir = self.validation_dir / 'pending'
+        self.approved_dir = self.validation_dir / 'approved'
+        self.db_path = self.root / 'calgary_data.db'
+        self.export_dir = self.root / 'exports'
+        self.config_file = self.root / 'calgary_analytica.ini'
+
+    def write_config(self) -> None:
+        """Point every configured path into the workspace."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.config_file.write_text(f"""[project]
+name = calgary-analytica-benchmark
+version = 1.0.0
+
+[database]
+primary_db = {self.db_path}
+backup_db = {self.root}/backups/calgary_data_backup.db
+
+[data_sources]
+creb_pdf_dir = {self.raw_dir}/creb
+economic_data_dir = {self.raw_dir}/economic
+crime_data_dir = {self.raw_dir}/police
+raw_data = {self.raw_dir}
+
+[validation]
+validation_base = {self.validation_dir}
+pending_review = {self.pending_dir}
+approved_data = {self.approved_dir}
+rejected_data = {self.validation_dir}/rejected
+audit_logs = {self.validation_dir}/logs
+
+[thresholds]
+auto_approve_confidence = 0.90
+manual_review_confidence = 0.70
+rejection_confidence = 0.50
+""")
+
+    def install_config(self):
+        """Make get_config() return the workspace config in this process."""
+        sys.path.insert(0, str(PROJECT_ROOT))
+        from config import config_manager
+        config_manager._config_manager = config_manager.ConfigManager(str(self.config_file))
+        return config_manager._config_manager
+
+    def build_database(self) -> None:
+        """Create an empty, fully migrated database."""
+        if self.db_path.exists():
+            self.db_path.unlink()
+
+        conn = sqlite3.connect(self.db_path)
+        for schema_file in SCHEMA_FILES:
+            # sqlite_sequence is internal; the schema dump lists it but it can't be created
+            sql = schema_file.read_text().replace('CREATE TABLE sqlite_sequence(name,seq);', '')
+            conn.executescript(sql)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(crime_statistics_monthly)")}
+        for column, column_type in CRIME_COLUMNS:
+            if column not in columns:
+                conn.execute(f"ALTER TABLE crime_statistics_monthly ADD COLUMN {column} {column_type}")
+        conn.commit()
+        conn.close()
+
+        sys.path.insert(0, str(PROJECT_ROOT / 'data-lake'))
+        from migrate import MigrationRunner
+        logging.getLogger('migrate').setLevel(logging.WARNING)
+        results = MigrationRunner(self.db_path).migrate()
+        if results['deferred']:
+            raise RuntimeError(f"Migrations deferred on the benchmark schema: {', '.join(results['deferred'])}")
+
+    def fact_rows(self) -> int:
+        """Rows across the loaded fact tables (0 if nothing is loaded yet)."""
+        if not self.db_path.exists():
+            return 0
+        conn = sqlite3.connect(self.db_path)
+        try:
+            total = 0
+            for table in ['housing_city_monthly', 'housing_district_monthly', 'economic_indicators_monthly',
+                          'crime_statistics_monthly', 'service_requests_311_monthly', 'rental_listings_snapshot',
+                          'rental_market_annual']:
+                try:
+                    total += conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                except sqlite3.OperationalError:
+                    pass
+            return total
+        finally:
+            conn.close()
+
+
+# --- Benchmarks -------------------------------------------------------------------------
+# prepare(workspace) runs in the parent and writes input files; setup(workspace) runs in
+# the child before the clock starts and returns the callable to time, which returns rows.
+
+def _prepare_nothing(workspace: Workspace) -> None:
+    pass
+
+
+def _prepare_police(workspace: Workspace) -> None:
+    from synthetic import write_police_workbook
+    write_police_workbook(workspace.raw_dir / 'police', workspace.scale)
+
+
+def _prepare_economic(workspace: Workspace) -> None:
+    from synthetic import write_economic_workbooks
+    write_economic_workbooks(workspace.raw_dir / 'economic', workspace.scale)
+
+
+def _prepare_pending(workspace: Workspace) -> None:
+    from synthetic import write_approved_csvs
+    shutil.rmtree(workspace.validation_dir, ignore_errors=True)
+    write_approved_csvs(workspace.pending_dir, workspace.scale)
+
+
+def _prepare_load(workspace: Workspace) -> None:
+    from synthetic import write_approved_csvs
+    shutil.rmtree(workspace.validation_dir, ignore_errors=True)
+    workspace.build_database()
+    write_approved_csvs(workspace.approved_dir, workspace.scale)
+
+
+def _prepare_loaded_database(workspace: Workspace) -> None:
+    """Aggregation and exports read a loaded database; load one unless an earlier stage did."""
+    if workspace.fact_rows():
+        return
+    _prepare_load(workspace)
+    _run_child('load', workspace)
+
+
+def _setup_creb(workspace: Workspace):
+    sys.path.insert(0, str(DATA_ENGINE_DIR / 'creb' / 'scripts'))
+    from extractor import CalgaryDataUpdater
+    from synthetic import creb_packages
+
+    updater = CalgaryDataUpdater()
+    packages = creb_packages(workspace.scale)
+
+    def run() -> int:
+        rows = 0
+        for package in packages:
+            for property_type, text in package['city_pages'].items():
+                rows += len(updater.parse_property_type_data(text, property_type))
+            rows += len(updater._parse_district_page(package['district_page'], package['filename'],
+                                                     package['target_month']))
+        return rows
+    return run
+
+
+def _setup_police(workspace: Workspace):
+    import openpyxl  # noqa: F401 - read_excel needs it; fail in setup rather than return no rows
+    sys.path.insert(0, str(DATA_ENGINE_DIR / 'police' / 'scripts'))
+    from extractor import CalgaryCrimeExtractorSimplified
+
+    extractor = CalgaryCrimeExtractorSimplified()
+    workbooks = sorted((workspace.raw_dir / 'police').glob('*.xlsx'))
+
+    def run() -> int:
+        rows = 0
+        for workbook in workbooks:
+            rows += len(extractor.extract_crime_overview(workbook))
+            rows += len(extractor.extract_domestics(workbook))
+            rows += len(extractor.extract_disorder(workbook))
+        return rows
+    return run
+
+
+def _setup_economic(workspace: Workspace):
+    import openpyxl  # noqa: F401
+    sys.path.insert(0, str(DATA_ENGINE_DIR / 'economic' / 'scripts'))
+    from extractor_timeseries import CalgaryEconomicTimeSeriesExtractor
+
+    extractor = CalgaryEconomicTimeSeriesExtractor()
+    workbooks = sorted((workspace.raw_dir / 'economic').glob('*.xlsx'))
+
+    def run() -> int:
+        return sum(len(extractor.extract_time_series_from_excel(workbook)) for workbook in workbooks)
+    return run
+
+
+def _setup_311(workspace: Workspace):
+    sys.path.insert(0, str(DATA_ENGINE_DIR / 'calgary_portal' / '311'))
+    import extractor_monthly
+    from config.config_manager import get_config
+    from synthetic import service_request_records
+
+    # Serve the records from a local stand-in for the Socrata API, pre-encoded so the
+    # server thread costs little next to the client
+    records = service_request_records(workspace.scale)
+    pages = {}
+
+    class SocrataHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)
+            offset, limit = int(query['$offset'][0]), int(query['$limit'][0])
+            if (offset, limit) not in pages:
+                pages[(offset, limit)] = json.dumps(records[offset:offset + limit]).encode()
+            body = pages[(offset, limit)]
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SocrataHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    for offset in range(0, len(records) + 1, 50000):
+        pages[(offset, 50000)] = json.dumps(records[offset:offset + 50000]).encode()
+
+    extractor = extractor_monthly.Calgary311MonthlyExtractor()
+    extractor.config = get_config()  # For the spatial lookup's database path
+    extractor.base_url = f"http://127.0.0.1:{server.server_address[1]}/resource"
+    # The one-second pause between batches is politeness towards the live API, not work
+    extractor_monthly.sleep = lambda seconds: None
+
+    def run() -> int:
+        df = extractor.fetch_monthly_summary(2024, 6)
+        extractor.aggregate_monthly_data(df, 2024, 6)
+        return len(records)
+    return run
+
+
+def _setup_rentfaster(workspace: Workspace):
+    sys.path.insert(0, str(DATA_ENGINE_DIR / 'rentfaster' / 'scripts'))
+    from extractor import RentfasterExtractor
+    from synthetic import rentfaster_listings
+
+    extractor = RentfasterExtractor()
+    listings = rentfaster_listings(workspace.scale)
+
+    def run() -> int:
+        import pandas as pd
+        parsed = [extractor.parse_listing(listing) for listing in listings]
+        pd.DataFrame([listing for listing in parsed if listing])
+        return len(listings)
+    return run
+
+
+def _setup_validate(workspace: Workspace):
+    sys.path.insert(0, str(DATA_ENGINE_DIR / 'cli'))
+    from validate_pending import ValidationHelper
+
+    helper = ValidationHelper()
+
+    def run() -> int:
+        rows = 0
+        for item_path, _ in helper.list_pending():
+            rows += helper.get_data_summary(item_path)['total_records']
+            helper.approve_item(item_path, reason='benchmark')
+        return rows
+    return run
+
+
+def _setup_quality_report(workspace: Workspace):
+    import pandas as pd
+    sys.path.insert(0, str(DATA_ENGINE_DIR))
+    from pipeline.validation_report import build_report, table_for
+
+    # Read before the clock starts: only the report engine is timed
+    frames = [(pd.read_csv(path), table_for(path.name)) for path in sorted(workspace.pending_dir.glob('*.csv'))]
+
+    def run() -> int:
+        return sum(build_report(df, table)['records_extracted'] for df, table in frames if table)
+    return run
+
+
+def _setup_load(workspace: Workspace):
+    sys.path.insert(0, str(DATA_ENGINE_DIR / 'cli'))
+    from load_csv_direct import SimpleCSVLoader
+
+    def run() -> int:
+        loader = SimpleCSVLoader()
+        try:
+            results = loader.load_all_csvs()
+        finally:
+            loader.close()
+        if results['errors']:
+            raise RuntimeError(f"{results['errors']} file(s) failed to load")
+        return results['loaded']
+    return run
+
+
+def _setup_aggregate(workspace: Workspace):
+    sys.path.insert(0, str(PROJECT_ROOT / 'data-lake'))
+    from rollups import rebuild_rollups
+
+    rows = workspace.fact_rows()
+
+    def run() -> int:
+        conn = sqlite3.connect(workspace.db_path)
+        try:
+            rebuild_rollups(conn)
+        finally:
+            conn.close()
+        return rows
+    return run
+
+
+def _setup_export(workspace: Workspace):
+    import importlib
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+    generators = {}
+    for module_name, class_name in EXPORT_GENERATORS.items():
+        generator = getattr(importlib.import_module(module_name), class_name)()
+        generator.db_path = workspace.db_path
+        if hasattr(generator, 'output_dir'):
+            generator.output_dir = workspace.export_dir
+        else:
+            generator.output_path = workspace.export_dir / Path(generator.output_path).name
+        if hasattr(generator, 'archive_path'):
+            generator.archive_path = workspace.root / 'archive'
+        generators[module_name] = generator
+    workspace.export_dir.mkdir(parents=True, exist_ok=True)
+    rows = workspace.fact_rows()
+
+    def run() -> int:
+        for module_name, generator in generators.items():
+            try:
+                generator.generate()
+            except Exception as e:
+                raise RuntimeError(f"{module_name}: {e}") from e
+        return rows
+    return run
+
+
+BENCHMARKS = {
+    'creb_pages': {'stage': 'extract', 'prepare': _prepare_nothing, 'setup': _setup_creb},
+    'police_workbook': {'stage': 'extract', 'prepare': _prepare_police, 'setup': _setup_police,
+                        'requires': ['openpyxl']},
+    'economic_workbooks': {'stage': 'extract', 'prepare': _prepare_economic, 'setup': _setup_economic,
+                           'requires': ['openpyxl']},
+    '311_api': {'stage': 'extract', 'prepare': _prepare_nothing, 'setup': _setup_311,
+                'requires': ['requests']},
+    'rentfaster_listings': {'stage': 'extract', 'prepare': _prepare_nothing, 'setup': _setup_rentfaster,
+                            'requires': ['requests']},
+    'validate': {'stage': 'validate', 'prepare': _prepare_pending, 'setup': _setup_validate},
+    'quality_report': {'stage': 'validate', 'prepare': _prepare_pending, 'setup': _setup_quality_report},
+    'load': {'stage': 'load', 'prepare': _prepare_load, 'setup': _setup_load},
+    'aggregate': {'stage': 'aggregate', 'prepare': _prepare_loaded_database, 'setup': _setup_aggregate},
+    'export': {'stage': 'export', 'prepare': _prepare_loaded_database, 'setup': _setup_export},
+}
+
+
+# --- Running --------------------------------------------------------------------------
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process so far (ru_maxrss is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _child(name: str, root: str, scale: int, pipe) -> None:
+    """Set up and time one benchmark (runs in a spawned interpreter)."""
+    logging.disable(logging.CRITICAL)
+
+    workspace = Workspace(Path(root), scale)
+    try:
+        workspace.install_config()
+        run = BENCHMARKS[name]['setup'](workspace)
+        setup_rss = _peak_rss_mb()
+
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        with contextlib.redirect_stdout(io.StringIO()):
+            rows = run()
+        seconds = time.perf_counter() - wall_start
+        cpu_seconds = time.process_time() - cpu_start
+
+        pipe.send({'rows': rows, 'seconds': seconds, 'cpu_seconds': cpu_seconds,
+                   'setup_rss_mb': setup_rss, 'peak_rss_mb': _peak_rss_mb()})
+    except Exception as e:
+        pipe.send({'error': f"{type(e).__name__}: {e}"})
+    finally:
+        pipe.close()
+
+
+def _run_child(name: str, workspace: Workspace) -> Dict[str, Any]:
+    """Run one benchmark in a fresh interpreter and return its measurements."""
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_child, args=(name, str(workspace.root), workspace.scale, sender))
+    process.start()
+    sender.close()
+    try:
+        result = receiver.recv()
+    except EOFError:
+        result = {'error': 'benchmark process exited without a result'}
+    process.join()
+    if process.exitcode and 'error' not in result:
+        result = {'error': f"benchmark process exited with {process.exitcode}"}
+    return result
+
+
+def missing_requirements(name: str) -> List[str]:
+    """Optional libraries a benchmark needs that aren't installed."""
+    import importlib.util
+    return [module for module in BENCHMARKS[name].get('requires', [])
+            if importlib.util.find_spec(module) is None]
+
+
+def run_benchmark(name: str, workspace: Workspace, run_id: str, scale_label: str) -> Dict[str, Any]:
+    """Prepare inputs, run one benchmark and build its results record."""
+    record = {
+        'run_id': run_id,
+        'run_at': datetime.now().isoformat(timespec='seconds'),
+        'scale': scale_label,
+        'stage': BENCHMARKS[name]['stage'],
+        'benchmark': name,
+        'seed': SEED,
+        'python': platform.python_version(),
+    }
+
+    missing = missing_requirements(name)
+    if missing:
+        record['skipped'] = f"{', '.join(missing)} not installed"
+        return record
+
+    try:
+        BENCHMARKS[name]['prepare'](workspace)
+    except Exception as e:
+        record['error'] = f"prepare failed: {type(e).__name__}: {e}"
+        return record
+
+    result = _run_child(name, workspace)
+    if 'error' in result:
+        record['error'] = result['error']
+        return record
+
+    record.update({
+        'rows': result['rows'],
+        'seconds': round(result['seconds'], 4),
+        'cpu_seconds': round(result['cpu_seconds'], 4),
+        'rows_per_s': round(result['rows'] / result['seconds'], 1) if result['seconds'] else None,
+        'setup_rss_mb': round(result['setup_rss_mb'], 1),
+        'peak_rss_mb': round(result['peak_rss_mb'], 1),
+    })
+    return record
+
+
+def load_results(path: Path) -> List[Dict[str, Any]]:
+    """Every record in a results file."""
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def baseline_for(history: List[Dict[str, Any]], record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The latest earlier timed record of the same benchmark at the same scale."""
+    earlier = [r for r in history if r['benchmark'] == record['benchmark'] and r['scale'] == record['scale']
+               and r['run_id'] != record['run_id'] and r.get('seconds')]
+    return earlier[-1] if earlier else None
+
+
+def print_record(record: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    """One line per benchmark, with the change against the baseline when there is one."""
+    label = f"{record['stage']:<9} {record['benchmark']:<20}"
+    if 'skipped' in record:
+        print(f"  ⏭️  {label} skipped ({record['skipped']})")
+        return
+    if 'error' in record:
+        print(f"  ❌ {label} {record['error']}")
+        return
+
+    line = (f"  ✅ {label} {record['rows']:>10,} rows  {record['seconds']:8.3f}s  "
+            f"{record['rows_per_s'] or 0:>12,.0f} rows/s  {record['peak_rss_mb']:7.1f} MB")
+    if baseline:
+        change = (record['seconds'] - baseline['seconds']) / baseline['seconds'] * 100
+        line += f"  {change:+6.1f}% vs {baseline['run_id']}"
+    print(line)
+
+
+def main():
+    """Run the benchmark suite and append the results."""
+    parser = argparse.ArgumentParser(description="Benchmark pipeline stages on synthetic data")
+    parser.add_argument('--scale', action='append', choices=list(SCALE_FACTORS),
+                        help='Scale factor (repeatable, default: 1x)')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, help='Only run these stages')
+    parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS), help='Only run these benchmarks')
+    parser.add_argument('--results', type=Path, default=DEFAULT_RESULTS,
+                        help=f'Results file to append to (default: {DEFAULT_RESULTS.name})')
+    parser.add_argument('--fail-on-regression', type=float, metavar='PCT',
+                        help='Exit non-zero if any benchmark is more than PCT%% slower than its baseline')
+    parser.add_argument('--keep-workdir', action='store_true', help='Keep the scratch workspace')
+
+    args = parser.parse_args()
+    scales = args.scale or ['1x']
+    names = [name for name, benchmark in BENCHMARKS.items()
+             if (not args.stages or benchmark['stage'] in args.stages)
+             and (not args.benchmarks or name in args.benchmarks)]
+
+    run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+    history = load_results(args.results)
+    workdir = Path(tempfile.mkdtemp(prefix='calgary_benchmark_'))
+
+    print("⏱️  Data Engine Pipeline Benchmarks")
+    print("=" * 50)
+    print(f"Run {run_id}: {', '.join(scales)}, {len(names)} benchmarks")
+
+    records, regressions = [], []
+    try:
+        for scale_label in scales:
+            print(f"\n📏 Scale {scale_label}")
+            workspace = Workspace(workdir / scale_label, SCALE_FACTORS[scale_label])
+            workspace.write_config()
+
+            for name in names:
+                record = run_benchmark(name, workspace, run_id, scale_label)
+                baseline = baseline_for(history, record) if 'seconds' in record else None
+                print_record(record, baseline)
+                records.append(record)
+
+                if baseline and args.fail_on_regression is not None:
+                    change = (record['seconds'] - baseline['seconds']) / baseline['seconds'] * 100
+                    if change > args.fail_on_regression:
+                        regressions.append(f"{scale_label} {name}: {change:+.1f}%")
+    finally:
+        if args.keep_workdir:
+            print(f"\n📂 Workspace kept: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    args.results.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.results, 'a') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+
+    print("\n" + "=" * 50)
+    errors = [r for r in records if 'error' in r]
+    print(f"📝 {len(records)} results appended to {args.results}")
+    if errors:
+        print(f"❌ {len(errors)} benchmark(s) failed")
+    for regression in regressions:
+        print(f"❌ Regression beyond {args.fail_on_regression:.0f}%: {regression}")
+    if errors or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
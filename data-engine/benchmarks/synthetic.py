@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Calgary Analytica - Synthetic Benchmark Data
+Seeded generators for every input the pipeline reads: CREB page text, police and economic
+workbooks, 311 API pages, RentFaster listings and approved CSVs.
+
+A scale factor multiplies entities (sub-markets, communities, indicators, listings), not
+time, so dates stay in the range the exports expect and unique keys stay unique.
+"""
+
+import random
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Any, Tuple, TYPE_CHECKING
+
+# pandas is only needed to write workbooks and CSVs
+if TYPE_CHECKING:
+    import pandas as pd
+
+SCALE_FACTORS = {'1x': 1, '10x': 10, '100x': 100}
+
+SEED = 20250601
+
+PROPERTY_TYPES = ['Total', 'Detached', 'Semi_Detached', 'Apartment', 'Row']
+DISTRICT_PROPERTY_TYPES = ['Detached', 'Semi-detached', 'Row', 'Apartment']
+DISTRICTS = ['City Centre', 'North East', 'North West', 'South East', 'South West',
+             'North', 'South', 'West', 'East']
+
+# Named communities come first; larger scales add numbered synthetic ones
+COMMUNITIES = [
+    ('BLN', 'BELTLINE'), ('BRD', 'BRIDGELAND/RIVERSIDE'), ('MIS', 'MISSION'),
+    ('HIL', 'HILLHURST'), ('SSD', 'SUNNYSIDE'), ('INW', 'INGLEWOOD'),
+    ('DNC', 'DOWNTOWN COMMERCIAL CORE'), ('EAU', 'EAU CLAIRE'), ('MRL', 'MARLBOROUGH'),
+    ('FOR', 'FOREST LAWN'), ('BOW', 'BOWNESS'), ('TUS', 'TUSCANY'),
+    ('AUB', 'AUBURN BAY'), ('MAH', 'MAHOGANY'), ('EVN', 'EVANSTON'),
+    ('SET', 'SETON'), ('CRA', 'CRANSTON'), ('ROY', 'ROYAL OAK'),
+    ('SAD', 'SADDLE RIDGE'), ('SKY', 'SKYVIEW RANCH')
+]
+COMMUNITIES_PER_SCALE = 40
+
+CRIME_CATEGORIES = {
+    'Violence': ['Assault (Non-domestic)', 'Street Robbery', 'Commercial Robbery'],
+    'Property': ['Break & Enter - Dwelling', 'Theft FROM Vehicle', 'Theft OF Vehicle'],
+}
+DISORDER_TYPES = ['Drugs', 'Noise', 'Suspicious Person', 'Unwanted Guest']
+WARDS = [f"Ward {n}" for n in range(1, 15)]
+POLICE_DISTRICTS = ['District 1', 'District 2', 'District 3', 'District 4',
+                    'District 5', 'District 6', 'District 7', 'District 8']
+MONTH_NAMES = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+               'August', 'September', 'October', 'November', 'December']
+
+# Indicator row labels as they appear in the City's economic outlook workbook
+ECONOMIC_INDICATORS = {
+    'unemployment_rate': ('Unemployment rate Calgary CER (%)', 'labour', 'percentage', 'rate', (5.0, 10.0)),
+    'unemployment_rate_canada': ('Unemployment rate Canada (%)', 'labour', 'percentage', 'rate', (5.0, 8.0)),
+    'employment': ('Employment Calgary CER (000s)', 'labour', 'thousands', 'absolute', (850, 1000)),
+    'population': ('City of Calgary population (000s)', 'demographics', 'thousands', 'absolute', (1300, 1600)),
+    'oil_price_wti': ('West Texas Intermediate (US$/bbl)', 'energy', 'usd_per_barrel', 'absolute', (60, 95)),
+    'inflation_rate_calgary': ('Inflation rate Calgary (% y/y)', 'prices', 'percentage', 'rate', (1.0, 6.0)),
+    'prime_lending_rate': ('Prime lending rate (%)', 'rates', 'percentage', 'rate', (4.5, 7.2)),
+    'bank_of_canada_rate': ('Bank of Canada interest rate (%)', 'rates', 'percentage', 'rate', (2.25, 5.0)),
+    'housing_starts': ('Housing starts Calgary CMA (units)', 'housing', 'units', 'absolute', (1000, 3000)),
+    'mls_average_price': ('Residential average price MLS Calgary (thousands)', 'housing', 'thousands', 'absolute', (480, 620)),
+}
+
+# 311 service names by the category extractor_monthly assigns them (None -> 'Other')
+SERVICE_NAMES = [
+    'Bylaw - Long Grass - Weeds Infraction', 'Bylaw - Untidy Private Property',
+    'WRS - Cart Management', 'WRS - Missed Pickup', 'Roads - Pothole Repair',
+    'Roads - Streetlight Repair', 'Parks - Tree Maintenance', 'Transit - Bus Stop Cleanliness',
+    'Corporate - Graffiti Concerns', 'CS - Encampment Concerns', 'Animal Services - Barking Dog',
+    'Water - Hydrant Leak'
+]
+REQUESTS_311_PER_SCALE = 5000
+
+RENTFASTER_TYPES = [('House', 'house'), ('Apartment', 'apartment'), ('Townhouse', 'townhouse'),
+                    ('Duplex', 'duplex'), ('Basement', 'basement'), ('Room For Rent', 'room'),
+                    ('Condo', 'condo')]
+LISTINGS_PER_SCALE = 400
+
+# rental_listings_snapshot's property_type CHECK value for each RentFaster type
+RENTAL_PROPERTY_TYPES = {'house': 'single_detached', 'apartment': 'apartment', 'townhouse': 'townhouse',
+                         'duplex': 'semi_detached', 'basement': 'basement_suite', 'room': 'room',
+                         'condo': 'apartment'}
+
+CMHC_PROPERTY_TYPES = ['apartment', 'townhouse', 'all_types']
+CMHC_BEDROOM_RENTS = {'Bachelor': 1250, '1 Bedroom': 1500, '2 Bedroom': 1850, '3 Bedroom+': 2150, 'Total': 1700}
+
+# One year of monthly CREB packages per scale unit
+CREB_MONTHS = [(2024, month) for month in range(1, 13)]
+
+
+def recent_months(count: int) -> List[Tuple[int, int]]:
+    """The (year, month) pairs before the current month, oldest first.
+
+    Exports summarise the last 12 months from today, so loaded data has to be recent.
+    """
+    today = date.today()
+    index = today.year * 12 + today.month - 1
+    return [((index - n) // 12, (index - n) % 12 + 1) for n in range(count, 0, -1)]
+
+
+# Approved CSVs cover the two years before the current month
+CSV_MONTHS = recent_months(24)
+
+
+def communities(scale: int) -> List[Tuple[str, str]]:
+    """(code, name) for the communities at a scale factor."""
+    count = COMMUNITIES_PER_SCALE * scale
+    result = list(COMMUNITIES[:count])
+    for n in range(len(result), count):
+        result.append((f"S{n:04d}", f"SYNTHETIC {n:04d}"))
+    return result
+
+
+def _submarkets(names: List[str], scale: int) -> List[str]:
+    """The real names, plus numbered copies for scales above 1x."""
+    return [name if copy == 0 else f"{name} {copy + 1}" for copy in range(scale) for name in names]
+
+
+def _walk(rng: random.Random, low: float, high: float, steps: int) -> List[float]:
+    """Bounded random walk, so series look like monthly data rather than noise."""
+    value = rng.uniform(low, high)
+    series = []
+    for _ in range(steps):
+        value = min(high, max(low, value + rng.gauss(0, (high - low) * 0.03)))
+        series.append(value)
+    return series
+
+
+# --- CREB -----------------------------------------------------------------------------
+
+def creb_city_page(rng: random.Random, years: List[int]) -> str:
+    """Text of one city-wide property-type page, as pdfplumber extracts it."""
+    lines = ['Calgary Monthly Statistics']
+    for year in years:
+        lines.append(f"{year} " + '  '.join(f"{month:02d}/01/{year % 100:02d}" for month in range(1, 13)))
+        benchmark = _walk(rng, 450_000, 750_000, 12)
+        metrics = {
+            'Sales': [rng.randint(800, 3200) for _ in range(12)],
+            'New Listings': [rng.randint(1200, 4500) for _ in range(12)],
+            'Inventory': [rng.randint(1500, 6000) for _ in range(12)],
+            'Days on Market': [rng.randint(10, 60) for _ in range(12)],
+            'Benchmark Price': [int(price) for price in benchmark],
+            'Median Price': [int(price * rng.uniform(0.95, 1.05)) for price in benchmark],
+            'Average Price': [int(price * rng.uniform(1.0, 1.12)) for price in benchmark],
+        }
+        for label, values in metrics.items():
+            lines.append(f"{label}  " + '  '.join(f"{value:,}" for value in values))
+    return '\n'.join(lines)
+
+
+def creb_district_page(rng: random.Random) -> str:
+    """Text of the district page (page 7) of a monthly package."""
+    lines = ['Calgary Districts Summary']
+    for property_type in DISTRICT_PROPERTY_TYPES:
+        lines.append(property_type)
+        for district in DISTRICTS:
+            sales, listings = rng.randint(20, 400), rng.randint(40, 600)
+            lines.append(
+                f"{district} {sales} {listings} {sales / listings * 100:.2f}% {rng.randint(50, 900)} "
+                f"{rng.uniform(1, 6):.2f} ${rng.randint(300_000, 1_200_000):,} "
+                f"{rng.uniform(-8, 12):.2f}% {rng.uniform(-3, 3):.2f}%"
+            )
+    return '\n'.join(lines)
+
+
+def creb_packages(scale: int, seed: int = SEED) -> List[Dict[str, Any]]:
+    """Page text for a year of monthly packages per scale unit.
+
+    Each package has one two-year page per property type plus a district page, keyed by
+    a filename in the MM_YYYY_Calgary_Monthly_Stats_Package.pdf form the parser reads.
+    """
+    rng = random.Random(seed)
+    packages = []
+    for _ in range(scale):
+        for year, month in CREB_MONTHS:
+            packages.append({
+                'filename': f"{month:02d}_{year}_Calgary_Monthly_Stats_Package.pdf",
+                'target_month': f"{year}-{month:02d}",
+                'city_pages': {pt: creb_city_page(rng, [year - 1, year]) for pt in PROPERTY_TYPES},
+                'district_page': creb_district_page(rng)
+            })
+    return packages
+
+
+# --- Workbooks (need openpyxl) --------------------------------------------------------
+
+def police_frames(scale: int, seed: int = SEED) -> Dict[str, 'pd.DataFrame']:
+    """Crime Overview, Domestics and Disorder sheets for one year of the police workbook."""
+    import pandas as pd
+
+    rng = random.Random(seed)
+    year = 2024
+    overview, domestics, disorder = [], [], []
+    for index, (_, community) in enumerate(communities(scale)):
+        ward, district = WARDS[index % len(WARDS)], POLICE_DISTRICTS[index % len(POLICE_DISTRICTS)]
+        for month_name in MONTH_NAMES:
+            for category, crime_types in CRIME_CATEGORIES.items():
+                for crime_type in crime_types:
+                    overview.append({
+                        'Crime Type': f"{category} Crime", 'Date - Year': year, 'Date - Month': month_name,
+                        'Community': community, 'Ward': ward, 'Police District': district,
+                        'Category': crime_type, 'Total Crime': rng.randint(0, 25)
+                    })
+            for disorder_type in DISORDER_TYPES:
+                disorder.append({
+                    'Disorder Type': disorder_type, 'Call_Received_Timestamp - Year': year,
+                    'Call_Received_Timestamp - Month': month_name, 'Community': community,
+                    'Ward': ward, 'District': district, 'Total Disorder': rng.randint(0, 40)
+                })
+    # Domestic incidents are only published by ward and district
+    for ward, district in zip(WARDS, POLICE_DISTRICTS * 2):
+        for month_name in MONTH_NAMES:
+            domestics.append({
+                'Start_Datestamp - Year': year, 'Start_Datestamp - Month': month_name,
+                'Ward': ward, 'Police District': district, 'Total Domestic': rng.randint(10, 120)
+            })
+
+    return {'Crime Overview': pd.DataFrame(overview), 'Domestics': pd.DataFrame(domestics),
+            'Disorder': pd.DataFrame(disorder)}
+
+
+def write_police_workbook(directory: Path, scale: int, seed: int = SEED) -> List[Path]:
+    """Write the police workbook, returning its path."""
+    import pandas as pd
+
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / 'Community_Crime_and_Disorder_Statistics_2024.xlsx'
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        for sheet, frame in police_frames(scale, seed).items():
+            frame.to_excel(writer, sheet_name=sheet, index=False)
+    return [path]
+
+
+def economic_table(rng: random.Random, year: int, month: int, indicators: List[str]) -> List[List[Any]]:
+    """Rows of the 'Table' sheet: titles, date headers in row 2, indicators from row 4."""
+    dates = [(year - 2 + (month + offset - 1) // 12, (month + offset - 1) % 12 + 1) for offset in range(24)]
+    header = [None] * 5 + [f"{MONTH_NAMES[m - 1][:3]}-{y % 100:02d}" for y, m in dates]
+    rows = [['Calgary Economic Indicators'] + [None] * 28, [None] * 29, header, [None] * 29]
+    for indicator in indicators:
+        label, _, _, _, (low, high) = ECONOMIC_INDICATORS[indicator]
+        rows.append([None] * 4 + [label] + [round(v, 2) for v in _walk(rng, low, high, 24)])
+    return rows
+
+
+def write_economic_workbooks(directory: Path, scale: int, seed: int = SEED) -> List[Path]:
+    """Write a year of monthly economic outlook workbooks per scale unit."""
+    import pandas as pd
+
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for copy in range(scale):
+        for month in range(1, 13):
+            path = directory / f"current-economic-indicators-2024-{month:02d}-{copy:03d}.xlsx"
+            rows = economic_table(rng, 2024, month, list(ECONOMIC_INDICATORS))
+            with pd.ExcelWriter(path, engine='openpyxl') as writer:
+                pd.DataFrame(rows).to_excel(writer, sheet_name='Table', header=False, index=False)
+            paths.append(path)
+    return paths
+
+
+# --- API payloads ---------------------------------------------------------------------
+
+def service_request_records(scale: int, year: int = 2024, month: int = 6,
+                            seed: int = SEED) -> List[Dict[str, Any]]:
+    """One month of 311 records as the Socrata API returns them (all values strings)."""
+    rng = random.Random(seed)
+    community_list = communities(scale)
+    records = []
+    for n in range(REQUESTS_311_PER_SCALE * scale):
+        code, name = rng.choice(community_list)
+        day, hour = rng.randint(1, 28), rng.randint(0, 23)
+        closed = rng.random() < 0.8
+        record = {
+            'service_name': rng.choice(SERVICE_NAMES),
+            'comm_code': code,
+            'comm_name': name,
+            'status_description': 'Closed' if closed else 'Open',
+            'requested_date': f"{year}-{month:02d}-{day:02d}T{hour:02d}:00:00.000",
+            'latitude': f"{51.0 + rng.uniform(-0.1, 0.1):.6f}",
+            'longitude': f"{-114.07 + rng.uniform(-0.15, 0.15):.6f}",
+        }
+        if closed:
+            record['closed_date'] = f"{year}-{month:02d}-{min(28, day + rng.randint(0, 9)):02d}T12:00:00.000"
+        # A few requests arrive without a community, as in the live feed
+        if n % 50 == 0:
+            del record['comm_code'], record['comm_name']
+        records.append(record)
+    return records
+
+
+def rentfaster_listings(scale: int, seed: int = SEED) -> List[Dict[str, Any]]:
+    """RentFaster search API listing objects."""
+    rng = random.Random(seed)
+    community_names = [name.title() for _, name in communities(scale)]
+    listings = []
+    for n in range(LISTINGS_PER_SCALE * scale):
+        type_str, property_type = rng.choice(RENTFASTER_TYPES)
+        bedrooms = rng.choice(['studio', '1', '2', '3', '1 - 2', '2 - 3'])
+        listings.append({
+            'ref_id': str(500000 + n),
+            'type': type_str,
+            'property_type': property_type,
+            'bedrooms': bedrooms,
+            'baths': str(rng.choice([1, 1.5, 2, 2.5, 3])),
+            'price': str(rng.randint(900, 4200)),
+            'sq_feet': str(rng.randint(350, 2400)) if rng.random() < 0.8 else '',
+            'community': rng.choice(community_names),
+        })
+    return listings
+
+
+# --- Approved CSVs --------------------------------------------------------------------
+
+def approved_frames(scale: int, seed: int = SEED) -> Dict[str, 'pd.DataFrame']:
+    """Loader-ready data in the column layout each extractor writes, keyed by CSV filename."""
+    import pandas as pd
+
+    rng = random.Random(seed)
+    frames = {}
+
+    city = []
+    for property_type in _submarkets(PROPERTY_TYPES, scale):
+        benchmark = _walk(rng, 450_000, 750_000, len(CSV_MONTHS))
+        for (year, month), price in zip(CSV_MONTHS, benchmark):
+            city.append({
+                'Date': f"{year}-{month:02d}", 'Property_Type': property_type,
+                'Sales': rng.randint(800, 3200), 'New_Listings': rng.randint(1200, 4500),
+                'Inventory': rng.randint(1500, 6000), 'Days_on_Market': rng.randint(10, 60),
+                'Benchmark_Price': int(price), 'Median_Price': int(price * rng.uniform(0.95, 1.05)),
+                'Average_Price': int(price * rng.uniform(1.0, 1.12))
+            })
+    frames['creb_city_all_historical.csv'] = pd.DataFrame(city)
+
+    district = []
+    for property_type in DISTRICT_PROPERTY_TYPES:
+        for name in _submarkets(DISTRICTS, scale):
+            for year, month in CSV_MONTHS:
+                sales, listings = rng.randint(20, 400), rng.randint(40, 600)
+                district.append({
+                    'property_type': property_type, 'district': name, 'new_sales': sales,
+                    'new_listings': listings, 'sales_to_listings_ratio': f"{sales / listings * 100:.2f}%",
+                    'inventory': rng.randint(50, 900), 'months_supply': round(rng.uniform(1, 6), 2),
+                    'benchmark_price': rng.randint(300_000, 1_200_000),
+                    'yoy_price_change': f"{rng.uniform(-8, 12):.2f}%", 'mom_price_change': f"{rng.uniform(-3, 3):.2f}%",
+                    'month': month, 'year': year, 'date': f"{year}-{month:02d}-01"
+                })
+    frames['creb_district_all_historical.csv'] = pd.DataFrame(district)
+
+    economic = []
+    for indicator in _submarkets(list(ECONOMIC_INDICATORS), scale):
+        indicator_type = indicator.replace(' ', '_')
+        label, category, unit, value_type, (low, high) = ECONOMIC_INDICATORS[indicator.split(' ')[0]]
+        for (year, month), value in zip(CSV_MONTHS, _walk(rng, low, high, len(CSV_MONTHS))):
+            economic.append({
+                'date': f"{year}-{month:02d}-01", 'indicator_type': indicator_type,
+                'indicator_name': label, 'value': round(value, 2), 'unit': unit,
+                'value_type': value_type, 'category': category,
+                'yoy_change': round(rng.uniform(-5, 5), 2)
+            })
+    frames['economic_timeseries_benchmark.csv'] = pd.DataFrame(economic)
+
+    crime = []
+    for index, (_, community) in enumerate(communities(scale)):
+        for year, month in CSV_MONTHS:
+            for category, crime_types in CRIME_CATEGORIES.items():
+                for crime_type in crime_types:
+                    crime.append({
+                        'date': f"{year}-{month:02d}-01", 'year': year, 'community': community,
+                        'ward': WARDS[index % len(WARDS)],
+                        'police_district': POLICE_DISTRICTS[index % len(POLICE_DISTRICTS)],
+                        'crime_category': category, 'crime_type': crime_type,
+                        'incident_count': rng.randint(0, 25)
+                    })
+    frames['crime_statistics_all_years_benchmark.csv'] = pd.DataFrame(crime)
+
+    requests_311 = []
+    categories = ['Bylaw', 'Waste', 'Infrastructure', 'Parks', 'Graffiti', 'Encampments', 'Social Stress']
+    for code, name in communities(scale):
+        for year, month in CSV_MONTHS:
+            for category in categories:
+                total = rng.randint(1, 60)
+                closed = rng.randint(0, total)
+                requests_311.append({
+                    'year_month': f"{year}-{month:02d}", 'year': year, 'month': month,
+                    'community_code': code, 'community_name': name, 'service_category': category,
+                    'total_requests': total, 'open_requests': total - closed, 'closed_requests': closed,
+                    'avg_days_to_close': round(rng.uniform(0.5, 20), 1),
+                    'median_days_to_close': round(rng.uniform(0.5, 15), 1)
+                })
+    frames['311_monthly_summary_benchmark.csv'] = pd.DataFrame(requests_311)
+
+    rental = []
+    for listing in rentfaster_listings(scale, seed):
+        rental.append({
+            'listing_id': listing['ref_id'],
+            'property_type': RENTAL_PROPERTY_TYPES[listing['property_type']],
+            'bedrooms': 0 if listing['bedrooms'] == 'studio' else int(listing['bedrooms'][0]),
+            'bathrooms': float(listing['baths']), 'rent': float(listing['price']),
+            'sq_feet': int(listing['sq_feet']) if listing['sq_feet'] else None,
+            'community': listing['community'], 'extraction_week': date.today().strftime('%Y-W%U')
+        })
+    frames['rentfaster_listings_benchmark.csv'] = pd.DataFrame(rental)
+
+    # CMHC's categories are fixed by CHECK constraints, so this one doesn't grow with scale
+    cmhc = []
+    last_year = CSV_MONTHS[-1][0] - 1
+    for year in range(last_year - 9, last_year + 1):
+        for property_type in CMHC_PROPERTY_TYPES:
+            for bedroom_type, base_rent in CMHC_BEDROOM_RENTS.items():
+                for metric_type, unit, value in [
+                    ('average_rent', 'dollars', base_rent * (1 + 0.04 * (year - last_year)) * rng.uniform(0.95, 1.05)),
+                    ('vacancy_rate', 'percent', rng.uniform(0.8, 7.5)),
+                    ('rental_universe', 'units', rng.randint(500, 30000)),
+                ]:
+                    cmhc.append({
+                        'date': f"{year}-10-01", 'year': year, 'property_type': property_type,
+                        'metric_type': metric_type, 'bedroom_type': bedroom_type, 'value': round(value, 1),
+                        'unit': unit, 'quality_indicator': rng.choice('abc')
+                    })
+    frames['cmhc_rental_benchmark.csv'] = pd.DataFrame(cmhc)
+
+    return frames
+
+
+def write_approved_csvs(directory: Path, scale: int, seed: int = SEED) -> Dict[str, int]:
+    """Write the approved CSVs, returning rows per file."""
+    directory.mkdir(parents=True, exist_ok=True)
+    rows = {}
+    for filename, frame in approved_frames(scale, seed).items():
+        frame.to_csv(directory / filename, index=False)
+        rows[filename] = len(frame)
+    return rows
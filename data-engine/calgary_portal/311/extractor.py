@@ -19,6 +19,12 @@ from time import sleep
 # Add project root to path for imports
 sys.path.append(str(Path(__file__).resolve().parents[3]))
 from config.config_manager import ConfigManager
+sys.path.append(str(Path(__file__).resolve().parents[3] / 'data-lake'))
+from database import connect
+
+# Shared validation report metrics
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from pipeline.validation_report import build_report, sample_records
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -46,9 +52,13 @@ class Calgary311Extractor:
     def _get_existing_request_ids(self, start_date: str, end_date: str) -> set:
         """Get existing service request IDs from database for a date range."""
         try:
-            import sqlite3
             db_path = self.config.get_database_path()
-            conn = sqlite3.connect(db_path)
+            conn = connect(db_path, read_only=True)
+        except Exception as e:
+            logger.warning(f"Could not check existing records: {e}")
+            return set()
+
+        try:
             cursor = conn.cursor()
             
             # Check if table exists
@@ -68,14 +78,13 @@ class Calgary311Extractor:
                 WHERE date >= ? AND date <= ?
             """, (start_date, end_date))
             
-            existing_ids = {row[0] for row in cursor.fetchall()}
-            conn.close()
-            
-            return existing_ids
+            return {row[0] for row in cursor.fetchall()}
             
         except Exception as e:
             logger.warning(f"Could not check existing records: {e}")
             return set()
+        finally:
+            conn.close()
         
     def fetch_data(self, start_date: str = None, end_date: str = None, limit: int = 10000) -> List[Dict[str, Any]]:
         """Fetch 311 data from the API with date filtering."""
@@ -229,38 +238,30 @@ class Calgary311Extractor:
             # Community breakdown (top 10)
             community_counts = df.get('community_name', pd.Series()).value_counts().head(10).to_dict()
             
+            # Rows with both coordinates, from one combined mask
+            has_coordinates = int(df[['latitude', 'longitude']].notna().all(axis=1).sum()) \
+                if {'latitude', 'longitude'} <= set(df.columns) else 0
+            
+            quality = build_report(df, 'service_requests_311')
+            
             validation_report = {
                 'source': '311_service_requests',
                 'extraction_type': extraction_type,
                 'extraction_date': datetime.now().isoformat(),
-                'records_extracted': len(df),
-                'date_range': f"{df['date'].min()} to {df['date'].max()}",
-                'unique_services': df['service_name'].nunique(),
+                **quality,
+                'unique_services': quality['quality']['columns']['service_name']['distinct'],
                 'top_services': service_counts,
                 'status_breakdown': status_counts,
                 'top_communities': community_counts,
                 'geographic_coverage': {
-                    'has_coordinates': df[['latitude', 'longitude']].notna().all(axis=1).sum(),
-                    'missing_coordinates': df[['latitude', 'longitude']].isna().any(axis=1).sum()
+                    'has_coordinates': has_coordinates,
+                    'missing_coordinates': len(df) - has_coordinates
                 },
-                'sample_records': []
+                'sample_records': sample_records(df, ['date', 'service_request_id', 'service_name',
+                                                      'status_description', 'community_name',
+                                                      'agency_responsible'])
             }
             
-            # Add sample records
-            sample_cols = ['date', 'service_request_id', 'service_name', 'status_description', 
-                          'community_name', 'agency_responsible']
-            available_cols = [col for col in sample_cols if col in df.columns]
-            
-            for _, row in df.head(5).iterrows():
-                sample = {}
-                for col in available_cols:
-                    val = row.get(col, '')
-                    # Convert numpy types to Python types for JSON serialization
-                    if hasattr(val, 'item'):
-                        val = val.item()
-                    sample[col] = str(val) if val is not None else ''
-                validation_report['sample_records'].append(sample)
-            
             # Save validation report
             report_path = csv_path.with_suffix('.json')
             with open(report_path, 'w') as f:
@@ -22,6 +22,16 @@ from collections import defaultdict
 sys.path.append(str(Path(__file__).resolve().parents[3]))
 from config.config_manager import ConfigManager
 
+# Point-in-community assignment lives with the boundary geometry in data-lake/
+sys.path.append(str(Path(__file__).resolve().parents[3] / 'data-lake'))
+from geometry import assign_communities
+from database import connect
+
+# Per-stage cost metrics live with the pipeline in data-engine/
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from pipeline.instrumentation import StageMetrics, HTTP_FETCH, TRANSFORM, SAVE
+from pipeline.validation_report import build_report
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -32,6 +42,7 @@ class Calgary311MonthlyExtractor:
         self.config = ConfigManager()
         self.raw_data_path = self.config.get_project_root() / 'data-engine' / 'calgary_portal' / 'raw'
         self.validation_pending_path = self.config.get_pending_review_dir()
+        self.metrics = StageMetrics('311')
         
         # API configuration
         self.base_url = "https://data.calgary.ca/resource"
@@ -163,7 +174,7 @@ class Calgary311MonthlyExtractor:
         while True:
             params = {
                 '$where': f"requested_date >= '{start_date}' AND requested_date <= '{end_date}'",
-                '$select': 'service_name, comm_code, comm_name, status_description, requested_date, closed_date',
+                '$select': 'service_name, comm_code, comm_name, status_description, requested_date, closed_date, latitude, longitude',
                 '$limit': limit,
                 '$offset': offset,
                 '$order': 'requested_date'
@@ -171,10 +182,13 @@ class Calgary311MonthlyExtractor:
             
             try:
                 logger.info(f"Fetching batch: offset={offset}")
-                response = requests.get(query_url, params=params, timeout=60)
-                response.raise_for_status()
-                
-                batch = response.json()
+                with self.metrics.stage(HTTP_FETCH, f"{self.dataset_id} {year}-{month:02d}") as stage:
+                    response = requests.get(query_url, params=params, timeout=60)
+                    response.raise_for_status()
+                    
+                    batch = response.json()
+                    stage['bytes_read'] = len(response.content)
+                    stage['rows'] = len(batch)
                 if not batch:
                     break
                 
@@ -195,19 +209,21 @@ class Calgary311MonthlyExtractor:
         if not all_records:
             return pd.DataFrame()
         
-        # Convert to DataFrame and process
-        df = pd.DataFrame(all_records)
+        with self.metrics.stage(TRANSFORM, f"{self.dataset_id} {year}-{month:02d}") as stage:
+            # Convert to DataFrame and process
+            df = pd.DataFrame(all_records)
         
-        # Categorize services
-        df['service_category'] = df['service_name'].apply(self.categorize_service)
+            # Categorize services
+            df['service_category'] = df['service_name'].apply(self.categorize_service)
         
-        # Calculate resolution time for closed requests
-        df['requested_date'] = pd.to_datetime(df['requested_date'])
-        df['closed_date'] = pd.to_datetime(df['closed_date'], errors='coerce')
-        df['days_to_close'] = (df['closed_date'] - df['requested_date']).dt.days
+            # Calculate resolution time for closed requests
+            df['requested_date'] = pd.to_datetime(df['requested_date'])
+            df['closed_date'] = pd.to_datetime(df['closed_date'], errors='coerce')
+            df['days_to_close'] = (df['closed_date'] - df['requested_date']).dt.days
         
-        # Filter out "Other" category to focus on relevant data
-        df_filtered = df[df['service_category'] != 'Other'].copy()
+            # Filter out "Other" category to focus on relevant data
+            df_filtered = df[df['service_category'] != 'Other'].copy()
+            stage['rows'] = len(df_filtered)
         
         logger.info(f"Filtered {len(df_filtered)} relevant records from {len(df)} total")
         
@@ -219,35 +235,63 @@ class Calgary311MonthlyExtractor:
         if df.empty:
             return pd.DataFrame()
         
-        # Rename columns to match our expected names
-        df.rename(columns={
-            'comm_code': 'community_code',
-            'comm_name': 'community_name'
-        }, inplace=True)
+        with self.metrics.stage(TRANSFORM, f"{self.dataset_id} {year}-{month:02d}") as stage:
+            # Rename columns to match our expected names
+            df.rename(columns={
+                'comm_code': 'community_code',
+                'comm_name': 'community_name'
+            }, inplace=True)
         
-        # Group by community and category
-        aggregations = {
-            'service_name': 'count',  # Total requests
-            'days_to_close': ['mean', 'median']  # Resolution time
-        }
+            # groupby drops rows without a community, so place them from their coordinates first
+            self._recover_communities(df)
         
-        grouped = df.groupby(['community_code', 'community_name', 'service_category']).agg(aggregations)
+            # Group by community and category
+            aggregations = {
+                'service_name': 'count',  # Total requests
+                'days_to_close': ['mean', 'median']  # Resolution time
+            }
+        
+            grouped = df.groupby(['community_code', 'community_name', 'service_category']).agg(aggregations)
         
-        # Flatten column names
-        grouped.columns = ['total_requests', 'avg_days_to_close', 'median_days_to_close']
-        grouped = grouped.reset_index()
+            # Flatten column names
+            grouped.columns = ['total_requests', 'avg_days_to_close', 'median_days_to_close']
+            grouped = grouped.reset_index()
         
-        # Add temporal columns
-        grouped['year'] = year
-        grouped['month'] = month
-        grouped['year_month'] = f"{year}-{month:02d}"
+            # Add temporal columns
+            grouped['year'] = year
+            grouped['month'] = month
+            grouped['year_month'] = f"{year}-{month:02d}"
         
-        # Round numeric columns
-        grouped['avg_days_to_close'] = grouped['avg_days_to_close'].round(1)
-        grouped['median_days_to_close'] = grouped['median_days_to_close'].round(1)
+            # Round numeric columns
+            grouped['avg_days_to_close'] = grouped['avg_days_to_close'].round(1)
+            grouped['median_days_to_close'] = grouped['median_days_to_close'].round(1)
+            stage['rows'] = len(grouped)
         
         return grouped
     
+    def _recover_communities(self, df: pd.DataFrame) -> None:
+        """Assign requests with no community to the boundary containing their coordinates."""
+        for coord in ['latitude', 'longitude']:
+            if coord in df.columns:
+                df[coord] = pd.to_numeric(df[coord], errors='coerce')
+        
+        missing = df['community_code'].isna().sum() if 'community_code' in df.columns else len(df)
+        if not missing:
+            return
+        
+        db_path = self.config.get_database_path()
+        if not db_path.exists():
+            logger.warning(f"⚠️ {missing:,} requests have no community (database not found for spatial lookup)")
+            return
+        
+        conn = connect(db_path, read_only=True)
+        try:
+            recovered = assign_communities(conn, df)
+        finally:
+            conn.close()
+        
+        logger.info(f"🗺️ Located {recovered:,} of {missing:,} requests with no community from coordinates")
+    
     def extract_year_data(self, year: int) -> pd.DataFrame:
         """Extract full year of monthly summaries."""
         
@@ -296,7 +340,9 @@ class Calgary311MonthlyExtractor:
             
             # Save CSV
             self.validation_pending_path.mkdir(parents=True, exist_ok=True)
-            df.to_csv(csv_path, index=False)
+            with self.metrics.stage(SAVE, csv_path.name) as stage:
+                df.to_csv(csv_path, index=False)
+                stage['rows'] = len(df)
             logger.info(f"✅ Saved {len(df)} records to {csv_path}")
             
             # Create validation report
@@ -323,13 +369,14 @@ class Calgary311MonthlyExtractor:
                 'total_requests': 'sum'
             }).nlargest(10, 'total_requests').to_dict()['total_requests']
             
+            quality = build_report(df, 'service_requests_311_monthly')
+            
             validation_report = {
                 'source': '311_monthly_summary',
                 'description': description,
                 'extraction_date': datetime.now().isoformat(),
-                'records_extracted': len(df),
-                'date_range': f"{df['year_month'].min()} to {df['year_month'].max()}",
-                'unique_communities': df['community_code'].nunique(),
+                **quality,
+                'unique_communities': quality['quality']['columns']['community_code']['distinct'],
                 'category_summary': {
                     cat: {
                         'total_requests': int(category_summary['total_requests'].get(cat, 0)),
@@ -338,7 +385,8 @@ class Calgary311MonthlyExtractor:
                     for cat in category_summary['total_requests'].keys()
                 },
                 'top_communities': {k: int(v) for k, v in top_communities.items()},
-                'economic_indicators': self._calculate_economic_indicators(df)
+                'economic_indicators': self._calculate_economic_indicators(df),
+                'performance': self.metrics.summary()
             }
             
             # Save validation report
@@ -518,6 +566,7 @@ def main():
             csv_path = extractor.save_to_validation(combined, f"last_{args.recent}_months")
             extractor.print_extraction_summary(combined, csv_path)
     
+    extractor.metrics.write_log(extractor.config.get_database_path())
     print(f"\n✅ Extraction completed!")
 
 if __name__ == "__main__":
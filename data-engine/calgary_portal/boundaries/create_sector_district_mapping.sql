@@ -23,20 +23,27 @@ INSERT OR REPLACE INTO sector_district_mapping (sector_code, sector_name, creb_d
     ('WEST', 'WEST', 'West');
 
 -- Option 2: Create a view that joins the data
-CREATE VIEW IF NOT EXISTS creb_districts_with_boundaries AS
+-- Geometry comes from boundary_geometry (WKB, see data-lake/geometry.py)
+DROP VIEW IF EXISTS creb_districts_with_boundaries;
+CREATE VIEW creb_districts_with_boundaries AS
 SELECT 
     s.code as sector_code,
     s.name as sector_name,
     m.creb_district,
-    s.multipolygon,
+    g.geometry,
+    g.min_lon, g.min_lat, g.max_lon, g.max_lat,
+    g.centroid_lon, g.centroid_lat,
     s.communities
 FROM community_sectors s
-JOIN sector_district_mapping m ON s.code = m.sector_code;
+JOIN sector_district_mapping m ON s.code = m.sector_code
+LEFT JOIN boundary_geometry g ON g.layer = 'community_sectors' AND g.code = s.code;
 
 -- Example usage: Get housing data with geographic boundaries
 -- SELECT 
 --     h.*,
---     c.multipolygon
+--     c.geometry,
+--     c.centroid_lon,
+--     c.centroid_lat
 -- FROM housing_district_monthly h
 -- JOIN creb_districts_with_boundaries c ON h.district = c.creb_district
 -- WHERE h.date = '2025-05-01';
\ No newline at end of file
@@ -18,9 +18,30 @@ from datetime import datetime
 sys.path.append(str(Path(__file__).resolve().parents[3]))
 from config.config_manager import ConfigManager
 
+# Shared validation report metrics
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from pipeline.validation_report import build_report, sample_records
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 6 decimal places is ~0.1 m, well below the precision of the published boundaries
+COORDINATE_PRECISION = 6
+
+
+def compact_geojson(geometry: Any) -> Any:
+    """Serialise a GeoJSON geometry without whitespace and with rounded coordinates."""
+    if not isinstance(geometry, dict):
+        return geometry
+
+    def round_coordinates(value):
+        if isinstance(value, list):
+            return [round_coordinates(v) for v in value]
+        return round(value, COORDINATE_PRECISION) if isinstance(value, float) else value
+
+    compact = {**geometry, 'coordinates': round_coordinates(geometry.get('coordinates', []))}
+    return json.dumps(compact, separators=(',', ':'))
+
 class CalgaryBoundariesExtractor:
     """Extracts geospatial boundary data from Calgary Open Data Portal."""
     
@@ -112,12 +133,9 @@ class CalgaryBoundariesExtractor:
         column_mapping = config.get('column_mapping', {})
         df.rename(columns=column_mapping, inplace=True)
         
-        # Extract multipolygon as text (for storage)
+        # Compact GeoJSON for the CSV; the loader packs it into boundary_geometry (WKB)
         if 'multipolygon' in df.columns:
-            # Convert complex geometry to string representation
-            df['multipolygon'] = df['multipolygon'].apply(
-                lambda x: json.dumps(x) if isinstance(x, dict) else str(x)
-            )
+            df['multipolygon'] = df['multipolygon'].apply(compact_geojson)
         
         # Add metadata
         df['dataset'] = dataset_name
@@ -210,7 +228,7 @@ class CalgaryBoundariesExtractor:
             validation_report = {
                 'source': dataset_name,
                 'extraction_date': datetime.now().isoformat(),
-                'records_extracted': len(df),
+                **build_report(df, dataset_name),
                 'dataset_info': {
                     'api_id': config.get('api_dataset_id'),
                     'description': config.get('description'),
@@ -234,9 +252,7 @@ class CalgaryBoundariesExtractor:
             
             # Add sample records (without multipolygon for readability)
             sample_cols = [col for col in df.columns if col != 'multipolygon']
-            for _, row in df.head(3).iterrows():
-                sample = {col: row.get(col, '') for col in sample_cols}
-                validation_report['sample_records'].append(sample)
+            validation_report['sample_records'] = sample_records(df, sample_cols, 3)
             
             # Save validation report
             report_path = csv_path.with_suffix('.json')
@@ -20,6 +20,11 @@ import sys
 # Add project root to path for imports
 sys.path.append(str(Path(__file__).resolve().parents[3]))
 from config.config_manager import ConfigManager
+from extractor import compact_geojson
+
+# Shared validation report metrics
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from pipeline.validation_report import build_report, sample_records
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -37,6 +42,12 @@ class CalgaryGeospatialExtractor:
         with open(registry_path, 'r') as f:
             self.registry = json.load(f)
         
+        # Raw responses and the dataset version they were fetched at (for --refresh)
+        self.raw_data_path = Path(__file__).parent.parent / 'raw'
+        self.metadata_url = "https://data.calgary.ca/api/views"
+        self.page_size = 50000  # Socrata maximum
+        self.unchanged = []
+        
         # Define geospatial datasets to extract
         self.geospatial_datasets = [
             'community_boundaries',
@@ -45,7 +56,7 @@ class CalgaryGeospatialExtractor:
         ]
     
     def fetch_dataset(self, dataset_id: str, config: Dict) -> List[Dict[str, Any]]:
-        """Fetch all records from a geospatial dataset."""
+        """Fetch all records from a geospatial dataset in one paginated pass."""
         api_id = config['api_dataset_id']
         url = f"{self.base_url}/{api_id}.json"
         
@@ -53,35 +64,19 @@ class CalgaryGeospatialExtractor:
         
         all_records = []
         offset = 0
-        limit = 1000  # Socrata default
         
-        # First try without parameters to see if it works
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-            records = response.json()
-            
-            if records and len(records) < 1000:
-                # If we got all records in one shot, return them
-                logger.info(f"✅ Fetched {len(records)} records for {dataset_id}")
-                return records
-        except:
-            # If that fails, try with pagination
-            pass
+        # Stable ordering so pages never overlap or skip records
+        order = config['id_columns'][0] if config.get('id_columns') else ':id'
         
-        # Try with pagination
         while True:
             params = {
-                '$limit': limit,
-                '$offset': offset
+                '$limit': self.page_size,
+                '$offset': offset,
+                '$order': order
             }
             
-            # Only add $order if we have a valid column
-            if 'id_columns' in config and config['id_columns']:
-                params['$order'] = config['id_columns'][0]
-            
             try:
-                response = requests.get(url, params=params)
+                response = requests.get(url, params=params, timeout=60)
                 response.raise_for_status()
                 
                 records = response.json()
@@ -91,10 +86,10 @@ class CalgaryGeospatialExtractor:
                 all_records.extend(records)
                 logger.info(f"   Retrieved {len(records)} records (total: {len(all_records)})")
                 
-                if len(records) < limit:
+                if len(records) < self.page_size:
                     break
                     
-                offset += limit
+                offset += self.page_size
                 
             except requests.exceptions.RequestException as e:
                 logger.error(f"❌ Error fetching {dataset_id}: {e}")
@@ -104,12 +99,81 @@ class CalgaryGeospatialExtractor:
         logger.info(f"✅ Fetched {len(all_records)} total records for {dataset_id}")
         return all_records
     
-    def extract_all_geospatial(self) -> Dict[str, List[Dict]]:
-        """Extract all geospatial datasets."""
+    def get_dataset_version(self, config: Dict) -> Optional[Dict[str, Any]]:
+        """Cheap change marker for a dataset: portal last-update time plus row count."""
+        api_id = config['api_dataset_id']
+        try:
+            response = requests.get(f"{self.metadata_url}/{api_id}.json", timeout=30)
+            response.raise_for_status()
+            metadata = response.json()
+            
+            response = requests.get(f"{self.base_url}/{api_id}.json", params={'$select': 'count(*)'}, timeout=30)
+            response.raise_for_status()
+            row_count = int(next(iter(response.json()[0].values())))
+        except (requests.exceptions.RequestException, ValueError, IndexError, StopIteration) as e:
+            logger.warning(f"⚠️ Could not read version for {api_id}: {e}")
+            return None
+        
+        return {
+            'rows_updated_at': metadata.get('rowsUpdatedAt'),
+            'view_last_modified': metadata.get('viewLastModified'),
+            'row_count': row_count
+        }
+    
+    def _version_path(self, dataset_id: str) -> Path:
+        return self.raw_data_path / f"{dataset_id}_version.json"
+    
+    def load_cached_version(self, dataset_id: str) -> Optional[Dict[str, Any]]:
+        """Version recorded with the last cached raw response, if its raw file is still there."""
+        try:
+            with open(self._version_path(dataset_id), 'r') as f:
+                cached = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not (self.raw_data_path / cached.get('raw_file', '')).is_file():
+            return None
+        return cached
+    
+    def is_unchanged(self, dataset_id: str, version: Optional[Dict[str, Any]]) -> bool:
+        """Whether the portal still has the version we last downloaded."""
+        cached = self.load_cached_version(dataset_id)
+        if not version or not cached or version['rows_updated_at'] is None:
+            return False
+        return all(cached.get(key) == version[key] for key in ('rows_updated_at', 'view_last_modified', 'row_count'))
+    
+    def _cache_raw_response(self, data: List[Dict], dataset_id: str,
+                            version: Optional[Dict[str, Any]] = None) -> None:
+        """Cache the raw API response and the dataset version it was fetched at."""
+        try:
+            self.raw_data_path.mkdir(parents=True, exist_ok=True)
+            
+            cache_file = self.raw_data_path / f"{dataset_id}_raw_{datetime.now().strftime('%Y%m%d')}.json"
+            with open(cache_file, 'w') as f:
+                json.dump(data, f)
+            
+            # A page error leaves a truncated fetch; recording its version (or keeping one
+            # that may point at the file just overwritten) would make --refresh skip it
+            if version and len(data) != version['row_count']:
+                self._version_path(dataset_id).unlink(missing_ok=True)
+                logger.warning(f"⚠️ {dataset_id}: fetched {len(data)} of {version['row_count']} rows - "
+                               f"not recording version, next --refresh will download again")
+            elif version:
+                with open(self._version_path(dataset_id), 'w') as f:
+                    json.dump({**version, 'raw_file': cache_file.name, 'records': len(data),
+                               'fetched_at': datetime.now().isoformat()}, f, indent=2)
+            
+            logger.info(f"📦 Cached raw response to {cache_file.name}")
+            
+        except Exception as e:
+            logger.warning(f"Could not cache response: {e}")
+    
+    def extract_all_geospatial(self, refresh: bool = False) -> Dict[str, List[Dict]]:
+        """Extract all geospatial datasets (with refresh, only those changed since the last run)."""
         logger.info("🗺️ Starting geospatial data extraction")
         logger.info("="*70)
         
         results = {}
+        self.unchanged = []
         
         for dataset_id in self.geospatial_datasets:
             if dataset_id not in self.registry:
@@ -119,8 +183,16 @@ class CalgaryGeospatialExtractor:
             config = self.registry[dataset_id]
             logger.info(f"\n📊 Extracting: {config['description']}")
             
+            version = self.get_dataset_version(config)
+            if refresh and self.is_unchanged(dataset_id, version):
+                logger.info(f"⏭️  {dataset_id} unchanged since last download ({version['row_count']} rows) - skipping")
+                self.unchanged.append(dataset_id)
+                continue
+            
             records = self.fetch_dataset(dataset_id, config)
             if records:
+                self._cache_raw_response(records, dataset_id, version)
+                
                 # Apply column mapping if needed
                 if 'column_mapping' in config:
                     mapped_records = []
@@ -157,6 +229,10 @@ class CalgaryGeospatialExtractor:
             config = self.registry[dataset_id]
             df = pd.DataFrame(records)
             
+            # Write geometry as compact GeoJSON rather than the dict's Python repr
+            if 'multipolygon' in df.columns:
+                df['multipolygon'] = df['multipolygon'].apply(compact_geojson)
+            
             # Generate filename
             filename = f"calgary_portal_{dataset_id}_{timestamp}.csv"
             csv_path = self.validation_pending_path / filename
@@ -168,33 +244,33 @@ class CalgaryGeospatialExtractor:
             logger.info(f"💾 Saved {len(records)} {dataset_id} records to {csv_path.name}")
             
             # Create validation report
-            self._create_validation_report(dataset_id, records, csv_path, config)
+            self._create_validation_report(dataset_id, df, csv_path, config)
             
             saved_files.append(csv_path)
         
         return saved_files
     
-    def _create_validation_report(self, dataset_id: str, records: List[Dict], 
+    def _create_validation_report(self, dataset_id: str, df: pd.DataFrame,
                                   csv_path: Path, config: Dict) -> None:
         """Create JSON validation report for geospatial data."""
         try:
-            # Sample the multipolygon field to show it's present
-            sample_records = []
-            for record in records[:5]:  # First 5 records
-                sample = {k: v for k, v in record.items() if k != 'multipolygon'}
-                sample['has_multipolygon'] = 'multipolygon' in record and record['multipolygon'] is not None
-                sample_records.append(sample)
+            # Sample records without the multipolygon field, noting whether it is present
+            samples = sample_records(df, [col for col in df.columns if col != 'multipolygon'])
+            has_multipolygon = df['multipolygon'].notna().head(len(samples)).tolist() \
+                if 'multipolygon' in df.columns else [False] * len(samples)
+            for sample, has_geometry in zip(samples, has_multipolygon):
+                sample['has_multipolygon'] = has_geometry
             
             validation_report = {
                 'source': f'calgary_portal_{dataset_id}',
                 'extraction_date': datetime.now().isoformat(),
                 'dataset_id': config['api_dataset_id'],
                 'description': config['description'],
-                'records_extracted': len(records),
+                **build_report(df, config.get('table_name', dataset_id)),
                 'geospatial': True,
                 'update_frequency': config.get('update_frequency', 'quarterly'),
-                'sample_records': sample_records,
-                'fields_extracted': list(records[0].keys()) if records else []
+                'sample_records': samples,
+                'fields_extracted': list(df.columns)
             }
             
             report_path = csv_path.with_suffix('.json')
@@ -254,6 +330,8 @@ def main():
     
     parser = argparse.ArgumentParser(description='Extract Calgary geospatial boundary data')
     parser.add_argument('--test', action='store_true', help='Test mode - show what would be extracted')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Only download datasets whose portal version changed since the last run')
     args = parser.parse_args()
     
     extractor = CalgaryGeospatialExtractor()
@@ -270,7 +348,7 @@ def main():
         return
     
     # Extract all geospatial data
-    data = extractor.extract_all_geospatial()
+    data = extractor.extract_all_geospatial(refresh=args.refresh)
     
     if data:
         # Save to validation
@@ -278,6 +356,8 @@ def main():
         
         # Show summary
         extractor.show_extraction_summary(data, saved_files)
+    elif extractor.unchanged:
+        print(f"✅ All geospatial datasets unchanged ({', '.join(extractor.unchanged)}) - nothing to load")
     else:
         print("❌ No geospatial data extracted")
 
@@ -5,27 +5,44 @@ Loads CSV files directly from approved/ to database without complex validation s
 """
 
 import sqlite3
-import pandas as pd
 from pathlib import Path
 import logging
 import sys
 from datetime import datetime
 import shutil
 import json
+from typing import TYPE_CHECKING
+
+# pandas (and numpy, via geometry) are imported where CSVs are read, so importing the
+# loader or printing a database summary stays fast
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Add project root for config
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from config.config_manager import get_config
 
+# Rollup maintenance lives with the schema in data-lake/
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'data-lake'))
+from rollups import rollups_for, refresh_rollups, table_exists
+from database import connect
+from maintenance import post_load_maintenance
+
+# Spans are no-ops unless a --trace run is recording
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pipeline.tracing import span
+
+from processed_archive import ProcessedArchive, date_range
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class SimpleCSVLoader:
     """Load approved CSV files directly to database."""
     
-    def __init__(self):
+    def __init__(self, db_path: Path = None):
         self.config = get_config()
-        self.db_path = self.config.get_database_path()
+        self.db_path = Path(db_path) if db_path else self.config.get_database_path()
         self.approved_dir = self.config.get_approved_data_dir()
         self.processed_dir = self.approved_dir.parent / "processed"
         self.reports_dir = self.approved_dir.parent / "reports"
@@ -33,9 +50,10 @@ class SimpleCSVLoader:
         # Create directories if they don't exist
         self.processed_dir.mkdir(exist_ok=True)
         self.reports_dir.mkdir(exist_ok=True)
+        self.archive = ProcessedArchive(self.processed_dir)
         
         # Create database connection
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = connect(self.db_path)
         
         # Load dataset registry if available
         self.dataset_registry = self._load_dataset_registry()
@@ -72,16 +90,21 @@ class SimpleCSVLoader:
         
         total_loaded = 0
         error_count = 0
+        loaded_tables = set()
         
         for csv_file in csv_files:
             try:
-                result = self._load_single_csv(csv_file)
+                with span(csv_file.name, 'file', bytes=csv_file.stat().st_size) as trace:
+                    result = self._load_single_csv(csv_file)
+                    trace.update(table=result.get('table'), rows=result.get('records_loaded', 0))
                 if result["success"]:
                     total_loaded += result["records_loaded"]
+                    loaded_tables.add(result['table'])
                     logger.info(f"✅ Loaded {result['records_loaded']} records from {csv_file.name} to {result['table']}")
                     
                     # Archive the processed files (CSV and JSON)
-                    self._archive_files(csv_file)
+                    with span('archive', 'stage', file=csv_file.name):
+                        self._archive_files(csv_file, result)
                 else:
                     error_count += 1
                     logger.error(f"❌ Failed to load {csv_file.name}: {result['error']}")
@@ -90,14 +113,32 @@ class SimpleCSVLoader:
                 error_count += 1
                 logger.error(f"❌ Error processing {csv_file.name}: {e}")
         
+        if loaded_tables:
+            self._post_load_maintenance(loaded_tables)
+        
         logger.info(f"📊 Summary: {total_loaded} records loaded, {error_count} errors")
         return {"loaded": total_loaded, "errors": error_count}
     
+    def _post_load_maintenance(self, tables):
+        """Refresh planner statistics for the loaded tables (cheap; see data-lake/maintenance.py)."""
+        try:
+            with span('maintenance', 'stage', tables=len(tables)):
+                result = post_load_maintenance(self.conn, sorted(tables))
+            freed = f", freed {result['pages_freed']} pages" if result['pages_freed'] else ""
+            logger.info(f"📈 Analyzed {len(result['analyzed'])} tables in {result['seconds']}s{freed}")
+        except sqlite3.Error as e:
+            # Statistics only guide the planner; a failed refresh never fails the load
+            logger.warning(f"⚠️  Post-load maintenance skipped: {e}")
+    
     def _load_single_csv(self, csv_file: Path):
         """Load a single CSV file to the appropriate table."""
         try:
+            import pandas as pd
+            
             # Read CSV
-            df = pd.read_csv(csv_file)
+            with span('read_csv', 'stage', file=csv_file.name) as trace:
+                df = pd.read_csv(csv_file)
+                trace['rows'] = len(df)
             
             if df.empty:
                 return {"success": False, "error": "Empty CSV file"}
@@ -115,31 +156,129 @@ class SimpleCSVLoader:
                 return {"success": False, "error": "Could not determine target table"}
             
             # Prepare data for loading
-            df_prepared = self._prepare_dataframe(df, target_table, csv_file.name)
+            with span('prepare', 'stage', table=target_table):
+                df_prepared = self._prepare_dataframe(df, target_table, csv_file.name)
             
             if df_prepared.empty:
                 return {"success": False, "error": "No valid data after preparation"}
             
-            # Load to database
             records_loaded = len(df_prepared)
+            dates = date_range(df_prepared)
+            self._insert_prepared(df_prepared, target_table)
+            
+            with span('commit', 'stage', table=target_table):
+                self.conn.commit()
+            
+            logger.info(f"📊 Loaded {records_loaded} records to {target_table}")
+            return {"success": True, "records_loaded": records_loaded, "table": target_table, "dates": dates}
             
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    def _insert_prepared(self, df_prepared: 'pd.DataFrame', target_table: str, refresh: bool = True):
+        """Insert a prepared frame (and any boundary geometry) without committing.
+        
+        refresh=False skips the per-key rollup refresh, for callers that rebuild rollups.
+        """
+        # Boundaries are kept as packed geometry rather than GeoJSON text
+        boundary_features = self._take_boundary_features(df_prepared, target_table)
+        
+        # Load to database
+        records_loaded = len(df_prepared)
+        
+        # A newer release replaces the months it covers, even under a drifted indicator name;
+        # pandas commits the DELETE together with the insert (or rolls both back)
+        if target_table == 'economic_indicators_monthly':
+            self._replace_indicator_months(df_prepared)
+        
+        with span('to_sql', 'stage', table=target_table, rows=records_loaded):
             # Try to handle duplicates gracefully for datasets with unique constraints
-            if target_table in ['service_requests_311', 'building_permits', 'business_licences', 'rental_market_annual', 'rental_listings_snapshot']:
+            if refresh and rollups_for(target_table):
+                # Refresh summary rollups inside the same transaction as the insert
+                df_prepared.to_sql(target_table, self.conn, if_exists='append', index=False,
+                                   method=self._insert_with_rollups(target_table))
+            elif target_table in ['service_requests_311', 'building_permits', 'business_licences', 'rental_market_annual', 'rental_listings_snapshot']:
                 # Use INSERT OR REPLACE for datasets with unique constraints
                 # For rental data, this handles overlapping years (CMHC) and weekly snapshots (RentFaster)
-                df_prepared.to_sql(target_table, self.conn, if_exists='append', index=False, method='multi')
+                # Batched so one statement stays under SQLite's bound-variable limit (32,766)
+                df_prepared.to_sql(target_table, self.conn, if_exists='append', index=False, method='multi',
+                                   chunksize=max(1, 32766 // len(df_prepared.columns)))
             else:
                 df_prepared.to_sql(target_table, self.conn, if_exists='append', index=False)
+        
+        if boundary_features:
+            from geometry import store_geometries
+            with span('store_geometries', 'stage', table=target_table):
+                packed = store_geometries(self.conn.cursor(), target_table, boundary_features)
+            logger.info(f"🗺️ Packed {packed} {target_table} geometries into boundary_geometry")
+    
+    def _insert_with_rollups(self, target_table: str):
+        """Build a to_sql insert method that also refreshes the table's rollups.
+        
+        pandas runs the insert method inside its own transaction, so the fact rows
+        and the re-aggregated rollup rows commit (or roll back) together.
+        """
+        def insert(pd_table, conn, keys, data_iter):
+            rows = list(data_iter)
+            columns = ', '.join(f'"{key}"' for key in keys)
+            placeholders = ', '.join('?' * len(keys))
+            conn.executemany(f'INSERT INTO "{pd_table.name}" ({columns}) VALUES ({placeholders})', rows)
             
-            self.conn.commit()
-            
-            logger.info(f"📊 Loaded {records_loaded} records to {target_table}")
-            return {"success": True, "records_loaded": records_loaded, "table": target_table}
-            
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+            with span('refresh_rollups', 'stage', table=target_table):
+                refreshed = refresh_rollups(conn, target_table, keys, rows)
+            for rollup_table, key_count in refreshed.items():
+                logger.info(f"🔁 Refreshed {key_count} keys in {rollup_table}")
+        
+        return insert
+    
+    def _take_boundary_features(self, df: 'pd.DataFrame', target_table: str):
+        """Pull (code, GeoJSON) pairs out of a boundary file, leaving multipolygon empty."""
+        from geometry import BOUNDARY_LAYERS
+        
+        code_column = BOUNDARY_LAYERS.get(target_table)
+        if not code_column or 'multipolygon' not in df.columns or code_column not in df.columns:
+            return []
+        if not table_exists(self.conn.cursor(), 'boundary_geometry'):
+            logger.warning("⚠️  boundary_geometry missing - run data-lake/migrate.py (keeping GeoJSON text)")
+            return []
+        
+        features = list(zip(df[code_column], df['multipolygon']))
+        df['multipolygon'] = None
+        return features
     
-    def _determine_target_table(self, df: pd.DataFrame, filename: str) -> str:
+    def _assign_indicator_ids(self, df: 'pd.DataFrame') -> 'pd.DataFrame':
+        """Key economic rows by the economic_indicator dimension, registering new indicators."""
+        cursor = self.conn.cursor()
+        if 'indicator_type' not in df.columns or not table_exists(cursor, 'economic_indicator'):
+            return df
+        
+        indicators = df.drop_duplicates('indicator_type', keep='last').to_dict('records')
+        cursor.executemany(
+            """INSERT OR IGNORE INTO economic_indicator (indicator_type, indicator_name, unit, category)
+               VALUES (?, ?, ?, ?)""",
+            [(row['indicator_type'], row.get('indicator_name'), row.get('unit'), row.get('category'))
+             for row in indicators]
+        )
+        
+        cursor.execute("SELECT indicator_type, indicator_id FROM economic_indicator")
+        df['indicator_id'] = df['indicator_type'].map(dict(cursor.fetchall()))
+        
+        # One observation per indicator per month: a file can carry the same month under
+        # drifted names ("gdp" / "gross domestic product"); the last row wins
+        if 'date' in df.columns:
+            df = df.drop_duplicates(subset=['indicator_id', 'date'], keep='last')
+        return df
+    
+    def _replace_indicator_months(self, df: 'pd.DataFrame'):
+        """Drop stored observations for the indicator months being loaded (any indicator name)."""
+        if 'indicator_id' not in df.columns or 'date' not in df.columns:
+            return
+        self.conn.executemany(
+            "DELETE FROM economic_indicators_monthly WHERE indicator_id = ? AND date = ?",
+            df[['indicator_id', 'date']].astype(object).itertuples(index=False, name=None)
+        )
+    
+    def _determine_target_table(self, df: 'pd.DataFrame', filename: str) -> str:
         """Determine the appropriate database table for the data."""
         columns = set(df.columns)
         
@@ -204,8 +343,10 @@ class SimpleCSVLoader:
         
         return None
     
-    def _prepare_dataframe(self, df: pd.DataFrame, target_table: str, filename: str) -> pd.DataFrame:
+    def _prepare_dataframe(self, df: 'pd.DataFrame', target_table: str, filename: str) -> 'pd.DataFrame':
         """Prepare dataframe for loading to specific table."""
+        import pandas as pd
+        
         df_prepared = df.copy()
         
         # Check if we have registry mapping for this dataset
@@ -274,6 +415,13 @@ class SimpleCSVLoader:
         if target_table == 'rental_market_annual' and 'validation_status' not in df_prepared.columns:
             df_prepared['validation_status'] = 'approved'
         
+        # Place requests with no community by their coordinates before any row is dropped
+        if target_table in ['service_requests_311', 'service_requests_311_monthly']:
+            from geometry import assign_communities
+            recovered = assign_communities(self.conn, df_prepared)
+            if recovered:
+                logger.info(f"🗺️ Assigned {recovered} rows to communities from latitude/longitude")
+        
         # Table-specific preparations
         if target_table == 'service_requests_311_monthly':
             # 311 data specific handling
@@ -306,12 +454,12 @@ class SimpleCSVLoader:
             # Convert percentage strings to floats
             percentage_columns = ['sales_to_listings_ratio', 'yoy_price_change', 'mom_price_change']
             for col in percentage_columns:
-                if col in df_prepared.columns and df_prepared[col].dtype == 'object':
+                if col in df_prepared.columns and pd.api.types.is_string_dtype(df_prepared[col]):
                     # Remove % sign and convert to float
                     df_prepared[col] = df_prepared[col].str.replace('%', '').astype(float)
             
             # Ensure date format
-            if 'date' in df_prepared.columns and df_prepared['date'].dtype == 'object':
+            if 'date' in df_prepared.columns and pd.api.types.is_string_dtype(df_prepared['date']):
                 # Convert date string to proper format if needed
                 try:
                     df_prepared['date'] = pd.to_datetime(df_prepared['date']).dt.strftime('%Y-%m-%d')
@@ -326,23 +474,18 @@ class SimpleCSVLoader:
         
         elif target_table == 'economic_indicators_monthly':
             # Economic data already has source_file from extraction
-            pass
+            df_prepared = self._assign_indicator_ids(df_prepared)
         
         # Select only columns that exist in the dataframe
         # This handles cases where some columns might be missing
         return df_prepared
     
-    def _archive_files(self, csv_file: Path):
-        """Move processed CSV and its JSON report to appropriate directories."""
+    def _archive_files(self, csv_file: Path, result: dict):
+        """Compress the loaded CSV into the processed archive and file its JSON report."""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
-        # Archive CSV to processed/
-        csv_target_name = f"{csv_file.stem}_{timestamp}.csv"
-        csv_target_path = self.processed_dir / csv_target_name
-        shutil.move(str(csv_file), str(csv_target_path))
-        logger.info(f"📦 Archived {csv_file.name} to processed/")
-        
         # Archive JSON to reports/YYYY/MM/ if it exists
+        report = None
         json_file = csv_file.with_suffix('.json')
         if json_file.exists():
             # Create year/month subdirectory
@@ -354,7 +497,72 @@ class SimpleCSVLoader:
             json_target_name = f"{csv_file.stem}_{timestamp}.json"
             json_target_path = year_month_dir / json_target_name
             shutil.move(str(json_file), str(json_target_path))
+            report = str(json_target_path.relative_to(self.reports_dir))
             logger.info(f"📋 Archived {json_file.name} to reports/{now.year}/{now.month:02d}/")
+        
+        # Archive CSV to processed/ (compressed, recorded in the manifest for --replay)
+        entry = self.archive.store(csv_file, result['table'], result['records_loaded'], result['dates'],
+                                   report=report)
+        csv_file.unlink()
+        logger.info(f"📦 Archived {csv_file.name} to processed/ ({entry['codec']}, {entry['sha256'][:12]})")
+    
+    def _unique_keys(self, table: str, columns) -> list:
+        """Columns of each unique index (or UNIQUE constraint) of the table that the frame carries."""
+        keys = []
+        for _, index, unique, _, _ in self.conn.execute(f'PRAGMA index_list("{table}")').fetchall():
+            if unique:
+                key = [row[2] for row in self.conn.execute(f'PRAGMA index_info("{index}")')]
+                if key and all(column in columns for column in key):
+                    keys.append(key)
+        return keys
+    
+    def replay(self, archive: ProcessedArchive, tables: list = None, workers: int = None) -> dict:
+        """Rebuild tables from the processed archive.
+        
+        Every archived load of a table is decoded (in parallel) and prepared as it was when
+        loaded; rows sharing a unique key keep the most recent load's values. The table is
+        then emptied and re-filled in one transaction, and its rollups rebuilt.
+        """
+        import pandas as pd
+        from rollups import rebuild_rollups
+        
+        entries = archive.entries(tables)
+        if tables:
+            missing = set(tables) - {entry['table'] for entry in entries}
+            for table in sorted(missing):
+                logger.warning(f"⚠️  No archived loads for {table}")
+        
+        # Decode every file up front (in parallel), then prepare them in load order
+        prepared = {}
+        with span('decode', 'stage', files=len(entries)):
+            for entry, df in archive.frames(entries, workers):
+                df.columns = df.columns.str.lower()
+                df_prepared = self._prepare_dataframe(df, entry['table'], entry['file'])
+                if not df_prepared.empty:
+                    prepared.setdefault(entry['table'], []).append(df_prepared)
+        
+        results = {}
+        for table, frames in prepared.items():
+            with span(table, 'table', files=len(frames)) as trace:
+                df = pd.concat(frames, ignore_index=True)
+                for key in self._unique_keys(table, df.columns):
+                    df = df.drop_duplicates(subset=key, keep='last')
+                
+                # pandas commits the DELETE together with the insert (or rolls both back)
+                self.conn.execute(f'DELETE FROM "{table}"')
+                self._insert_prepared(df, table, refresh=False)
+                self.conn.commit()
+                if rollups_for(table):
+                    for rollup_table, rows in rebuild_rollups(self.conn, table).items():
+                        logger.info(f"🔁 Rebuilt {rollup_table} ({rows} rows)")
+                trace['rows'] = len(df)
+            
+            results[table] = {'rows': len(df), 'files': len(frames)}
+            logger.info(f"✅ Replayed {len(df)} rows into {table} from {len(frames)} files")
+        
+        if results:
+            self._post_load_maintenance(results)
+        return results
     
     def get_database_summary(self):
         """Get summary of database contents after loading."""
@@ -391,6 +599,18 @@ class SimpleCSVLoader:
 
 def main():
     """Main loading function."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Load approved CSVs into the database')
+    parser.add_argument('--trace', type=Path, metavar='OUT.json',
+                        help='Write a Chrome trace of the load (per file: read, prepare, to_sql, commit)')
+    args = parser.parse_args()
+    
+    tracing = False
+    if args.trace:
+        from pipeline.tracing import start_trace
+        tracing = start_trace('load_csv_direct')
+    
     loader = SimpleCSVLoader()
     
     try:
@@ -416,6 +636,10 @@ def main():
         
     finally:
         loader.close()
+        if tracing:
+            from pipeline.tracing import finish_trace
+            events = finish_trace(args.trace)
+            print(f"\n🔬 Trace with {events:,} events written to {args.trace}")
 
 
 if __name__ == "__main__":
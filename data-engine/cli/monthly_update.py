@@ -1,17 +1,114 @@
 #!/usr/bin/env python3
 """
 Calgary Analytica - Monthly Update Script
-Simple workflow to update housing data when new CREB reports are available
+Simple workflow to update housing data when new CREB reports are available.
+Extractors for the selected sources run concurrently through the pipeline scheduler;
+loading and exports wait for them.
 """
 
 import argparse
+import sqlite3
+import sys
 from pathlib import Path
 import logging
 from datetime import datetime
+from typing import Dict, Any
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Pipeline task definitions live in data-engine/pipeline/
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pipeline.tasks import EXTRACT_SOURCES, build_plan, month_range, available_sources
+
+def pipeline_status(config, data_engine_dir: Path) -> Dict[str, Any]:
+    """Database and validation status, read without running any extractor."""
+    status = {
+        'database': {'database_exists': False, 'city_records': 0, 'district_records': 0},
+        'pending_validations': 0,
+        'available_extractors': available_sources(data_engine_dir.parent)
+    }
+    
+    db_path = config.get_database_path()
+    if db_path.exists():
+        status['database']['database_exists'] = True
+        sys.path.insert(0, str(data_engine_dir.parent / 'data-lake'))
+        from database import connect
+        conn = connect(db_path, read_only=True)
+        try:
+            for key, table in [('city_records', 'housing_city_monthly'),
+                               ('district_records', 'housing_district_monthly')]:
+                try:
+                    status['database'][key] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                except sqlite3.OperationalError:
+                    pass
+        finally:
+            conn.close()
+    
+    pending_dir = config.get_pending_review_dir()
+    if pending_dir.exists():
+        status['pending_validations'] = sum(1 for item in pending_dir.iterdir()
+                                            if item.is_dir() or item.suffix == '.csv')
+    return status
+
+def run_pipeline(args, config, months, base_dir: Path) -> int:
+    """Plan and run the selected sources for the given months. Returns the failed task count."""
+    from pipeline.scheduler import PipelineScheduler, SUCCEEDED, FAILED
+    
+    sources = EXTRACT_SOURCES if args.source == 'all' else [args.source]
+    through = 'export' if args.export else 'load' if args.load else 'extract'
+    plan = build_plan(sources, months, through)
+    
+    print(f"\n🗂️  Task plan ({len(plan)} tasks):")
+    for name, task in plan.items():
+        after = f" ← {', '.join(task['depends_on'])}" if task['depends_on'] else ""
+        print(f"  {task['stage']:>7}  {name}{after}")
+    
+    if args.dry_run:
+        return 0
+    
+    scheduler = PipelineScheduler(plan, base_dir, config.get_audit_logs_dir() / 'pipeline',
+                                  max_workers=args.workers)
+    results = scheduler.run()
+    summary = scheduler.summary()
+    
+    print("\n📋 PIPELINE SUMMARY")
+    print("=" * 50)
+    for name, result in results.items():
+        icon = {SUCCEEDED: '✅', FAILED: '❌'}.get(result['state'], '⏭️ ')
+        line = f"{icon} {name}: {result['state']}"
+        if 'duration' in result:
+            line += f" in {result['duration']:.1f}s"
+        if result.get('reason'):
+            line += f" ({result['reason']})"
+        print(line)
+        for output in result.get('outputs', []):
+            print(f"     → {output}")
+        if result['state'] == FAILED and result.get('log'):
+            print(f"     log: {result['log']}")
+    
+    print(f"\n⏱️  Wall time {summary['wall_time']:.1f}s for {summary['task_time']:.1f}s of task time")
+    if summary['slowest'] and summary['slowest'].get('duration'):
+        print(f"   Slowest task: {summary['slowest']['name']} ({summary['slowest']['duration']:.1f}s)")
+    
+    # Phase 2 enhancement: Validation workflow
+    if args.validate:
+        print(f"\n🔍 Pending validations:")
+        from validate_pending import ValidationHelper
+        helper = ValidationHelper()
+        high_confidence = {path for path, _ in helper.show_high_confidence()}
+        for item_path, report in helper.list_pending():
+            marker = "🎯" if item_path in high_confidence else "👁️ "
+            print(f"  {marker} {item_path.name}")
+        print(f"\n💡 Review with: python data-engine/cli/validate_pending.py --interactive")
+    
+    if summary[FAILED]:
+        print(f"\n❌ {summary[FAILED]} task(s) failed - see logs above")
+    elif through == 'extract':
+        print(f"\n✨ Extraction complete! Review pending CSVs, then rerun with --load")
+    
+    return summary[FAILED]
+
 def main():
     """Main monthly update workflow."""
     parser = argparse.ArgumentParser(description="Update Calgary housing data from CREB reports")
@@ -23,10 +120,16 @@ def main():
     # Phase 2 enhancements - modern pipeline integration
     parser.add_argument('--validate', action='store_true', help='Run validation workflow after extraction')
     parser.add_argument('--batch-months', help='Process multiple months (e.g., 2025-01:2025-06)')
-    parser.add_argument('--source', choices=['creb', 'economic', 'crime', 'all'], default='creb',
+    parser.add_argument('--source', choices=EXTRACT_SOURCES + ['all'], default='creb',
                         help='Data source to process (default: creb)')
+    parser.add_argument('--load', action='store_true', help='Load approved CSVs once extraction finishes')
+    parser.add_argument('--export', action='store_true', help='Load, then regenerate dashboard exports')
+    parser.add_argument('--workers', type=int, help='Maximum concurrent tasks (default: 8)')
+    parser.add_argument('--dry-run', action='store_true', help='Show the task plan without running it')
     parser.add_argument('--verbose', action='store_true', help='Detailed status reporting')
     parser.add_argument('--status', action='store_true', help='Show pipeline status without processing')
+    parser.add_argument('--trace', type=Path, metavar='OUT.json',
+                        help='Write a Chrome trace of the run (every task, subprocess and stage)')
     
     args = parser.parse_args()
     
@@ -37,35 +140,32 @@ def main():
     print("🏠 Calgary Analytica - Monthly Update")
     print("=" * 50)
     
-    # Initialize data engine for modern pipeline features
-    import sys
-    sys.path.append(str(data_engine_dir))
-    from core.data_engine import DataEngine
-    
-    engine = DataEngine(str(data_engine_dir))
+    sys.path.insert(0, str(base_dir))
+    from config.config_manager import get_config
+    config = get_config()
     
     # Phase 2 enhancement: Pipeline status command
     if args.status:
         print("\n📊 Pipeline Status Report")
         print("-" * 40)
         
-        status = engine.status()
+        # Status only reads the database and validation folders, so it skips the
+        # extraction engine (and pandas / pdfplumber) entirely
+        status = pipeline_status(config, data_engine_dir)
         
         # Database status
         print(f"\n🗄️  Database Status:")
         if status['database']['database_exists']:
-            print(f"  ✅ Database: {engine.database_path}")
+            print(f"  ✅ Database: {config.get_database_path()}")
             print(f"  📊 City records: {status['database']['city_records']}")
             print(f"  🏘️  District records: {status['database']['district_records']}")
         else:
-            print(f"  ❌ Database not found: {engine.database_path}")
+            print(f"  ❌ Database not found: {config.get_database_path()}")
         
         # Pipeline status
-        pipeline_status = engine.status()
-        if pipeline_status:
-            print(f"\n🔄 Pipeline Status:")
-            print(f"  ⏳ Pending validations: {pipeline_status.get('pending_validations', 0)}")
-            print(f"  🔧 Available extractors: {', '.join(pipeline_status.get('available_extractors', []))}")
+        print(f"\n🔄 Pipeline Status:")
+        print(f"  ⏳ Pending validations: {status['pending_validations']}")
+        print(f"  🔧 Available extractors: {', '.join(status['available_extractors'])}")
         
         # Recent activity
         print(f"\n📈 Recent Activity:")
@@ -75,10 +175,6 @@ def main():
             print(f"\n🔧 Configuration:")
             try:
                 # Use centralized config manager for path info
-                import sys
-                sys.path.insert(0, str(base_dir))
-                from config.config_manager import get_config
-                config = get_config()
                 config_paths = config.get_all_paths()
                 
                 for name, path in config_paths.items():
@@ -94,155 +190,54 @@ def main():
     if args.setup:
         print("\n📊 Setting up database...")
         import subprocess
-        import sys
         
         result = subprocess.run([sys.executable, str(data_engine_dir / "database/setup_database.py")])
         if result.returncode != 0:
             logger.error("Database setup failed!")
-            return
+            sys.exit(1)
     
     # Step 2: Import existing data (if needed)
     if args.import_data:
         print("\n📥 Importing existing data...")
         import subprocess
-        import sys
         
         result = subprocess.run([sys.executable, str(data_engine_dir / "database/import_existing_data.py")])
         if result.returncode != 0:
             logger.error("Data import failed!")
-            return
+            sys.exit(1)
     
-    # Step 3: Run extraction for specific month
+    # Step 3: Run the pipeline for one month or a range of months
+    months = None
     if args.month and args.year:
+        months = [(args.year, args.month)]
         print(f"\n🔄 Processing {args.month:02d}/{args.year} data...")
-        
-        # Check if PDF exists
-        pdf_name = f"{args.month:02d}_{args.year}_Calgary_Monthly_Stats_Package.pdf"
-        pdf_path = data_engine_dir / "data/raw/creb_pdfs" / pdf_name
-        
-        if not pdf_path.exists():
-            logger.error(f"PDF not found: {pdf_path}")
-            print(f"\n❌ Please download {pdf_name} to {data_engine_dir}/data/raw/creb_pdfs/ first")
-            return
-        
-        # Use new data engine
-        import sys
-        sys.path.append(str(data_engine_dir))
-        from core.data_engine import DataEngine
-        
-        engine = DataEngine(str(data_engine_dir))
-        
-        # Check database exists
-        if not engine.database_path.exists():
-            logger.error("Database not found. Run with --setup first!")
-            return
-        
-        # Run extraction using data engine
-        target_month = f"{args.year}-{args.month:02d}"
-        
-        # Phase 2 enhancement: Multi-source support
-        sources_to_process = [args.source] if args.source != 'all' else ['creb', 'economic', 'crime']
-        
-        all_results = []
-        for source in sources_to_process:
-            if source == 'creb':
-                results = engine.extract("creb", pdf_path=str(pdf_path), month=target_month)
-            else:
-                # For other sources, use standardized pipeline
-                results = engine.run_etl_pipeline(source, month=target_month)
-            
-            all_results.append((source, results))
-            
-            if results['success']:
-                print(f"\n✅ {source.upper()} Extraction complete!")
-                print(f"  Method: {results.get('method', 'unknown')}")
-                if 'records_found' in results:
-                    print(f"  Records found: {results['records_found']}")
-                if 'confidence' in results:
-                    print(f"  Confidence: {results['confidence']:.2%}")
-                if 'best_agent' in results:
-                    print(f"  Best agent: {results['best_agent']}")
-            else:
-                print(f"\n❌ {source.upper()} Extraction failed!")
-                if 'error' in results:
-                    print(f"  Error: {results['error']}")
-        
-        # Phase 2 enhancement: Validation workflow
-        if args.validate or any(r[1].get('confidence', 1.0) < 0.9 for r in all_results):
-            print(f"\n🔍 Running validation workflow...")
-            validation_results = engine.pipeline_manager.process_pending_validations(auto_approve=not args.validate)
-            
-            if validation_results:
-                print(f"  ✅ Processed {validation_results.get('pending_processed', 0)} validations")
-                print(f"  🤖 Auto-approved: {validation_results.get('auto_approved', 0)}")
-                print(f"  👁️  Manual review required: {validation_results.get('manual_review_required', 0)}")
-        
-        # Summary
-        successful_extractions = sum(1 for _, r in all_results if r['success'])
-        if successful_extractions > 0:
-            avg_confidence = sum(r[1].get('confidence', 1.0) for r in all_results if r[1]['success']) / successful_extractions
-            if avg_confidence > 0.9:
-                print(f"\n✨ Data looks good! Ready for dashboard.")
-            else:
-                print(f"\n⚠️  Please review extraction results (avg confidence: {avg_confidence:.2%})")
-        else:
-            print(f"\n❌ All extractions failed!")
-        
-        # Show engine status
-        status = engine.status()
-        print(f"\n📊 Database Status:")
-        if status['database']['database_exists']:
-            print(f"  City records: {status['database']['city_records']}")
-            print(f"  District records: {status['database']['district_records']}")
-        else:
-            print("  Database not found")
-    
-    # Phase 2 enhancement: Batch processing
     elif args.batch_months:
         print(f"\n🔄 Batch Processing: {args.batch_months}")
-        
         try:
             start_month, end_month = args.batch_months.split(':')
-            start_year, start_mon = map(int, start_month.split('-'))
-            end_year, end_mon = map(int, end_month.split('-'))
-            
-            months_to_process = []
-            current_year, current_month = start_year, start_mon
-            
-            while (current_year, current_month) <= (end_year, end_mon):
-                months_to_process.append((current_year, current_month))
-                current_month += 1
-                if current_month > 12:
-                    current_month = 1
-                    current_year += 1
-            
-            print(f"Processing {len(months_to_process)} months...")
-            
-            for year, month in months_to_process:
-                print(f"\n📅 Processing {month:02d}/{year}...")
-                
-                # Check for PDF
-                pdf_name = f"{month:02d}_{year}_Calgary_Monthly_Stats_Package.pdf"
-                pdf_path = data_engine_dir / "data/raw/creb_pdfs" / pdf_name
-                
-                if pdf_path.exists():
-                    target_month = f"{year}-{month:02d}"
-                    results = engine.extract("creb", pdf_path=str(pdf_path), month=target_month)
-                    
-                    if results['success']:
-                        confidence = results.get('confidence', 1.0)
-                        print(f"  ✅ Success (confidence: {confidence:.2%})")
-                    else:
-                        print(f"  ❌ Failed: {results.get('error', 'Unknown error')}")
-                else:
-                    print(f"  ⏭️  Skipped (PDF not found)")
-            
-            print(f"\n✨ Batch processing complete!")
-            
+            months = month_range(start_month, end_month)
         except ValueError:
             print(f"❌ Invalid batch format. Use: YYYY-MM:YYYY-MM (e.g., 2025-01:2025-06)")
+            sys.exit(1)
+        print(f"Processing {len(months)} months...")
     
-    else:
+    if months:
+        # Tracing is imported only when asked for; child processes inherit it
+        tracing = False
+        if args.trace:
+            from pipeline.tracing import start_trace, finish_trace
+            tracing = start_trace('monthly_update')
+        try:
+            failed = run_pipeline(args, config, months, base_dir)
+        finally:
+            if tracing:
+                events = finish_trace(args.trace)
+                print(f"\n🔬 Trace with {events:,} events written to {args.trace} "
+                      f"(open in chrome://tracing or ui.perfetto.dev)")
+        # Non-zero exit so cron / CI notice failed tasks
+        if failed:
+            sys.exit(1)
+    elif not (args.setup or args.import_data):
         # Show help
         print("\nUsage examples:")
         print("  # First time setup:")
@@ -255,10 +250,11 @@ def main():
         print("  python data-engine/cli/monthly_update.py --month 5 --year 2025 --validate")
         print("  python data-engine/cli/monthly_update.py --batch-months 2025-01:2025-06")
         print("  python data-engine/cli/monthly_update.py --source economic --month 5 --year 2025")
+        print("  python data-engine/cli/monthly_update.py --source all --month 5 --year 2025 --export")
         print("  python data-engine/cli/monthly_update.py --status --verbose")
         print()
         print("Workflow:")
-        print("  1. Download new CREB PDF to data-engine/data/raw/creb_pdfs/")
+        print("  1. Download new CREB PDF to data-engine/creb/raw/")
         print("  2. Run this script with --month and --year")
         print("  3. Check validation results")
         print("  4. Dashboard updates automatically")
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Processed CSV Archive
+Keeps every CSV the loader has loaded, compressed and content-addressed under
+validation/processed/, with a manifest recording the source, target table, row count,
+date range and hash of each load. --replay rebuilds tables from the archive, decoding
+files in parallel, so recovering a table is a bulk load rather than a re-extraction.
+"""
+
+import re
+import sys
+import json
+import gzip
+import fnmatch
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Any, Iterator, Optional, Tuple, TYPE_CHECKING
+import logging
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # Blobs are gzipped without the zstandard package
+
+# Source names come from the pipeline's extract tasks
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pipeline.tasks import PIPELINE_TASKS, EXTRACT_SOURCES
+
+logger = logging.getLogger(__name__)
+
+# Timestamped copies written by the loader before the archive was compressed
+LEGACY_FILE_PATTERN = re.compile(r'^(?P<stem>.+)_(?P<stamp>\d{8}_\d{6})\.csv$')
+
+# Column holding each table's period, first match wins
+DATE_COLUMNS = ['date', 'year_month', 'extraction_week', 'week', 'applied_date', 'year']
+
+CODEC_SUFFIXES = {'zst': '.csv.zst', 'gz': '.csv.gz'}
+
+
+def source_for(filename: str) -> str:
+    """Pipeline source whose extractor writes files named like this (e.g. 'creb')."""
+    for source in EXTRACT_SOURCES:
+        for pattern in PIPELINE_TASKS[source]['outputs']:
+            # Month placeholders become wildcards; names may also carry a _<timestamp> suffix
+            name = re.sub(r'\{[^}]*\}', '*', Path(pattern).name)
+            if fnmatch.fnmatch(filename, name) or fnmatch.fnmatch(filename, name.replace('.csv', '_*.csv')):
+                return source
+    return 'manual'
+
+
+def date_range(df: 'pd.DataFrame') -> Tuple[Optional[str], Optional[str]]:
+    """Earliest and latest period in a prepared frame, as strings."""
+    for column in DATE_COLUMNS:
+        if column in df.columns:
+            values = df[column].dropna()
+            if len(values):
+                return str(values.min()), str(values.max())
+    return None, None
+
+
+class ProcessedArchive:
+    """Archive of loaded CSVs: blobs/<hh>/<sha256>.csv.{zst,gz} plus manifest.jsonl."""
+
+    def __init__(self, archive_path: Path, codec: Optional[str] = None):
+        self.archive_path = Path(archive_path)
+        self.blob_dir = self.archive_path / 'blobs'
+        self.manifest_path = self.archive_path / 'manifest.jsonl'
+        self.codec = codec or ('zst' if zstandard else 'gz')
+        if self.codec == 'zst' and zstandard is None:
+            raise ValueError("zstd compression needs the zstandard package (pip install zstandard)")
+
+    def blob_path(self, sha256: str, codec: str) -> Path:
+        """Location of a blob, fanned out by hash prefix."""
+        return self.blob_dir / sha256[:2] / f"{sha256}{CODEC_SUFFIXES[codec]}"
+
+    def entries(self, tables: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Archived loads in the order they were loaded (optionally only some tables)."""
+        if not self.manifest_path.exists():
+            return []
+        entries = []
+        with open(self.manifest_path, 'r') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    if not tables or entry['table'] in tables:
+                        entries.append(entry)
+        return sorted(entries, key=lambda e: e['archived_at'])
+
+    def _compress(self, payload: bytes) -> bytes:
+        if self.codec == 'zst':
+            return zstandard.ZstdCompressor(level=10).compress(payload)
+        return gzip.compress(payload, compresslevel=6, mtime=0)
+
+    def store(self, csv_path: Path, table: str, rows: int, dates: Tuple[Optional[str], Optional[str]],
+              archived_at: Optional[str] = None, **details: Any) -> Dict[str, Any]:
+        """Record a loaded CSV, writing its blob only if the content is new."""
+        payload = Path(csv_path).read_bytes()
+        sha256 = hashlib.sha256(payload).hexdigest()
+
+        # An identical file archived earlier (in either codec) is reused
+        existing = [codec for codec in CODEC_SUFFIXES if self.blob_path(sha256, codec).exists()]
+        codec = existing[0] if existing else self.codec
+        blob_path = self.blob_path(sha256, codec)
+        if not existing:
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = blob_path.with_name(f".{blob_path.name}.tmp")
+            tmp_path.write_bytes(self._compress(payload))
+            tmp_path.replace(blob_path)
+
+        entry = {
+            'file': Path(csv_path).name,
+            'source': source_for(Path(csv_path).name),
+            'table': table,
+            'rows': rows,
+            'date_min': dates[0],
+            'date_max': dates[1],
+            'archived_at': archived_at or datetime.now().isoformat(timespec='seconds'),
+            'sha256': sha256,
+            'codec': codec,
+            'size_bytes': len(payload),
+            'stored_bytes': blob_path.stat().st_size,
+            **details
+        }
+        self.archive_path.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+        return entry
+
+    def read(self, entry: Dict[str, Any]) -> bytes:
+        """Raw CSV bytes of an archived load, checked against its hash."""
+        data = self.blob_path(entry['sha256'], entry['codec']).read_bytes()
+        if entry['codec'] == 'zst':
+            if zstandard is None:
+                raise ValueError(f"{entry['file']} is zstd-compressed; install the zstandard package")
+            payload = zstandard.ZstdDecompressor().decompress(data, max_output_size=entry['size_bytes'])
+        else:
+            payload = gzip.decompress(data)
+        if hashlib.sha256(payload).hexdigest() != entry['sha256']:
+            raise ValueError(f"Archived {entry['file']} does not match its hash {entry['sha256'][:12]}")
+        return payload
+
+    def _decode(self, entry: Dict[str, Any]) -> 'pd.DataFrame':
+        import io
+        import pandas as pd
+        return pd.read_csv(io.BytesIO(self.read(entry)))
+
+    def frames(self, entries: List[Dict[str, Any]],
+               workers: Optional[int] = None) -> Iterator[Tuple[Dict[str, Any], 'pd.DataFrame']]:
+        """Decode archived loads into DataFrames in parallel, yielding them in entry order.
+
+        Threads are enough: decompression and pandas' CSV parser both release the GIL.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            yield from zip(entries, executor.map(self._decode, entries))
+
+    def import_legacy(self, detect_table) -> Dict[str, int]:
+        """Fold processed/<name>_<timestamp>.csv copies into the archive.
+
+        detect_table(df, filename) returns the target table (or None to leave the file).
+        """
+        import pandas as pd
+
+        results = {'imported': 0, 'duplicates': 0, 'skipped': 0}
+        for legacy_file in sorted(self.archive_path.glob('*.csv')):
+            match = LEGACY_FILE_PATTERN.match(legacy_file.name)
+            if not match:
+                results['skipped'] += 1
+                continue
+            df = pd.read_csv(legacy_file)
+            df.columns = df.columns.str.lower()
+            table = detect_table(df, legacy_file.name)
+            if not table:
+                results['skipped'] += 1
+                continue
+
+            archived_at = datetime.strptime(match.group('stamp'), '%Y%m%d_%H%M%S').isoformat()
+            sha256 = hashlib.sha256(legacy_file.read_bytes()).hexdigest()
+            is_duplicate = any(self.blob_path(sha256, codec).exists() for codec in CODEC_SUFFIXES)
+            self.store(legacy_file, table, len(df), date_range(df), archived_at=archived_at)
+            legacy_file.unlink()
+            results['duplicates' if is_duplicate else 'imported'] += 1
+        return results
+
+
+def main():
+    """List the processed archive, replay tables from it, or import legacy copies."""
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from config.config_manager import get_config
+    default_archive = get_config().get_approved_data_dir().parent / 'processed'
+
+    parser = argparse.ArgumentParser(description='Compressed archive of loaded CSVs')
+    parser.add_argument('--archive', type=str, default=str(default_archive), help='Archive directory')
+    parser.add_argument('--list', nargs='?', const='', metavar='TABLE', help='List archived loads (optionally for one table)')
+    parser.add_argument('--replay', nargs='*', metavar='TABLE',
+                        help='Rebuild these tables (default: every archived table) from the archive')
+    parser.add_argument('--db', type=str, help='Database to replay into (default: configured primary database)')
+    parser.add_argument('--workers', type=int, help='Parallel decode threads (default: CPU count + 4, max 32)')
+    parser.add_argument('--import-legacy', action='store_true', help='Compress processed/*.csv copies into the archive')
+
+    args = parser.parse_args()
+    archive = ProcessedArchive(Path(args.archive))
+
+    if args.import_legacy or args.replay is not None:
+        from load_csv_direct import SimpleCSVLoader
+        loader = SimpleCSVLoader(db_path=Path(args.db) if args.db else None)
+        try:
+            if args.import_legacy:
+                results = archive.import_legacy(loader._determine_target_table)
+                print("\n📦 LEGACY PROCESSED IMPORT")
+                print("="*50)
+                print(f"New files: {results['imported']}")
+                print(f"Identical copies (deduplicated): {results['duplicates']}")
+                print(f"Skipped (no timestamp or table): {results['skipped']}")
+                return
+
+            results = loader.replay(archive, args.replay or None, args.workers)
+        finally:
+            loader.close()
+
+        print("\n🔁 REPLAY SUMMARY")
+        print("="*50)
+        for table, info in results.items():
+            print(f"  {table}: {info['rows']:,} rows from {info['files']} files")
+        return
+
+    entries = archive.entries([args.list] if args.list else None)
+    print("\n📦 PROCESSED ARCHIVE")
+    print("="*50)
+    for entry in entries:
+        period = f"{entry['date_min']} to {entry['date_max']}" if entry['date_min'] else 'no dates'
+        print(f"  {entry['archived_at']}  {entry['source']:<10} {entry['table']:<32} {entry['rows']:>8,} rows  "
+              f"{period}  {entry['sha256'][:12]}")
+    stored = sum({e['sha256']: e['stored_bytes'] for e in entries}.values())  # Identical loads share a blob
+    raw = sum(e['size_bytes'] for e in entries)
+    ratio = f" ({raw / stored:.1f}x compression)" if stored else ""
+    print(f"\nLoads: {len(entries)}  Raw: {raw / (1024 * 1024):.1f} MB  Stored: {stored / (1024 * 1024):.1f} MB{ratio}")
+
+
+if __name__ == "__main__":
+    main()
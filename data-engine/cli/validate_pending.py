@@ -5,13 +5,16 @@ Interactive tool for reviewing and approving pending data extractions
 """
 
 import argparse
-import pandas as pd
 import json
 from pathlib import Path
 from datetime import datetime
 import sys
 import shutil
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, TYPE_CHECKING
+
+# pandas is imported where data is read, so --list and --summary start without it
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Add project root for config
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -48,12 +51,23 @@ class ValidationHelper:
         
         # Check for standalone CSV files (legacy format)
         for csv_file in self.pending_dir.glob("*.csv"):
-            pending_items.append((csv_file, {"type": "legacy_csv", "confidence_score": None}))
+            report = {"type": "legacy_csv", "confidence_score": None}
+            # Extractors write their validation report (scored by pipeline/validation_report.py) beside the CSV
+            report_file = csv_file.with_suffix(".json")
+            if report_file.exists():
+                try:
+                    with open(report_file) as f:
+                        report.update(json.load(f))
+                except (json.JSONDecodeError, OSError):
+                    pass
+            pending_items.append((csv_file, report))
         
         return sorted(pending_items, key=lambda x: x[0].name)
     
-    def preview_data(self, item_path: Path, rows: int = 5) -> pd.DataFrame:
+    def preview_data(self, item_path: Path, rows: int = 5) -> 'pd.DataFrame':
         """Preview data from a pending item."""
+        import pandas as pd
+        
         if item_path.is_dir():
             # Find CSV files in directory
             csv_files = list(item_path.glob("*.csv"))
@@ -72,6 +86,8 @@ class ValidationHelper:
             "date_range": None
         }
         
+        import pandas as pd
+        
         csv_files = []
         if item_path.is_dir():
             csv_files = list(item_path.glob("*.csv"))
@@ -186,6 +202,8 @@ class ValidationHelper:
             confidence = report.get("confidence_score")
             if confidence:
                 print(f"Confidence: {confidence:.2%}")
+            for issue in report.get("quality", {}).get("issues", []):
+                print(f"  ⚠️  {issue}")
             
             # Show data summary
             summary = self.get_data_summary(item_path)
@@ -16,6 +16,7 @@ warnings.filterwarnings('ignore')
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+from pipeline.validation_report import build_report
 
 # Define validation directory directly
 VALIDATION_PENDING_DIR = "/home/chris/calgary-analytica/data-engine/validation/pending"
@@ -377,7 +378,8 @@ class CMHCRentalExtractorV2:
             "year": self.year,
             "extraction_timestamp": datetime.now().isoformat(),
             "total_records": len(df),
-            "confidence_score": round(overall_confidence, 2),
+            # Data quality scaled by how sure the table parser was (its scores are 0-100)
+            **build_report(df, 'rental_market_annual', extraction_confidence=overall_confidence / 100),
             "confidence_details": self.confidence_scores,
             "property_types": sorted(df['property_type'].unique().tolist()),
             "metrics_summary": metrics_summary,
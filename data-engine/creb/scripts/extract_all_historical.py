@@ -6,7 +6,6 @@ Extracts all 9 required fields for city-wide data.
 """
 
 import pandas as pd
-import pdfplumber
 from pathlib import Path
 import logging
 import re
@@ -84,6 +83,7 @@ class HistoricalCREBExtractor:
         all_records = []
         
         try:
+            import pdfplumber
             with pdfplumber.open(pdf_path) as pdf:
                 for property_type, page_num in self.property_types.items():
                     if len(pdf.pages) >= page_num:
@@ -244,6 +244,7 @@ class HistoricalCREBExtractor:
         date_str = f"{year}-{month:02d}-01"
         
         try:
+            import pdfplumber
             with pdfplumber.open(pdf_path) as pdf:
                 if len(pdf.pages) >= 7:
                     page = pdf.pages[6]  # Page 7 (0-indexed)
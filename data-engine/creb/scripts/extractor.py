@@ -7,7 +7,6 @@ Updates both city-wide and district-level datasets from new PDF reports
 """
 
 import pandas as pd
-import pdfplumber
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import logging
@@ -22,6 +21,12 @@ import json
 sys.path.append(str(Path(__file__).resolve().parents[3]))
 from config.config_manager import get_config
 
+# Per-stage cost metrics live with the pipeline in data-engine/
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from pipeline.instrumentation import StageMetrics, PDF_DECODE, TRANSFORM, SAVE
+from pipeline.tracing import span
+from pipeline.validation_report import build_report
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -65,6 +70,8 @@ class CalgaryDataUpdater:
             'Row': 19
         }
         
+        self.metrics = StageMetrics('creb')
+        
     def load_existing_data(self) -> pd.DataFrame:
         """Load the existing Calgary CREB data."""
         if self.csv_path.exists():
@@ -141,10 +148,13 @@ class CalgaryDataUpdater:
     def extract_page_data(self, pdf_path: Path, page_num: int) -> Optional[str]:
         """Extract text from a specific page of the PDF."""
         try:
-            with pdfplumber.open(pdf_path) as pdf:
+            import pdfplumber
+            with self.metrics.stage(PDF_DECODE, pdf_path.name) as stage, pdfplumber.open(pdf_path) as pdf:
+                stage['bytes_read'] = self.metrics.file_bytes(pdf_path)
                 if len(pdf.pages) >= page_num:
                     page = pdf.pages[page_num - 1]  # 0-indexed
                     text = page.extract_text()
+                    stage['rows'] = len(text.splitlines()) if text else 0
                     return text
                 else:
                     logger.warning(f"PDF has only {len(pdf.pages)} pages, need page {page_num}")
@@ -342,10 +352,14 @@ class CalgaryDataUpdater:
         for property_type, page_num in self.property_types.items():
             logger.info(f"Extracting {property_type} data from page {page_num}...")
             
-            page_text = self.extract_page_data(pdf_path, page_num)
+            with span(f"page {page_num}", 'page', property_type=property_type):
+                page_text = self.extract_page_data(pdf_path, page_num)
+                if page_text:
+                    with self.metrics.stage(TRANSFORM, pdf_path.name) as stage:
+                        property_data = self.parse_property_type_data(page_text, property_type)
+                        stage['rows'] = len(property_data)
+            
             if page_text:
-                property_data = self.parse_property_type_data(page_text, property_type)
-                
                 # Filter for only the target months we need
                 filtered_data = []
                 for record in property_data:
@@ -405,26 +419,33 @@ class CalgaryDataUpdater:
         """Extract district-level data from PDF (page 7)."""
         logger.info(f"Extracting district data from {pdf_path.name} for {target_month}")
         
-        try:
-            with pdfplumber.open(pdf_path) as pdf:
-                # Page 7 contains district data
-                if len(pdf.pages) >= 7:
-                    page = pdf.pages[6]  # 0-indexed, so page 7 is index 6
-                    text = page.extract_text()
+        with span(pdf_path.name, 'file', part='district'), span('page 7', 'page'):
+            try:
+                import pdfplumber
+                text = None
+                with self.metrics.stage(PDF_DECODE, pdf_path.name) as stage, pdfplumber.open(pdf_path) as pdf:
+                    stage['bytes_read'] = self.metrics.file_bytes(pdf_path)
+                    # Page 7 contains district data
+                    if len(pdf.pages) >= 7:
+                        page = pdf.pages[6]  # 0-indexed, so page 7 is index 6
+                        text = page.extract_text()
+                        stage['rows'] = len(text.splitlines()) if text else 0
                     
-                    if text:
+                if text:
+                    with self.metrics.stage(TRANSFORM, pdf_path.name) as stage:
                         records = self._parse_district_page(text, pdf_path.name, target_month)
-                        if records:
-                            df = pd.DataFrame(records)
-                            logger.info(f"Extracted {len(df)} district records for {target_month}")
-                            return df
+                        stage['rows'] = len(records)
+                    if records:
+                        df = pd.DataFrame(records)
+                        logger.info(f"Extracted {len(df)} district records for {target_month}")
+                        return df
                 
-            logger.warning(f"No district data found in {pdf_path.name}")
-            return pd.DataFrame()
+                logger.warning(f"No district data found in {pdf_path.name}")
+                return pd.DataFrame()
             
-        except Exception as e:
-            logger.error(f"Error extracting district data from {pdf_path.name}: {e}")
-            return pd.DataFrame()
+            except Exception as e:
+                logger.error(f"Error extracting district data from {pdf_path.name}: {e}")
+                return pd.DataFrame()
     
     def _parse_district_page(self, text: str, filename: str, target_month: str) -> List[Dict]:
         """Parse district data from page 7 text."""
@@ -621,29 +642,30 @@ class CalgaryDataUpdater:
     def create_validation_report(self, df: pd.DataFrame, output_path: Path, data_type: str) -> None:
         """Create a JSON validation report for the extracted data."""
         try:
+            date_col = 'date' if 'date' in df.columns else 'Date'
+            prop_col = 'property_type' if 'property_type' in df.columns else 'Property_Type'
+            
+            # Property type breakdown in one grouped pass
+            property_types = df.groupby(prop_col)[date_col].agg(['size', 'min', 'max'])
+            
             # Calculate summary statistics
             validation_report = {
                 "source": f"creb_{data_type}_data",
                 "extraction_date": datetime.now().isoformat(),
-                "records_extracted": len(df),
-                "date_range": f"{df['date'].min() if 'date' in df else df['Date'].min()} to {df['date'].max() if 'date' in df else df['Date'].max()}",
-                "property_types": {},
+                **build_report(df, f"housing_{data_type}_monthly"),
+                "property_types": {
+                    prop_type: {
+                        "count": int(info['size']),
+                        "date_range": f"{info['min']} to {info['max']}"
+                    }
+                    for prop_type, info in property_types.to_dict('index').items()
+                },
                 "sample_records": []
             }
             
-            
-            # Property type breakdown
-            prop_col = 'property_type' if 'property_type' in df.columns else 'Property_Type'
-            for prop_type in df[prop_col].unique():
-                prop_data = df[df[prop_col] == prop_type]
-                validation_report["property_types"][prop_type] = {
-                    "count": len(prop_data),
-                    "date_range": f"{prop_data['date'].min() if 'date' in df else prop_data['Date'].min()} to {prop_data['date'].max() if 'date' in df else prop_data['Date'].max()}"
-                }
-            
             # Sample records from latest month
-            latest_date = df['date'].max() if 'date' in df else df['Date'].max()
-            latest_data = df[df['date' if 'date' in df else 'Date'] == latest_date]
+            latest_date = df[date_col].max()
+            latest_data = df[df[date_col] == latest_date]
             
             for _, row in latest_data.head(5).iterrows():
                 if data_type == "city":
@@ -663,6 +685,9 @@ class CalgaryDataUpdater:
                     }
                 validation_report["sample_records"].append(sample)
             
+            # Cost of the stages run so far
+            validation_report["performance"] = self.metrics.summary()
+            
             # Save validation report
             report_path = output_path.with_suffix('.json')
             with open(report_path, 'w') as f:
@@ -674,7 +699,9 @@ class CalgaryDataUpdater:
     def save_district_data(self, df: pd.DataFrame) -> bool:
         """Save updated district data to validation/pending."""
         try:
-            df.to_csv(self.output_district_path, index=False)
+            with self.metrics.stage(SAVE, self.output_district_path.name) as stage:
+                df.to_csv(self.output_district_path, index=False)
+                stage['rows'] = len(df)
             logger.info(f"District data saved to {self.output_district_path}")
             
             # Create validation report
@@ -689,7 +716,9 @@ class CalgaryDataUpdater:
         """Save the updated data to validation/pending."""
         try:
             # Save to validation/pending
-            df.to_csv(self.output_city_path, index=False)
+            with self.metrics.stage(SAVE, self.output_city_path.name) as stage:
+                df.to_csv(self.output_city_path, index=False)
+                stage['rows'] = len(df)
             logger.info(f"Updated data saved to {self.output_city_path}")
             
             # Create validation report
@@ -718,6 +747,13 @@ class CalgaryDataUpdater:
             return False
     
     def run_update(self) -> bool:
+        """Run the complete update process and log each stage's cost to extraction_log."""
+        try:
+            return self._run_update()
+        finally:
+            self.metrics.write_log(get_config().get_database_path())
+    
+    def _run_update(self) -> bool:
         """Run the complete update process for both city-wide and district data."""
         
         logger.info("🏠 Starting Calgary CREB data update (unified)")
@@ -753,7 +789,8 @@ class CalgaryDataUpdater:
         # Process city-wide data (pages 11,13,15,17,19)
         if missing_months:
             logger.info(f"📊 Processing city-wide data for {len(missing_months)} missing months")
-            new_df = self.extract_new_data_from_pdf(latest_pdf, missing_months)
+            with span(latest_pdf.name, 'file', part='city'):
+                new_df = self.extract_new_data_from_pdf(latest_pdf, missing_months)
             
             if not new_df.empty:
                 updated_df = self.update_csv(existing_df, new_df)
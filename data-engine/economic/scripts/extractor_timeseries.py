@@ -19,6 +19,12 @@ import sys
 sys.path.append(str(Path(__file__).resolve().parents[3]))
 from config.config_manager import ConfigManager
 
+# Per-stage cost metrics live with the pipeline in data-engine/
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from pipeline.instrumentation import StageMetrics, EXCEL_PARSE, TRANSFORM, SAVE
+from pipeline.tracing import span
+from pipeline.validation_report import build_report, sample_records
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -30,6 +36,7 @@ class CalgaryEconomicTimeSeriesExtractor:
         self.config = ConfigManager()
         self.raw_data_path = self.config.get_economic_data_dir()
         self.validation_pending_path = self.config.get_pending_review_dir()
+        self.metrics = StageMetrics('economic')
         
         # Enhanced indicator mapping with value type detection
         self.indicator_patterns = {
@@ -399,66 +406,71 @@ class CalgaryEconomicTimeSeriesExtractor:
         
         try:
             # Read Excel file
-            df = pd.read_excel(file_path, sheet_name='Table', header=None)
+            with self.metrics.stage(EXCEL_PARSE, file_path.name) as stage:
+                df = pd.read_excel(file_path, sheet_name='Table', header=None)
+                stage['bytes_read'] = file_path.stat().st_size
+                stage['rows'] = len(df)
             
-            # Parse date headers
-            date_columns = self.parse_date_headers(df)
+            with self.metrics.stage(TRANSFORM, file_path.name) as stage:
+                # Parse date headers
+                date_columns = self.parse_date_headers(df)
             
-            if not date_columns:
-                logger.error(f"No date columns found in {file_path.name}")
-                return []
+                if not date_columns:
+                    logger.error(f"No date columns found in {file_path.name}")
+                    return []
             
-            logger.info(f"Found {len(date_columns)} date columns: {list(date_columns.values())[:5]}...")
+                logger.info(f"Found {len(date_columns)} date columns: {list(date_columns.values())[:5]}...")
             
-            # Process each data row
-            for row_idx in range(4, len(df)):
-                row = df.iloc[row_idx]
+                # Process each data row
+                for row_idx in range(4, len(df)):
+                    row = df.iloc[row_idx]
                 
-                # Get indicator name from column 4
-                indicator_text = row[4]
-                indicator_match = self.identify_indicator(indicator_text)
+                    # Get indicator name from column 4
+                    indicator_text = row[4]
+                    indicator_match = self.identify_indicator(indicator_text)
                 
-                if not indicator_match:
-                    continue
+                    if not indicator_match:
+                        continue
                 
-                indicator_type, config = indicator_match
+                    indicator_type, config = indicator_match
                 
-                # Check if next row is YoY change for this indicator
-                yoy_values = {}
-                if row_idx + 1 < len(df):
-                    next_row = df.iloc[row_idx + 1]
-                    next_text = str(next_row[4]).lower() if pd.notna(next_row[4]) else ""
+                    # Check if next row is YoY change for this indicator
+                    yoy_values = {}
+                    if row_idx + 1 < len(df):
+                        next_row = df.iloc[row_idx + 1]
+                        next_text = str(next_row[4]).lower() if pd.notna(next_row[4]) else ""
                     
-                    is_yoy = any(re.search(pattern, next_text) for pattern in self.yoy_patterns)
-                    if is_yoy:
-                        # Extract YoY values
-                        for col_idx, (date_label, parsed_date) in date_columns.items():
-                            yoy_val = self.extract_value(next_row[col_idx], 
-                                                       {'value_type': 'yoy_change', 'unit': 'percentage'})
-                            if yoy_val is not None:
-                                yoy_values[date_label] = yoy_val
+                        is_yoy = any(re.search(pattern, next_text) for pattern in self.yoy_patterns)
+                        if is_yoy:
+                            # Extract YoY values
+                            for col_idx, (date_label, parsed_date) in date_columns.items():
+                                yoy_val = self.extract_value(next_row[col_idx], 
+                                                           {'value_type': 'yoy_change', 'unit': 'percentage'})
+                                if yoy_val is not None:
+                                    yoy_values[date_label] = yoy_val
                 
-                # Extract values for each date column
-                for col_idx, (date_label, parsed_date) in date_columns.items():
-                    value = self.extract_value(row[col_idx], config)
+                    # Extract values for each date column
+                    for col_idx, (date_label, parsed_date) in date_columns.items():
+                        value = self.extract_value(row[col_idx], config)
                     
-                    if value is not None:
-                        record = {
-                            'date': parsed_date.strftime('%Y-%m-%d'),
-                            'indicator_type': indicator_type,
-                            'indicator_name': str(indicator_text).strip(),
-                            'value': value,
-                            'unit': config['unit'],
-                            'value_type': config['value_type'],
-                            'category': config['category'],
-                            '_source_file': file_path.name  # Temporary for deduplication
-                        }
+                        if value is not None:
+                            record = {
+                                'date': parsed_date.strftime('%Y-%m-%d'),
+                                'indicator_type': indicator_type,
+                                'indicator_name': str(indicator_text).strip(),
+                                'value': value,
+                                'unit': config['unit'],
+                                'value_type': config['value_type'],
+                                'category': config['category'],
+                                '_source_file': file_path.name  # Temporary for deduplication
+                            }
                         
-                        # Add YoY change if available
-                        if date_label in yoy_values:
-                            record['yoy_change'] = yoy_values[date_label]
+                            # Add YoY change if available
+                            if date_label in yoy_values:
+                                record['yoy_change'] = yoy_values[date_label]
                         
-                        records.append(record)
+                            records.append(record)
+                stage['rows'] = len(records)
             
             logger.info(f"Extracted {len(records)} time series records from {file_path.name}")
             return records
@@ -499,7 +511,8 @@ class CalgaryEconomicTimeSeriesExtractor:
         
         for file_path in excel_files:
             try:
-                records = self.extract_time_series_from_excel(file_path)
+                with span(file_path.name, 'file'), span('Table', 'sheet'):
+                    records = self.extract_time_series_from_excel(file_path)
                 
                 if records:
                     all_records.extend(records)
@@ -520,6 +533,8 @@ class CalgaryEconomicTimeSeriesExtractor:
             csv_path = self._save_to_validation(unique_records)
             logger.info(f"💾 Saved {len(unique_records)} records to {csv_path}")
         
+        self.metrics.write_log(self.config.get_database_path())
+        
         # Summary statistics
         date_range = self._get_date_range(unique_records)
         indicators_found = len(set(r['indicator_type'] for r in unique_records))
@@ -606,55 +621,43 @@ class CalgaryEconomicTimeSeriesExtractor:
         self.validation_pending_path.mkdir(parents=True, exist_ok=True)
         
         # Save to CSV
-        df.to_csv(csv_path, index=False)
+        with self.metrics.stage(SAVE, csv_path.name) as stage:
+            df.to_csv(csv_path, index=False)
+            stage['rows'] = len(df)
         
         # Create validation report
+        indicators = df.groupby('indicator_type').agg(
+            count=('date', 'size'),
+            first=('date', 'min'),
+            last=('date', 'max'),
+            unit=('unit', 'first'),
+            value_type=('value_type', 'first')
+        )
         validation_report = {
             'source': 'economic_indicators_timeseries',
             'extraction_date': datetime.now().isoformat(),
-            'records_extracted': len(records),
-            'date_range': self._get_date_range(records),
+            **build_report(df, 'economic_indicators_monthly'),
             'files_processed': 'N/A',  # Source file info removed for simplicity
-            'indicators_summary': {},
-            'value_types': {},
-            'sample_records': []
-        }
-        
-        # Summarize by indicator
-        for record in records:
-            ind_type = record['indicator_type']
-            if ind_type not in validation_report['indicators_summary']:
-                validation_report['indicators_summary'][ind_type] = {
-                    'count': 0,
-                    'date_range': [],
-                    'unit': record['unit'],
-                    'value_type': record['value_type']
+            'indicators_summary': {
+                ind_type: {
+                    'count': int(info['count']),
+                    'date_range': f"{info['first']} to {info['last']}",
+                    'unit': info['unit'],
+                    'value_type': info['value_type']
                 }
-            validation_report['indicators_summary'][ind_type]['count'] += 1
-            validation_report['indicators_summary'][ind_type]['date_range'].append(record['date'])
-        
-        # Get date ranges for each indicator
-        for ind_type, info in validation_report['indicators_summary'].items():
-            dates = sorted(info['date_range'])
-            info['date_range'] = f"{dates[0]} to {dates[-1]}"
-        
-        # Count by value type
-        for record in records:
-            vtype = record['value_type']
-            validation_report['value_types'][vtype] = validation_report['value_types'].get(vtype, 0) + 1
+                for ind_type, info in indicators.to_dict('index').items()
+            },
+            'value_types': {vtype: int(count) for vtype, count in df['value_type'].value_counts().items()},
+            'sample_records': [],
+            'performance': self.metrics.summary()
+        }
         
         # Sample records for verification
         sample_indicators = ['unemployment_rate', 'population', 'oil_price_wti', 'inflation_rate_calgary']
-        for ind in sample_indicators:
-            sample = next((r for r in records if r['indicator_type'] == ind and r['date'] >= '2025-01-01'), None)
-            if sample:
-                validation_report['sample_records'].append({
-                    'indicator': ind,
-                    'date': sample['date'],
-                    'value': sample['value'],
-                    'unit': sample['unit'],
-                    'yoy_change': sample.get('yoy_change', 'N/A')
-                })
+        recent = df[df['indicator_type'].isin(sample_indicators) & (df['date'] >= '2025-01-01')]
+        samples = recent.drop_duplicates('indicator_type').rename(columns={'indicator_type': 'indicator'})
+        validation_report['sample_records'] = sample_records(
+            samples, ['indicator', 'date', 'value', 'unit', 'yoy_change'], len(samples))
         
         # Save validation report
         report_path = csv_path.with_suffix('.json')
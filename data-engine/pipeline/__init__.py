@@ -0,0 +1,4 @@
+# Pipeline scheduling for Calgary Analytica data engine
+# scheduler, instrumentation and tracing are imported as submodules (pipeline.tracing etc.)
+# so CLIs that only need task definitions or no-op spans start quickly
+from .tasks import PIPELINE_TASKS, STAGES, EXTRACT_SOURCES, build_plan, month_range, available_sources
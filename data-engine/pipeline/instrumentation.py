@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Calgary Analytica - Extraction Stage Metrics
+Records what each extraction stage costs (wall and CPU time, peak memory, bytes read,
+rows produced) for the validation report and the extraction_log table, so a source
+that gets slower month over month shows up in the numbers.
+"""
+
+import argparse
+import resource
+import sqlite3
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, Optional
+import logging
+
+# Also run as a script (the trend report), so import through data-engine/
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from pipeline.tracing import span
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'data-lake'))
+from database import connect
+
+logger = logging.getLogger(__name__)
+
+# Stage names used by the extractors
+PDF_DECODE = 'pdf_decode'
+EXCEL_PARSE = 'excel_parse'
+HTTP_FETCH = 'http_fetch'
+TRANSFORM = 'transform'
+SAVE = 'save'
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far (ru_maxrss is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class StageMetrics:
+    """Per-stage cost of one extraction run.
+
+    Wrap each stage in `with metrics.stage(name, source_file) as stage:` and set
+    stage['rows'] and stage['bytes_read'] inside the block. Memory is the process RSS
+    high-water mark; when Python runs with -X tracemalloc the traced peak of each stage
+    is recorded as well.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.stages = []
+        self._files_read = set()
+
+    def file_bytes(self, path: Path) -> int:
+        """Size of a file the first time the run reads it, 0 after that.
+
+        For bytes_read of stages that re-open the same file (one per workbook sheet or PDF
+        page), so each file counts once in the totals.
+        """
+        path = Path(path).resolve()
+        if path in self._files_read:
+            return 0
+        self._files_read.add(path)
+        return path.stat().st_size
+
+    @contextmanager
+    def stage(self, name: str, source_file: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Measure (and trace) one stage; an exception marks it failed and propagates."""
+        stage = {
+            'stage': name,
+            'source_file': str(source_file) if source_file else self.source,
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'rows': 0,
+            'bytes_read': 0,
+            'status': 'success'
+        }
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        rss_before = peak_rss_mb()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+
+        with span(name, 'stage', source=self.source, file=stage['source_file']) as trace:
+            try:
+                yield stage
+            except Exception as e:
+                stage['status'] = 'failed'
+                stage['error'] = str(e)
+                raise
+            finally:
+                stage['wall_seconds'] = round(time.perf_counter() - wall_start, 4)
+                stage['cpu_seconds'] = round(time.process_time() - cpu_start, 4)
+                stage['peak_rss_mb'] = round(peak_rss_mb(), 1)
+                stage['rss_growth_mb'] = round(stage['peak_rss_mb'] - rss_before, 1)
+                if tracing:
+                    stage['traced_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+                self.stages.append(stage)
+                trace.update(rows=stage['rows'], bytes_read=stage['bytes_read'])
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals per stage name plus every stage, for the validation report."""
+        by_stage = {}
+        for stage in self.stages:
+            totals = by_stage.setdefault(stage['stage'], {'count': 0, 'rows': 0, 'bytes_read': 0,
+                                                          'wall_seconds': 0.0, 'cpu_seconds': 0.0})
+            totals['count'] += 1
+            totals['rows'] += stage['rows']
+            totals['bytes_read'] += stage['bytes_read']
+            totals['wall_seconds'] = round(totals['wall_seconds'] + stage['wall_seconds'], 4)
+            totals['cpu_seconds'] = round(totals['cpu_seconds'] + stage['cpu_seconds'], 4)
+
+        return {
+            'run_id': self.run_id,
+            'wall_seconds': round(sum(s['wall_seconds'] for s in self.stages), 4),
+            'cpu_seconds': round(sum(s['cpu_seconds'] for s in self.stages), 4),
+            'bytes_read': sum(s['bytes_read'] for s in self.stages),
+            'peak_rss_mb': max((s['peak_rss_mb'] for s in self.stages), default=None),
+            'by_stage': by_stage,
+            'stages': self.stages
+        }
+
+    def write_log(self, db_path: Path, confidence_score: Optional[float] = None) -> int:
+        """Append one extraction_log row per stage. Returns the rows written."""
+        db_path = Path(db_path)
+        if not self.stages or not db_path.exists():
+            return 0
+
+        conn = connect(db_path)
+        try:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(extraction_log)")}
+            if not columns:
+                logger.debug("No extraction_log table - stage metrics not logged")
+                return 0
+            if 'stage' not in columns:
+                logger.warning("⚠️  extraction_log has no stage metric columns - run data-lake/migrate.py")
+                return 0
+
+            conn.executemany(
+                """INSERT INTO extraction_log
+                   (pdf_file, extraction_type, status, records_extracted, confidence_score, error_message,
+                    extracted_date, run_id, stage, wall_seconds, cpu_seconds, peak_rss_mb, traced_peak_mb,
+                    bytes_read)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                [(stage['source_file'], self.source, stage['status'], stage['rows'], confidence_score,
+                  stage.get('error'), stage['started_at'], self.run_id, stage['stage'],
+                  stage['wall_seconds'], stage['cpu_seconds'], stage['peak_rss_mb'],
+                  stage.get('traced_peak_mb'), stage['bytes_read'])
+                 for stage in self.stages]
+            )
+            conn.commit()
+            return len(self.stages)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️  Could not log stage metrics: {e}")
+            return 0
+        finally:
+            conn.close()
+
+
+def stage_trends(db_path: Path, source: Optional[str] = None, months: int = 6) -> List[Dict[str, Any]]:
+    """Monthly totals per source and stage from extraction_stage_monthly, newest months last."""
+    conn = connect(db_path, read_only=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        query = """
+            SELECT * FROM extraction_stage_monthly
+            WHERE month >= strftime('%Y-%m', 'now', ?)
+        """
+        params = [f"-{months} months"]
+        if source:
+            query += " AND source = ?"
+            params.append(source)
+        query += " ORDER BY source, stage, month"
+        return [dict(row) for row in conn.execute(query, params)]
+    finally:
+        conn.close()
+
+
+def main():
+    """Print month-over-month stage costs per source."""
+    parser = argparse.ArgumentParser(description="Show extraction stage costs by month")
+    parser.add_argument('--source', help='Only this source (e.g. creb, crime, economic, 311, rentfaster)')
+    parser.add_argument('--months', type=int, default=6, help='Months to show (default: 6)')
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from config.config_manager import get_config
+    db_path = get_config().get_database_path()
+
+    try:
+        trends = stage_trends(db_path, args.source, args.months)
+    except sqlite3.OperationalError as e:
+        print(f"❌ {e} - run data-lake/migrate.py")
+        sys.exit(1)
+
+    print("⏱️  Extraction Stage Costs")
+    print("=" * 50)
+    if not trends:
+        print("No stage metrics logged yet")
+        return
+
+    # Compare time per run, so a month with an extra run doesn't read as a slowdown
+    previous = {}
+    for row in trends:
+        key = (row['source'], row['stage'])
+        per_run = (row['wall_seconds'] or 0) / row['runs'] if row['runs'] else 0
+        change = ''
+        if previous.get(key):
+            pct = (per_run - previous[key]) / previous[key] * 100
+            change = f"  {pct:+.0f}%"
+        rate = f"{row['rows_per_second']:,.0f} rows/s" if row['rows_per_second'] else '-'
+        print(f"  {row['source']:<11} {row['stage']:<12} {row['month']}  {row['runs']:>3} runs  "
+              f"{per_run:8.2f}s/run{change:<7} {rate:>16}  {row['peak_rss_mb'] or 0:7.1f} MB")
+        previous[key] = per_run
+
+
+if __name__ == "__main__":
+    main()
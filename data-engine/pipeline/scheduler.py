@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Calgary Analytica - Pipeline Scheduler
+Runs a task plan in a process pool: each task starts as soon as its dependencies have
+finished, so independent extractors run side by side and a month-end refresh takes
+about as long as its slowest source plus loading and exports.
+"""
+
+import os
+import sys
+import glob
+import time
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+import logging
+
+from .tracing import span, flush, child_env
+
+logger = logging.getLogger(__name__)
+
+# Final task states
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+SKIPPED = 'skipped'   # No input files present; dependents still run
+BLOCKED = 'blocked'   # A dependency failed
+
+# Workers mostly wait on their script's subprocess, so this is not tied to CPU count;
+# it bounds how many extractors (and API clients) run at once
+DEFAULT_MAX_WORKERS = 8
+
+
+def run_task(task: Dict[str, Any], project_root: str, log_path: str) -> Dict[str, Any]:
+    """Run one task's script in a fresh interpreter (executed in a pool worker)."""
+    command = [sys.executable, str(Path(project_root) / task['script'])] + task['args']
+    started = time.time()
+    with span(task['name'], 'task', script=task['script'], args=' '.join(task['args'])) as trace, \
+            open(log_path, 'w') as log:
+        log.write(f"$ {' '.join(command)}\n\n")
+        log.flush()
+        result = subprocess.run(command, cwd=str(Path(project_root) / task['cwd']),
+                                stdout=log, stderr=subprocess.STDOUT, text=True,
+                                env=child_env(task['name']))
+        trace['returncode'] = result.returncode
+    flush()
+    return {
+        'name': task['name'],
+        'returncode': result.returncode,
+        'started': started,
+        'finished': time.time(),
+        'log': log_path
+    }
+
+
+class PipelineScheduler:
+    """Dependency-aware scheduler for a plan built by pipeline.tasks.build_plan()."""
+
+    def __init__(self, plan: Dict[str, Dict[str, Any]], project_root: Path,
+                 log_dir: Path, max_workers: Optional[int] = None):
+        self.plan = plan
+        self.project_root = Path(project_root)
+        self.log_dir = Path(log_dir)
+        self.max_workers = max(1, min(max_workers or DEFAULT_MAX_WORKERS, len(plan)))
+        self.results = {}  # task name -> result dict with 'state'
+        self.wall_time = 0.0
+
+        missing = {dep for task in plan.values() for dep in task['depends_on']} - set(plan)
+        if missing:
+            raise ValueError(f"Plan depends on unplanned task(s): {', '.join(sorted(missing))}")
+
+    def has_inputs(self, task: Dict[str, Any]) -> bool:
+        """True if the task needs no files, or at least one of its input patterns matches."""
+        if not task['inputs']:
+            return True
+        return any(glob.glob(str(self.project_root / pattern)) for pattern in task['inputs'])
+
+    def new_outputs(self, task: Dict[str, Any], since: float) -> List[str]:
+        """Output files written by a task, relative to the project root."""
+        written = []
+        for pattern in task['outputs']:
+            for path in glob.glob(str(self.project_root / pattern)):
+                if os.path.getmtime(path) >= since:
+                    written.append(str(Path(path).relative_to(self.project_root)))
+        return sorted(written)
+
+    def _finish(self, name: str, state: str, **details) -> None:
+        self.results[name] = {'name': name, 'state': state, **details}
+        icon = {SUCCEEDED: '✅', FAILED: '❌', SKIPPED: '⏭️ ', BLOCKED: '⛔'}[state]
+        duration = details.get('duration')
+        suffix = f" ({duration:.1f}s)" if duration is not None else ""
+        logger.info(f"{icon} {name}: {state}{suffix}")
+
+    def _block_dependents(self, failed: str) -> None:
+        """Mark every task downstream of a failure as blocked."""
+        for name, task in self.plan.items():
+            if name not in self.results and failed in task['depends_on']:
+                self._finish(name, BLOCKED, reason=f"{failed} did not succeed")
+                self._block_dependents(name)
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        """Run the plan to completion and return each task's result."""
+        # Imported here so `monthly_update --status` (which imports the package) starts fast
+        from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+        
+        run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        run_started = time.time()
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            running = {}  # future -> task name
+            while len(self.results) < len(self.plan):
+                finished = len(self.results)
+                # Start every task whose dependencies have all finished cleanly
+                for name, task in self.plan.items():
+                    if name in self.results or name in running.values():
+                        continue
+                    if not all(self.results.get(dep, {}).get('state') in (SUCCEEDED, SKIPPED)
+                               for dep in task['depends_on']):
+                        continue
+                    if not self.has_inputs(task):
+                        self._finish(name, SKIPPED, reason='no input files')
+                        continue
+                    log_path = self.log_dir / f"{run_id}_{name.replace(':', '_')}.log"
+                    logger.info(f"▶️  {name}: {task['script']} {' '.join(task['args'])}".rstrip())
+                    future = pool.submit(run_task, task, str(self.project_root), str(log_path))
+                    running[future] = name
+
+                if not running:
+                    if len(self.results) == finished:
+                        raise ValueError("Plan has a dependency cycle")
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        self._finish(name, FAILED, error=str(e))
+                        self._block_dependents(name)
+                        continue
+
+                    details = {
+                        'duration': result['finished'] - result['started'],
+                        'started': result['started'] - run_started,
+                        'log': result['log'],
+                        'outputs': self.new_outputs(self.plan[name], result['started'])
+                    }
+                    if result['returncode'] == 0:
+                        self._finish(name, SUCCEEDED, **details)
+                    else:
+                        self._finish(name, FAILED, returncode=result['returncode'], **details)
+                        self._block_dependents(name)
+
+        self.wall_time = time.time() - run_started
+        return self.results
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts per state plus wall time against the serial run time."""
+        states = [result['state'] for result in self.results.values()]
+        task_time = sum(result.get('duration', 0) for result in self.results.values())
+        return {
+            'tasks': len(self.plan),
+            **{state: states.count(state) for state in (SUCCEEDED, FAILED, SKIPPED, BLOCKED)},
+            'wall_time': self.wall_time,
+            'task_time': task_time,
+            'slowest': max(self.results.values(), key=lambda r: r.get('duration', 0), default=None)
+        }
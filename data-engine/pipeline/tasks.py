@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Calgary Analytica - Pipeline Tasks
+Describes each data source as a task (script, arguments, inputs, outputs, dependencies)
+so the scheduler can run independent extractors side by side.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Any, Tuple
+
+# Tasks run in stage order: every task waits for all planned tasks of the stage before it
+STAGES = ['extract', 'load', 'export']
+
+# Paths are relative to the project root. Arguments and input patterns may use
+# {year}, {month}, {first_year}, {last_year}; an argument of exactly '{years}' expands
+# to one argument per year. per_month tasks are planned once for each month; planned_with
+# plans a task whenever that stage is planned, even if its own stage is not.
+PIPELINE_TASKS = {
+    'creb': {
+        'stage': 'extract',
+        'script': 'data-engine/creb/scripts/extractor.py',
+        'args': [],
+        'inputs': ['data-engine/creb/raw/{month:02d}_{year}_Calgary_Monthly_Stats_Package.pdf'],
+        'outputs': ['data-engine/validation/pending/creb_*_all_historical.csv'],
+        'depends_on': []
+    },
+    'economic': {
+        'stage': 'extract',
+        'script': 'data-engine/economic/scripts/extractor_timeseries.py',
+        'args': ['--year-start', '{first_year}', '--year-end', '{last_year}'],
+        'inputs': ['data-engine/economic/raw/*.xlsx'],
+        'outputs': ['data-engine/validation/pending/economic_timeseries_*.csv'],
+        'depends_on': []
+    },
+    'crime': {
+        'stage': 'extract',
+        'script': 'data-engine/police/scripts/extractor.py',
+        'args': ['--years', '{years}'],
+        'inputs': ['data-engine/police/raw/*.xlsx'],
+        'outputs': ['data-engine/validation/pending/crime_statistics_*.csv'],
+        'depends_on': []
+    },
+    '311': {
+        'stage': 'extract',
+        'script': 'data-engine/calgary_portal/311/extractor_monthly.py',
+        'args': ['--year', '{year}', '--month', '{month}'],
+        'inputs': [],  # Socrata API
+        'outputs': ['data-engine/validation/pending/311_monthly_summary_{year}_{month:02d}_*.csv'],
+        'depends_on': [],
+        'per_month': True
+    },
+    'cmhc': {
+        'stage': 'extract',
+        'script': 'data-engine/cmhc/rent/scripts/extractor_v2.py',
+        'args': [],
+        'inputs': ['data-engine/cmhc/rent/raw/*.xlsx'],
+        'outputs': ['data-engine/validation/pending/cmhc_rental_*.csv'],
+        'depends_on': []
+    },
+    'rentfaster': {
+        'stage': 'extract',
+        'script': 'data-engine/rentfaster/scripts/extractor.py',
+        'args': ['20'],  # Listing pages to fetch
+        'inputs': [],  # RentFaster API
+        'outputs': ['data-engine/validation/pending/rentfaster_listings_*.csv'],
+        'depends_on': []
+    },
+    'boundaries': {
+        'stage': 'extract',
+        'script': 'data-engine/calgary_portal/boundaries/extractor_batch.py',
+        'args': ['--refresh'],  # Skips datasets unchanged on the portal
+        'inputs': [],  # Socrata API
+        'outputs': ['data-engine/validation/pending/calgary_portal_*.csv'],
+        'depends_on': []
+    },
+    'load': {
+        'stage': 'load',
+        'script': 'data-engine/cli/load_csv_direct.py',
+        'args': [],
+        'inputs': ['data-engine/validation/approved/*.csv'],
+        'outputs': ['data-lake/calgary_data.db'],
+        'depends_on': []
+    },
+    'backup': {
+        # Runs alongside the exports (both only read the database) after every load
+        'stage': 'export',
+        'planned_with': 'load',
+        'script': 'data-lake/backup.py',
+        'args': [],
+        'inputs': ['data-lake/calgary_data.db'],
+        'outputs': ['data-lake/backups/calgary_data_backup.db'],
+        'depends_on': []
+    },
+    'exports': {
+        'stage': 'export',
+        'script': 'product-engine/dashboard-mvp/scripts/generate_all_exports.py',
+        'args': [],
+        'inputs': ['data-lake/calgary_data.db'],
+        'outputs': ['product-engine/dashboard-mvp/data/*.json'],
+        'depends_on': [],
+        'cwd': 'product-engine/dashboard-mvp/scripts'
+    }
+}
+
+EXTRACT_SOURCES = [name for name, task in PIPELINE_TASKS.items() if task['stage'] == 'extract']
+
+
+def month_range(start: str, end: str) -> List[Tuple[int, int]]:
+    """Every (year, month) from YYYY-MM to YYYY-MM inclusive."""
+    start_year, start_month = map(int, start.split('-'))
+    end_year, end_month = map(int, end.split('-'))
+
+    months = []
+    year, month = start_year, start_month
+    while (year, month) <= (end_year, end_month):
+        months.append((year, month))
+        month += 1
+        if month > 12:
+            month = 1
+            year += 1
+    return months
+
+
+def _expand(template: str, context: Dict[str, Any]) -> List[str]:
+    """Format one argument template, expanding '{years}' to one value per year."""
+    if template == '{years}':
+        return [str(year) for year in context['years']]
+    return [template.format(**context)]
+
+
+def build_plan(sources: List[str], months: List[Tuple[int, int]],
+               through: str = 'extract') -> Dict[str, Dict[str, Any]]:
+    """Resolve the tasks for a run into name -> task with concrete args and dependencies.
+
+    sources picks the extract tasks; through ('extract', 'load' or 'export') adds the
+    later stages. Each task depends on every task of the previous planned stage.
+    """
+    if not months:
+        raise ValueError("At least one month is required")
+    if through not in STAGES:
+        raise ValueError(f"Unknown stage '{through}' (expected one of {', '.join(STAGES)})")
+    unknown = set(sources) - set(EXTRACT_SOURCES)
+    if unknown:
+        raise ValueError(f"Unknown source(s): {', '.join(sorted(unknown))}")
+
+    years = sorted({year for year, _ in months})
+    last_stage = STAGES.index(through)
+    selected = []
+    for name, task in PIPELINE_TASKS.items():
+        planned_stage = STAGES.index(task.get('planned_with', task['stage']))
+        if name in sources or 0 < planned_stage <= last_stage:
+            selected.append(name)
+
+    plan = {}
+    for name in selected:
+        task = PIPELINE_TASKS[name]
+        task_months = [[month] for month in months] if task.get('per_month') else [months]
+
+        for period in task_months:
+            # Month-scoped templates use the period's last month
+            year, month = period[-1]
+            context = {'year': year, 'month': month, 'years': years,
+                       'first_year': years[0], 'last_year': years[-1]}
+            task_name = f"{name}:{year}-{month:02d}" if task.get('per_month') else name
+
+            # Input patterns naming a month are checked for every month in the period
+            inputs = sorted({pattern.format(**{**context, 'year': y, 'month': m})
+                             for pattern in task['inputs'] for y, m in period})
+
+            plan[task_name] = {
+                'name': task_name,
+                'source': name,
+                'stage': task['stage'],
+                'script': task['script'],
+                'args': [arg for template in task['args'] for arg in _expand(template, context)],
+                'inputs': inputs,
+                'outputs': [pattern.format(**context) for pattern in task['outputs']],
+                'depends_on': list(task['depends_on']),
+                'cwd': task.get('cwd', '.')
+            }
+
+    # Each stage waits for the nearest earlier stage that has tasks in the plan
+    planned_stages = sorted({STAGES.index(task['stage']) for task in plan.values()})
+    for task in plan.values():
+        stage = STAGES.index(task['stage'])
+        earlier = [s for s in planned_stages if s < stage]
+        previous = [other['name'] for other in plan.values()
+                    if earlier and STAGES.index(other['stage']) == earlier[-1]]
+        task['depends_on'] = sorted(set(task['depends_on'] + previous))
+
+    return plan
+
+
+def available_sources(project_root: Path) -> List[str]:
+    """Extract sources whose script is present."""
+    return [name for name in EXTRACT_SOURCES if (project_root / PIPELINE_TASKS[name]['script']).exists()]
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Calgary Analytica - Pipeline Tracing
+Records nested spans (source → file → sheet/page → stage) in Chrome Trace Event format
+so a slow month-end run can be opened as a flame chart in chrome://tracing or Perfetto.
+
+The command given --trace sets CALGARY_TRACE_DIR; every process started under it (pool
+workers, extractor and export subprocesses) inherits the variable and writes its own
+fragment there, and the root command merges the fragments into one trace file.
+"""
+
+import atexit
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional
+
+# Inherited by child processes
+TRACE_DIR_ENV = 'CALGARY_TRACE_DIR'
+TRACE_NAME_ENV = 'CALGARY_TRACE_NAME'  # Process label in the trace viewer
+
+
+class Tracer:
+    """Span recorder for one process; events go to a fragment file in the trace directory."""
+
+    def __init__(self, trace_dir: Path, process_name: str):
+        self.trace_dir = Path(trace_dir)
+        self.pid = os.getpid()
+        self.process_name = process_name
+        self.started_us = time.time_ns() // 1000
+        self.started = time.perf_counter()
+        self.closed = False
+        self.fragments = 0
+        self.events = [{'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'tid': 0,
+                        'args': {'name': process_name}}]
+
+    @contextmanager
+    def span(self, name: str, cat: str, args: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Record a complete ('X') event; callers may add to args inside the block."""
+        ts = time.time_ns() // 1000
+        start = time.perf_counter()
+        try:
+            yield args
+        except Exception as e:
+            args['error'] = str(e)
+            raise
+        finally:
+            self.events.append({
+                'name': name, 'cat': cat, 'ph': 'X', 'ts': ts,
+                'dur': round((time.perf_counter() - start) * 1_000_000),
+                'pid': self.pid, 'tid': threading.get_native_id(),
+                'args': {key: value if isinstance(value, (int, float, bool)) or value is None else str(value)
+                         for key, value in args.items()}
+            })
+
+    def flush(self) -> None:
+        """Write the events recorded so far to a new fragment."""
+        if not self.events or not self.trace_dir.exists():
+            return
+        self.fragments += 1
+        fragment = self.trace_dir / f"{self.pid}_{self.fragments}.json"
+        with open(fragment, 'w') as f:
+            json.dump(self.events, f)
+        self.events = []
+
+    def close(self) -> None:
+        """Add a span covering the whole process, then flush."""
+        if self.closed:
+            return
+        self.closed = True
+        self.events.append({
+            'name': self.process_name, 'cat': 'process', 'ph': 'X', 'ts': self.started_us,
+            'dur': round((time.perf_counter() - self.started) * 1_000_000),
+            'pid': self.pid, 'tid': threading.get_native_id(), 'args': {'argv': ' '.join(sys.argv)}
+        })
+        self.flush()
+
+
+_tracer = None
+
+
+def get_tracer() -> Optional[Tracer]:
+    """This process's tracer, or None when no trace is being recorded."""
+    global _tracer
+    trace_dir = os.environ.get(TRACE_DIR_ENV)
+    if not trace_dir:
+        return None
+    # A forked pool worker inherits the parent's tracer; give it its own
+    if _tracer is None or _tracer.pid != os.getpid():
+        name = os.environ.get(TRACE_NAME_ENV) or Path(sys.argv[0]).stem or 'python'
+        import multiprocessing
+        if multiprocessing.parent_process() is not None:
+            name = f"{name} ({multiprocessing.current_process().name})"
+        _tracer = Tracer(Path(trace_dir), name)
+        atexit.register(_tracer.close)
+    return _tracer
+
+
+@contextmanager
+def span(name: str, cat: str = 'pipeline', **args) -> Iterator[Dict[str, Any]]:
+    """Trace a block when tracing is on; a no-op otherwise. Yields the span's args dict."""
+    tracer = get_tracer()
+    if tracer is None:
+        yield args
+        return
+    with tracer.span(name, cat, args) as span_args:
+        yield span_args
+
+
+def flush() -> None:
+    """Write pending events now (pool workers exit without running atexit handlers)."""
+    if _tracer is not None and _tracer.pid == os.getpid():
+        _tracer.flush()
+
+
+def child_env(name: str, env: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Environment for a subprocess, labelled `name` in the trace when tracing is on."""
+    env = dict(os.environ if env is None else env)
+    if env.get(TRACE_DIR_ENV):
+        env[TRACE_NAME_ENV] = name
+    return env
+
+
+def start_trace(name: str) -> bool:
+    """Start recording for this process and its children. Returns False if a parent already is."""
+    if os.environ.get(TRACE_DIR_ENV):
+        return False
+    os.environ[TRACE_DIR_ENV] = tempfile.mkdtemp(prefix='calgary_trace_')
+    os.environ[TRACE_NAME_ENV] = name
+    get_tracer()
+    return True
+
+
+def finish_trace(output_path: Path) -> int:
+    """Merge every process's fragment into a Chrome trace file. Returns the event count."""
+    trace_dir = Path(os.environ.pop(TRACE_DIR_ENV))
+    os.environ.pop(TRACE_NAME_ENV, None)
+    if _tracer is not None and _tracer.pid == os.getpid():
+        _tracer.close()
+
+    events = []
+    for fragment in sorted(trace_dir.glob('*.json')):
+        with open(fragment) as f:
+            events.extend(json.load(f))
+    shutil.rmtree(trace_dir, ignore_errors=True)
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+    return len(events)
+
+
+# Start the process span as early as possible in processes launched under a trace
+if os.environ.get(TRACE_DIR_ENV):
+    get_tracer()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Calgary Analytica - Validation Report Engine
+One set of data-quality metrics for every extractor's validation report: null rates,
+value ranges, distinct counts, gaps in the period column, duplicates on the natural
+key and an overall confidence score, each computed with column-wise pandas operations
+over the whole frame (no per-record Python), checked against the table's declared schema.
+
+Extractors merge build_report() into their JSON report and keep their source-specific
+breakdowns alongside it.
+"""
+
+import argparse
+import fnmatch
+import json
+from pathlib import Path
+from typing import Dict, List, Any, Optional, TYPE_CHECKING
+import logging
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Declared schema of each table as its extractor writes it (columns match case-insensitively):
+#   id_columns        natural key; rows sharing it are duplicates (the table's UNIQUE key)
+#   date_column       period column, for the date range and gap check
+#   frequency         spacing of date_column periods: day, week, month, year (None: no gap check)
+#   required_columns  columns that must exist and be filled
+#   ranges            {column: (min, max)} plausible values (None: unbounded)
+#   files             extractor output names, to find the table for a CSV
+TABLE_SCHEMAS = {
+    'housing_city_monthly': {
+        'id_columns': ['date', 'property_type'],
+        'date_column': 'date',
+        'frequency': 'month',
+        'required_columns': ['date', 'property_type', 'sales', 'benchmark_price'],
+        'ranges': {'sales': (0, None), 'new_listings': (0, None), 'inventory': (0, None),
+                   'days_on_market': (0, 365), 'benchmark_price': (1, None)},
+        'files': ['creb_city_*.csv']
+    },
+    'housing_district_monthly': {
+        'id_columns': ['date', 'property_type', 'district'],
+        'date_column': 'date',
+        'frequency': 'month',
+        'required_columns': ['date', 'property_type', 'district', 'benchmark_price'],
+        'ranges': {'new_sales': (0, None), 'new_listings': (0, None), 'inventory': (0, None),
+                   'months_supply': (0, None), 'benchmark_price': (1, None)},
+        'files': ['creb_district_*.csv']
+    },
+    'economic_indicators_monthly': {
+        'id_columns': ['date', 'indicator_type', 'indicator_name'],
+        'date_column': 'date',
+        'frequency': 'month',
+        'required_columns': ['date', 'indicator_type', 'value'],
+        'ranges': {},
+        'files': ['economic_*.csv']
+    },
+    'crime_statistics_monthly': {
+        'id_columns': ['date', 'community', 'crime_category', 'crime_type'],
+        'date_column': 'date',
+        'frequency': 'month',
+        'required_columns': ['date', 'crime_category', 'crime_type', 'incident_count'],
+        'ranges': {'incident_count': (0, None)},
+        'files': ['crime_statistics_*.csv']
+    },
+    'service_requests_311_monthly': {
+        'id_columns': ['year_month', 'community_code', 'service_category'],
+        'date_column': 'year_month',
+        'frequency': 'month',
+        'required_columns': ['year_month', 'community_code', 'service_category', 'total_requests'],
+        'ranges': {'total_requests': (0, None), 'open_requests': (0, None), 'closed_requests': (0, None),
+                   'avg_days_to_close': (0, None), 'median_days_to_close': (0, None)},
+        'files': ['311_monthly_summary_*.csv']
+    },
+    'service_requests_311': {
+        'id_columns': ['service_request_id'],
+        'date_column': 'date',
+        'frequency': 'day',
+        'required_columns': ['service_request_id', 'date', 'service_name', 'status_description'],
+        # Calgary and its surroundings
+        'ranges': {'latitude': (50.8, 51.3), 'longitude': (-114.4, -113.8)},
+        'files': ['311_service_requests_*.csv']
+    },
+    'rental_market_annual': {
+        'id_columns': ['date', 'property_type', 'metric_type', 'bedroom_type'],
+        'date_column': 'date',
+        'frequency': 'year',
+        'required_columns': ['date', 'property_type', 'metric_type', 'bedroom_type', 'value'],
+        'ranges': {'value': (0, None)},
+        'files': ['cmhc_rental_*.csv']
+    },
+    'rental_listings_snapshot': {
+        'id_columns': ['listing_id', 'extraction_week'],
+        'date_column': 'extraction_week',
+        'frequency': None,  # One weekly snapshot per file
+        'required_columns': ['listing_id', 'property_type', 'rent', 'extraction_week'],
+        'ranges': {'rent': (100, 20000), 'bedrooms': (0, 10), 'bathrooms': (0, 10), 'sq_feet': (0, 20000)},
+        'files': ['rentfaster_listings_*.csv']
+    },
+    'community_boundaries': {
+        'id_columns': ['community_code'],
+        'date_column': None,
+        'frequency': None,
+        'required_columns': ['community_code', 'name', 'multipolygon'],
+        'ranges': {'res_units': (0, None)},
+        'files': ['calgary_portal_community_boundaries_*.csv', 'community_boundaries_*.csv']
+    },
+    'community_districts': {
+        'id_columns': ['code'],
+        'date_column': None,
+        'frequency': None,
+        'required_columns': ['code', 'name', 'multipolygon'],
+        'ranges': {},
+        'files': ['calgary_portal_community_districts_*.csv', 'community_districts_*.csv']
+    },
+    'community_sectors': {
+        'id_columns': ['code'],
+        'date_column': None,
+        'frequency': None,
+        'required_columns': ['code', 'multipolygon'],
+        'ranges': {},
+        'files': ['calgary_portal_community_sectors_*.csv', 'community_sectors_*.csv']
+    },
+}
+
+# pandas period codes for each frequency
+PERIOD_FREQUENCIES = {'day': 'D', 'week': 'W', 'month': 'M', 'year': 'Y'}
+
+# Missing periods listed in a report; the count covers the rest
+MAX_LISTED_GAPS = 12
+
+
+def table_for(filename: str) -> Optional[str]:
+    """Table whose extractor writes files named like this."""
+    for table, schema in TABLE_SCHEMAS.items():
+        if any(fnmatch.fnmatch(filename, pattern) for pattern in schema['files']):
+            return table
+    return None
+
+
+def _plain(value: Any) -> Any:
+    """numpy / pandas scalars as JSON-serializable Python values."""
+    if value is None:
+        return None
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and value != value:  # NaN
+        return None
+    if not isinstance(value, (int, float, str, bool)):
+        return str(value)
+    return value
+
+
+def sample_records(df: 'pd.DataFrame', columns: Optional[List[str]] = None,
+                   count: int = 5) -> List[Dict[str, Any]]:
+    """The first rows of a frame (optionally only some columns) as JSON-ready dicts."""
+    if columns is not None:
+        df = df[[column for column in columns if column in df.columns]]
+    sample = df.head(count).astype(object)
+    return sample.where(sample.notna(), None).to_dict('records')
+
+
+def period_gaps(values: 'pd.Series', frequency: str) -> Dict[str, Any]:
+    """Periods between the first and last value of a period column that have no rows.
+
+    Only the distinct values are parsed, so a daily 311 extract of millions of rows
+    parses a few hundred dates.
+    """
+    import pandas as pd
+
+    distinct = pd.Series(values.dropna().unique()).astype(str)
+    parsed = pd.to_datetime(distinct, errors='coerce')
+    periods = pd.PeriodIndex(parsed.dropna(), freq=PERIOD_FREQUENCIES[frequency]).unique()
+    if periods.empty:
+        return {'expected': 0, 'present': 0, 'missing': 0, 'missing_periods': [],
+                'unparsed': int(parsed.isna().sum())}
+
+    expected = pd.period_range(periods.min(), periods.max(), freq=periods.freq)
+    missing = expected.difference(periods)
+    return {
+        'expected': len(expected),
+        'present': len(periods),
+        'missing': len(missing),
+        'missing_periods': [str(p) for p in missing[:MAX_LISTED_GAPS]],
+        'unparsed': int(parsed.isna().sum())
+    }
+
+
+def build_report(df: 'pd.DataFrame', table: str,
+                 extraction_confidence: Optional[float] = None) -> Dict[str, Any]:
+    """Quality metrics for an extracted frame against its table's declared schema.
+
+    Returns records_extracted, date_range, confidence_score (0-1) and a 'quality' block.
+    extraction_confidence (0-1), e.g. how sure the parser was of a PDF table, scales the
+    confidence score.
+    """
+    import pandas as pd
+
+    schema = TABLE_SCHEMAS[table]
+    columns = {str(column).lower(): column for column in df.columns}
+    rows = len(df)
+
+    def present(names: List[str]) -> List[str]:
+        return [columns[name] for name in names if name in columns]
+
+    missing_columns = [name for name in schema['required_columns'] if name not in columns]
+    issues = [f"missing required column {name}" for name in missing_columns]
+    confidence = 0.5 ** len(missing_columns)
+
+    # Column profile: null counts and distinct counts for every column, min/max for numbers
+    nulls = df.isna().sum()
+    distinct = df.nunique(dropna=True)
+    numeric = df.select_dtypes('number')
+    extremes = numeric.agg(['min', 'max']) if not numeric.empty and rows else None
+    profile = {}
+    for column in df.columns:
+        entry = {'null_rate': round(nulls[column] / rows, 4) if rows else 0.0,
+                 'distinct': int(distinct[column])}
+        if extremes is not None and column in extremes.columns:
+            entry['min'] = _plain(extremes.at['min', column])
+            entry['max'] = _plain(extremes.at['max', column])
+        profile[str(column)] = entry
+
+    required = present(schema['required_columns'])
+    if required and rows:
+        required_null_share = float(nulls[required].sum()) / (rows * len(required))
+        confidence *= 1 - required_null_share
+        for column in required:
+            if nulls[column]:
+                issues.append(f"{nulls[column]:,} empty {column} values")
+
+    # Values outside the declared ranges (non-numeric text counts as out of range)
+    out_of_range = {}
+    for name, (low, high) in schema['ranges'].items():
+        if name not in columns or not rows:
+            continue
+        original = df[columns[name]]
+        values = pd.to_numeric(original, errors='coerce')
+        bad = values.isna() & original.notna()
+        if low is not None:
+            bad |= values < low
+        if high is not None:
+            bad |= values > high
+        count = int(bad.sum())
+        if count:
+            out_of_range[name] = count
+            bounds = f"{low} to {high}" if low is not None and high is not None else \
+                f"at least {low}" if low is not None else f"at most {high}"
+            issues.append(f"{count:,} {name} values not {bounds}")
+    checked = sum(1 for name in schema['ranges'] if name in columns)
+    if checked and rows:
+        confidence *= 1 - sum(out_of_range.values()) / (rows * checked)
+
+    # Rows repeating a natural key the database stores once (only with the whole key present)
+    key = present(schema['id_columns'])
+    complete_key = len(key) == len(schema['id_columns'])
+    duplicates = int(df.duplicated(subset=key).sum()) if complete_key and rows else 0
+    if duplicates:
+        issues.append(f"{duplicates:,} rows duplicate the natural key ({', '.join(schema['id_columns'])})")
+        confidence *= 1 - duplicates / rows
+
+    # Period coverage
+    date_range = 'No data'
+    gaps = None
+    date_column = columns.get(schema['date_column']) if schema['date_column'] else None
+    if date_column is not None and rows:
+        dates = df[date_column].dropna().astype(str)
+        if len(dates):
+            date_range = f"{dates.min()} to {dates.max()}"
+        if schema['frequency']:
+            gaps = period_gaps(df[date_column], schema['frequency'])
+            if gaps['missing']:
+                issues.append(f"{gaps['missing']} of {gaps['expected']} {schema['frequency']}s have no rows")
+                confidence *= gaps['present'] / gaps['expected']
+            if gaps['unparsed']:
+                issues.append(f"{gaps['unparsed']} unparseable {schema['date_column']} values")
+
+    if not rows:
+        issues.append("no rows")
+        confidence = 0.0
+    if extraction_confidence is not None:
+        confidence *= extraction_confidence
+
+    return {
+        'table': table,
+        'records_extracted': rows,
+        'date_range': date_range,
+        'confidence_score': round(confidence, 4),
+        'quality': {
+            'natural_key': schema['id_columns'],
+            'duplicate_keys': duplicates if complete_key else None,
+            'missing_columns': missing_columns,
+            'out_of_range': out_of_range,
+            'period_gaps': gaps,
+            'issues': issues,
+            'columns': profile
+        }
+    }
+
+
+def main():
+    """Print the quality metrics for extracted CSVs."""
+    parser = argparse.ArgumentParser(description='Data-quality report for extracted CSVs')
+    parser.add_argument('csv_files', nargs='+', type=Path, help='CSV files to check')
+    parser.add_argument('--table', choices=sorted(TABLE_SCHEMAS), help='Table schema (default: from the file name)')
+    parser.add_argument('--json', action='store_true', help='Print the full report as JSON')
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    for csv_file in args.csv_files:
+        table = args.table or table_for(csv_file.name)
+        if not table:
+            print(f"❌ {csv_file.name}: no declared schema matches - pass --table")
+            continue
+
+        report = build_report(pd.read_csv(csv_file), table)
+        if args.json:
+            print(json.dumps(report, indent=2))
+            continue
+
+        icon = "✅" if not report['quality']['issues'] else "⚠️ "
+        print(f"\n{icon} {csv_file.name} -> {table}")
+        print("=" * 50)
+        print(f"  Records: {report['records_extracted']:,}   Dates: {report['date_range']}")
+        print(f"  Confidence: {report['confidence_score']:.2%}")
+        for issue in report['quality']['issues']:
+            print(f"  - {issue}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,12 @@ import sys
 sys.path.append(str(Path(__file__).resolve().parents[3]))
 from config.config_manager import ConfigManager
 
+# Per-stage cost metrics live with the pipeline in data-engine/
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from pipeline.instrumentation import StageMetrics, EXCEL_PARSE, TRANSFORM, SAVE
+from pipeline.tracing import span
+from pipeline.validation_report import build_report, sample_records
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -52,6 +58,8 @@ class CalgaryCrimeExtractorSimplified:
                         'Possible Gun Shots', 'Prostitution', 'Speeder', 
                         'Suspicious Person', 'Suspicious Vehicle', 'Unwanted Guest']
         }
+        
+        self.metrics = StageMetrics('crime')
     
     def find_crime_files(self) -> List[Path]:
         """Find all Calgary Police Service crime statistics files."""
@@ -100,36 +108,47 @@ class CalgaryCrimeExtractorSimplified:
         name = re.sub(r'\s+', '_', name)     # Replace spaces with underscores
         return name
     
+    def _read_sheet(self, file_path: Path, sheet_name: str) -> pd.DataFrame:
+        """Read one sheet of a crime workbook, recording the parse cost."""
+        with self.metrics.stage(EXCEL_PARSE, file_path.name) as stage:
+            df = pd.read_excel(file_path, sheet_name=sheet_name)
+            stage['bytes_read'] = self.metrics.file_bytes(file_path)
+            stage['rows'] = len(df)
+        return df
+    
     def extract_crime_overview(self, file_path: Path) -> List[Dict[str, Any]]:
         """Extract data from Crime Overview sheet."""
         logger.info("Extracting Crime Overview data...")
         
         try:
-            df = pd.read_excel(file_path, sheet_name='Crime Overview')
-            records = []
+            df = self._read_sheet(file_path, 'Crime Overview')
+            
+            with self.metrics.stage(TRANSFORM, file_path.name) as stage:
+                records = []
             
-            # Filter out non-data rows
-            df = df[df['Crime Type'].notna()]
-            df = df[~df['Crime Type'].str.contains('Applied filters|Total', case=False, na=False)]
+                # Filter out non-data rows
+                df = df[df['Crime Type'].notna()]
+                df = df[~df['Crime Type'].str.contains('Applied filters|Total', case=False, na=False)]
             
-            for _, row in df.iterrows():
-                # Skip if no year data
-                if pd.isna(row['Date - Year']):
-                    continue
+                for _, row in df.iterrows():
+                    # Skip if no year data
+                    if pd.isna(row['Date - Year']):
+                        continue
                 
-                # Create record
-                record = {
-                    'date': f"{int(row['Date - Year'])}-{self.month_map.get(row['Date - Month'], '01')}-01",
-                    'year': int(row['Date - Year']),
-                    'community': row['Community'] if pd.notna(row['Community']) else None,
-                    'ward': row['Ward'] if pd.notna(row['Ward']) else None,
-                    'police_district': row['Police District'] if pd.notna(row['Police District']) else None,
-                    'crime_category': self.standardize_name(row['Crime Type'].replace(' Crime', '')),
-                    'crime_type': self.standardize_name(row['Category']),
-                    'incident_count': self.parse_count_value(row['Total Crime'])
-                }
+                    # Create record
+                    record = {
+                        'date': f"{int(row['Date - Year'])}-{self.month_map.get(row['Date - Month'], '01')}-01",
+                        'year': int(row['Date - Year']),
+                        'community': row['Community'] if pd.notna(row['Community']) else None,
+                        'ward': row['Ward'] if pd.notna(row['Ward']) else None,
+                        'police_district': row['Police District'] if pd.notna(row['Police District']) else None,
+                        'crime_category': self.standardize_name(row['Crime Type'].replace(' Crime', '')),
+                        'crime_type': self.standardize_name(row['Category']),
+                        'incident_count': self.parse_count_value(row['Total Crime'])
+                    }
                 
-                records.append(record)
+                    records.append(record)
+                stage['rows'] = len(records)
             
             logger.info(f"Extracted {len(records)} records from Crime Overview")
             return records
@@ -143,27 +162,30 @@ class CalgaryCrimeExtractorSimplified:
         logger.info("Extracting Domestics data...")
         
         try:
-            df = pd.read_excel(file_path, sheet_name='Domestics')
-            records = []
+            df = self._read_sheet(file_path, 'Domestics')
+            
+            with self.metrics.stage(TRANSFORM, file_path.name) as stage:
+                records = []
             
-            for _, row in df.iterrows():
-                # Skip if no year data
-                if pd.isna(row['Start_Datestamp - Year']):
-                    continue
+                for _, row in df.iterrows():
+                    # Skip if no year data
+                    if pd.isna(row['Start_Datestamp - Year']):
+                        continue
                 
-                # Create record (note: no community data for privacy)
-                record = {
-                    'date': f"{int(row['Start_Datestamp - Year'])}-{self.month_map.get(row['Start_Datestamp - Month'], '01')}-01",
-                    'year': int(row['Start_Datestamp - Year']),
-                    'community': None,  # Not provided for privacy
-                    'ward': row['Ward'] if pd.notna(row['Ward']) else None,
-                    'police_district': row['Police District'] if pd.notna(row['Police District']) else None,
-                    'crime_category': 'domestic',
-                    'crime_type': 'domestic_assault',
-                    'incident_count': self.parse_count_value(row['Total Domestic'])
-                }
+                    # Create record (note: no community data for privacy)
+                    record = {
+                        'date': f"{int(row['Start_Datestamp - Year'])}-{self.month_map.get(row['Start_Datestamp - Month'], '01')}-01",
+                        'year': int(row['Start_Datestamp - Year']),
+                        'community': None,  # Not provided for privacy
+                        'ward': row['Ward'] if pd.notna(row['Ward']) else None,
+                        'police_district': row['Police District'] if pd.notna(row['Police District']) else None,
+                        'crime_category': 'domestic',
+                        'crime_type': 'domestic_assault',
+                        'incident_count': self.parse_count_value(row['Total Domestic'])
+                    }
                 
-                records.append(record)
+                    records.append(record)
+                stage['rows'] = len(records)
             
             logger.info(f"Extracted {len(records)} records from Domestics")
             return records
@@ -177,37 +199,40 @@ class CalgaryCrimeExtractorSimplified:
         logger.info("Extracting Disorder data...")
         
         try:
-            df = pd.read_excel(file_path, sheet_name='Disorder')
-            records = []
-            
-            # Filter out non-data rows
-            df = df[df['Disorder Type'].notna()]
-            df = df[~df['Disorder Type'].str.contains('Total', case=False, na=False)]
-            
-            # Apply year filter early if specified
-            if year_filter:
-                df = df[df['Call_Received_Timestamp - Year'].isin(year_filter)]
-                logger.info(f"Filtered to {len(df)} rows for years {year_filter}")
-            
-            # Process rows
-            for _, row in df.iterrows():
-                # Skip if no year data
-                if pd.isna(row['Call_Received_Timestamp - Year']):
-                    continue
+            df = self._read_sheet(file_path, 'Disorder')
+            
+            with self.metrics.stage(TRANSFORM, file_path.name) as stage:
+                records = []
+            
+                # Filter out non-data rows
+                df = df[df['Disorder Type'].notna()]
+                df = df[~df['Disorder Type'].str.contains('Total', case=False, na=False)]
+            
+                # Apply year filter early if specified
+                if year_filter:
+                    df = df[df['Call_Received_Timestamp - Year'].isin(year_filter)]
+                    logger.info(f"Filtered to {len(df)} rows for years {year_filter}")
+            
+                # Process rows
+                for _, row in df.iterrows():
+                    # Skip if no year data
+                    if pd.isna(row['Call_Received_Timestamp - Year']):
+                        continue
                 
-                # Create record
-                record = {
-                    'date': f"{int(row['Call_Received_Timestamp - Year'])}-{self.month_map.get(row['Call_Received_Timestamp - Month'], '01')}-01",
-                    'year': int(row['Call_Received_Timestamp - Year']),
-                    'community': row['Community'] if pd.notna(row['Community']) else None,
-                    'ward': row['Ward'] if pd.notna(row['Ward']) else None,
-                    'police_district': row['District'] if pd.notna(row['District']) else None,
-                    'crime_category': 'disorder',
-                    'crime_type': self.standardize_name(row['Disorder Type']),
-                    'incident_count': self.parse_count_value(row['Total Disorder'])
-                }
+                    # Create record
+                    record = {
+                        'date': f"{int(row['Call_Received_Timestamp - Year'])}-{self.month_map.get(row['Call_Received_Timestamp - Month'], '01')}-01",
+                        'year': int(row['Call_Received_Timestamp - Year']),
+                        'community': row['Community'] if pd.notna(row['Community']) else None,
+                        'ward': row['Ward'] if pd.notna(row['Ward']) else None,
+                        'police_district': row['District'] if pd.notna(row['District']) else None,
+                        'crime_category': 'disorder',
+                        'crime_type': self.standardize_name(row['Disorder Type']),
+                        'incident_count': self.parse_count_value(row['Total Disorder'])
+                    }
                 
-                records.append(record)
+                    records.append(record)
+                stage['rows'] = len(records)
             
             logger.info(f"Extracted {len(records)} records from Disorder")
             return records
@@ -237,9 +262,13 @@ class CalgaryCrimeExtractorSimplified:
             logger.info(f"Processing {file_path.name}...")
             
             # Extract from all three sheets
-            crime_records = self.extract_crime_overview(file_path)
-            domestic_records = self.extract_domestics(file_path)
-            disorder_records = self.extract_disorder(file_path, year_filter)
+            with span(file_path.name, 'file'):
+                with span('Crime Overview', 'sheet'):
+                    crime_records = self.extract_crime_overview(file_path)
+                with span('Domestics', 'sheet'):
+                    domestic_records = self.extract_domestics(file_path)
+                with span('Disorder', 'sheet'):
+                    disorder_records = self.extract_disorder(file_path, year_filter)
             
             # Combine all records
             all_records.extend(crime_records)
@@ -258,6 +287,7 @@ class CalgaryCrimeExtractorSimplified:
         
         # Generate summary statistics
         summary = self.generate_summary(all_records)
+        self.metrics.write_log(self.config.get_database_path())
         
         logger.info(f"🚔 Crime extraction complete:")
         logger.info(f"  Total records extracted: {len(all_records)}")
@@ -340,11 +370,13 @@ class CalgaryCrimeExtractorSimplified:
             self.validation_pending_path.mkdir(parents=True, exist_ok=True)
             
             # Save to CSV
-            df.to_csv(csv_path, index=False)
+            with self.metrics.stage(SAVE, csv_path.name) as stage:
+                df.to_csv(csv_path, index=False)
+                stage['rows'] = len(df)
             logger.info(f"✅ Saved {len(records)} crime records to {csv_path}")
             
             # Create validation report
-            self._create_validation_report(records, csv_path)
+            self._create_validation_report(df, csv_path)
             
             return csv_path
             
@@ -352,49 +384,37 @@ class CalgaryCrimeExtractorSimplified:
             logger.error(f"❌ Failed to save crime data: {e}")
             return None
     
-    def _create_validation_report(self, records: List[Dict], csv_path: Path) -> None:
+    def _create_validation_report(self, df: pd.DataFrame, csv_path: Path) -> None:
         """Create JSON validation report for the extracted data."""
         try:
-            summary = self.generate_summary(records)
+            category_counts = df['crime_category'].value_counts()
+            categories = df.groupby('crime_category').agg(
+                count=('crime_type', 'size'),
+                total_incidents=('incident_count', 'sum'),
+                crime_types=('crime_type', 'nunique')
+            )
             
             validation_report = {
                 'source': 'calgary_police_crime_statistics',
                 'extraction_date': datetime.now().isoformat(),
-                'records_extracted': len(records),
-                'date_range': summary['date_range'],
-                'years_covered': summary['years'],
+                **build_report(df, 'crime_statistics_monthly'),
+                'years_covered': sorted(int(year) for year in df['year'].unique()),
                 'breakdown_by_category': {
-                    'property': len([r for r in records if r['crime_category'] == 'property']),
-                    'violent': len([r for r in records if r['crime_category'] == 'violent']),
-                    'domestic': len([r for r in records if r['crime_category'] == 'domestic']),
-                    'disorder': len([r for r in records if r['crime_category'] == 'disorder'])
+                    category: int(category_counts.get(category, 0))
+                    for category in ['property', 'violent', 'domestic', 'disorder']
+                },
+                'categories': {
+                    category: {key: int(value) for key, value in row.items()}
+                    for category, row in categories.to_dict('index').items()
                 },
-                'categories': summary['categories'],
-                'communities': summary['total_communities'],
-                'sample_records': []
+                'communities': int(df['community'].nunique()),
+                'performance': self.metrics.summary()
             }
             
-            # Sample records from each category and source
-            samples_added = set()
-            for cat in ['violent', 'property', 'domestic', 'disorder']:
-                cat_records = [r for r in records if r['crime_category'] == cat]
-                if cat_records:
-                    # Get one from each year if possible
-                    for year in [2025, 2024, 2023]:
-                        year_records = [r for r in cat_records if r['year'] == year]
-                        if year_records:
-                            sample = year_records[0]
-                            key = f"{cat}_{year}"
-                            if key not in samples_added:
-                                validation_report['sample_records'].append({
-                                    'date': sample['date'],
-                                    'community': sample['community'],
-                                    'crime_category': sample['crime_category'],
-                                    'crime_type': sample['crime_type'],
-                                    'incident_count': sample['incident_count']
-                                })
-                                samples_added.add(key)
-                                break
+            # One sample per category, from the latest year that category has
+            sample_columns = ['date', 'community', 'crime_category', 'crime_type', 'incident_count']
+            samples = df.sort_values('year', ascending=False, kind='stable').drop_duplicates('crime_category')
+            validation_report['sample_records'] = sample_records(samples, sample_columns, len(samples))
             
             # Save validation report
             report_path = csv_path.with_suffix('.json')
@@ -4,7 +4,6 @@ RentFaster Weekly Aggregation Script
 Aggregates rental listings snapshots into weekly summaries for trend analysis
 """
 
-import sqlite3
 import pandas as pd
 from pathlib import Path
 import logging
@@ -15,6 +14,9 @@ import json
 # Add project root for config
 sys.path.append(str(Path(__file__).resolve().parents[3]))
 from config.config_manager import get_config
+sys.path.append(str(Path(__file__).resolve().parents[3] / 'data-lake'))
+from database import connect
+from maintenance import post_load_maintenance
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -25,7 +27,7 @@ class RentfasterAggregator:
     def __init__(self):
         self.config = get_config()
         self.db_path = self.config.get_database_path()
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = connect(self.db_path)
         
     def get_unprocessed_weeks(self):
         """Find weeks in rental_listings_snapshot that aren't in summary table."""
@@ -187,6 +189,8 @@ class RentfasterAggregator:
                 if week == unprocessed_weeks[-1]:
                     self.generate_market_insights(week)
         
+        # Keep planner statistics current as the summary table grows
+        post_load_maintenance(self.conn, ['rental_market_summary_weekly'])
         logger.info("✅ Weekly aggregation complete")
         
         # Close connection
@@ -14,6 +14,8 @@ import time
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from pipeline.instrumentation import StageMetrics, HTTP_FETCH, TRANSFORM, SAVE
+from pipeline.validation_report import build_report
 
 # Define validation directory directly
 VALIDATION_PENDING_DIR = "/home/chris/calgary-analytica/data-engine/validation/pending"
@@ -32,6 +34,7 @@ class RentfasterExtractor:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        self.metrics = StageMetrics('rentfaster')
         
     def fetch_listings(self, page=1):
         """Fetch listings from Rentfaster API"""
@@ -42,9 +45,13 @@ class RentfasterExtractor:
         }
         
         try:
-            response = self.session.get(self.base_url, params=params)
-            response.raise_for_status()
-            return response.json()
+            with self.metrics.stage(HTTP_FETCH, f"search page {page}") as stage:
+                response = self.session.get(self.base_url, params=params)
+                response.raise_for_status()
+                data = response.json()
+                stage['bytes_read'] = len(response.content)
+                stage['rows'] = len(data.get('listings', []))
+            return data
         except Exception as e:
             print(f"Error fetching page {page}: {e}")
             return None
@@ -137,11 +144,13 @@ class RentfasterExtractor:
                 print("No more listings found")
                 break
             
-            for listing in listings:
-                parsed = self.parse_listing(listing)
-                if parsed:
-                    self.data.append(parsed)
-                    total_listings += 1
+            with self.metrics.stage(TRANSFORM, f"search page {page}") as stage:
+                for listing in listings:
+                    parsed = self.parse_listing(listing)
+                    if parsed:
+                        self.data.append(parsed)
+                        total_listings += 1
+                        stage['rows'] += 1
             
             print(f"Processed {len(listings)} listings (Total: {total_listings})")
             
@@ -181,7 +190,9 @@ class RentfasterExtractor:
         
         # Save detailed listings
         csv_path = os.path.join(config.VALIDATION_PENDING_DIR, f"{output_filename}.csv")
-        df.to_csv(csv_path, index=False)
+        with self.metrics.stage(SAVE, f"{output_filename}.csv") as stage:
+            df.to_csv(csv_path, index=False)
+            stage['rows'] = len(df)
         print(f"\nSaved listings: {csv_path}")
         
         # Create summary report
@@ -191,6 +202,7 @@ class RentfasterExtractor:
             "extraction_week": datetime.now().strftime('%Y-W%U'),
             "total_listings": len(df),
             "active_listings": len(df),
+            **build_report(df, 'rental_listings_snapshot'),
             "property_types": df['property_type'].value_counts().to_dict(),
             "rent_summary": {
                 "mean": float(df['rent'].mean()),
@@ -200,7 +212,8 @@ class RentfasterExtractor:
             },
             "bedrooms_distribution": df['bedrooms'].value_counts().to_dict(),
             "communities": df['community'].value_counts().head(20).to_dict(),
-            "output_file": f"{output_filename}.csv"
+            "output_file": f"{output_filename}.csv",
+            "performance": self.metrics.summary()
         }
         
         # Save JSON report
@@ -231,6 +244,11 @@ def main():
         max_pages = int(sys.argv[1])
     
     extractor.extract(max_pages=max_pages)
+    
+    # Log stage costs alongside the other extractors
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+    from config.config_manager import get_config
+    extractor.metrics.write_log(get_config().get_database_path())
 
 
 if __name__ == "__main__":
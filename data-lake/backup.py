@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Online Database Backup
+Copies calgary_data.db with the SQLite backup API a few pages at a time, so loads, exports
+and the read API carry on while it runs. A backup is skipped when the database has not
+changed since the last one, and older backups are kept as numbered generations.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any
+import logging
+
+from database import connect
+
+logger = logging.getLogger(__name__)
+
+# Pages copied per step; the source is only locked for the length of one step
+DEFAULT_STEP_PAGES = 1024
+
+# Pause between steps so writers waiting on the source get a turn
+STEP_SLEEP_SECONDS = 0.005
+
+# Backups kept: the newest at the configured backup path, older ones as .1, .2, ...
+DEFAULT_GENERATIONS = 7
+
+MANIFEST_NAME = 'backup_manifest.json'
+
+
+def file_signature(db_path: Path) -> Dict[str, Any]:
+    """Size and mtime of the database and its WAL.
+
+    Every commit writes to one of the two files, so an unchanged signature means an
+    unchanged database. (PRAGMA data_version only tracks changes seen by one open
+    connection, so it can't be compared between runs.)
+    """
+    signature = {}
+    for suffix in ['', '-wal']:
+        path = Path(f"{db_path}{suffix}")
+        if path.exists():
+            stat = path.stat()
+            signature[path.name] = [stat.st_size, stat.st_mtime_ns]
+    return signature
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file, read in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def generation_path(backup_path: Path, generation: int) -> Path:
+    """Path of a backup generation (0 is the newest, at backup_path itself)."""
+    if generation == 0:
+        return backup_path
+    return backup_path.with_name(f"{backup_path.stem}.{generation}{backup_path.suffix}")
+
+
+class DatabaseBackup:
+    """Page-stepped online backups of one database with rotated generations."""
+
+    def __init__(self, db_path: Path, backup_path: Path, generations: int = DEFAULT_GENERATIONS,
+                 step_pages: int = DEFAULT_STEP_PAGES):
+        self.db_path = Path(db_path)
+        self.backup_path = Path(backup_path)
+        self.generations = max(1, generations)
+        self.step_pages = step_pages
+        self.manifest_path = self.backup_path.parent / MANIFEST_NAME
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Load the record of previous backups."""
+        if not self.manifest_path.exists():
+            return {'generations': []}
+        try:
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+            manifest.setdefault('generations', [])
+            return manifest
+        except (json.JSONDecodeError, OSError):
+            # Without a manifest the next backup just can't be skipped
+            return {'generations': []}
+
+    def _save_manifest(self) -> None:
+        """Persist the manifest."""
+        with open(self.manifest_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+
+    def _copy(self, target: Path) -> int:
+        """Back up the database into target a step at a time. Returns the page count."""
+        progress_state = {'logged': -1}
+
+        def progress(status: int, remaining: int, total: int) -> None:
+            # Log every tenth of the way
+            done = (total - remaining) * 10 // total if total else 10
+            if done > progress_state['logged']:
+                progress_state['logged'] = done
+                logger.info(f"   {done * 10:3d}% ({total - remaining:,}/{total:,} pages)")
+
+        source = connect(self.db_path, read_only=True)
+        destination = sqlite3.connect(target)
+        try:
+            source.backup(destination, pages=self.step_pages, progress=progress, sleep=STEP_SLEEP_SECONDS)
+            # The copy inherits the source's WAL flag; make it a standalone file
+            destination.execute("PRAGMA journal_mode = DELETE")
+            check = destination.execute("PRAGMA quick_check").fetchone()[0]
+            if check != 'ok':
+                raise sqlite3.DatabaseError(f"Backup failed quick_check: {check}")
+            return destination.execute("PRAGMA page_count").fetchone()[0]
+        finally:
+            destination.close()
+            source.close()
+
+    def _rotate(self) -> None:
+        """Shift each generation up by one, dropping the oldest."""
+        oldest = generation_path(self.backup_path, self.generations - 1)
+        if oldest.exists():
+            oldest.unlink()
+        for generation in range(self.generations - 2, -1, -1):
+            path = generation_path(self.backup_path, generation)
+            if path.exists():
+                path.replace(generation_path(self.backup_path, generation + 1))
+
+    def run(self, force: bool = False) -> Dict[str, Any]:
+        """Back up the database unless it is unchanged since the last backup."""
+        if not self.db_path.exists():
+            raise FileNotFoundError(f"Database not found: {self.db_path}")
+
+        signature = file_signature(self.db_path)
+        latest = self.manifest['generations'][0] if self.manifest['generations'] else None
+        if not force and latest and self.backup_path.exists() and latest.get('signature') == signature:
+            return {'status': 'unchanged', 'backup': str(self.backup_path), 'sha256': latest['sha256']}
+
+        self.backup_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.backup_path.with_name(f".{self.backup_path.name}.tmp")
+        if temp_path.exists():
+            temp_path.unlink()
+
+        started = time.perf_counter()
+        try:
+            pages = self._copy(temp_path)
+        except Exception:
+            if temp_path.exists():
+                temp_path.unlink()
+            raise
+        sha256 = file_sha256(temp_path)
+        seconds = round(time.perf_counter() - started, 2)
+
+        # Touched but not changed (e.g. a checkpoint): keep the existing backup
+        if not force and latest and self.backup_path.exists() and latest.get('sha256') == sha256:
+            temp_path.unlink()
+            latest['signature'] = signature
+            self._save_manifest()
+            return {'status': 'unchanged', 'backup': str(self.backup_path), 'sha256': sha256}
+
+        self._rotate()
+        temp_path.replace(self.backup_path)
+
+        entry = {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'sha256': sha256,
+            'pages': pages,
+            'bytes': self.backup_path.stat().st_size,
+            'seconds': seconds,
+            'signature': signature
+        }
+        self.manifest['source'] = str(self.db_path)
+        self.manifest['generations'] = [entry] + self.manifest['generations'][:self.generations - 1]
+        self._save_manifest()
+        return {'status': 'backed_up', 'backup': str(self.backup_path), **entry}
+
+    def list_generations(self) -> List[Dict[str, Any]]:
+        """Recorded generations, newest first, with whether each file is still present."""
+        return [{**entry, 'path': str(generation_path(self.backup_path, generation)),
+                 'exists': generation_path(self.backup_path, generation).exists()}
+                for generation, entry in enumerate(self.manifest['generations'])]
+
+
+def main():
+    """Back up the configured database."""
+    import argparse
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from config.config_manager import get_config
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Online backup of the Calgary data database')
+    parser.add_argument('--db', type=str, help='Database path (default: configured primary database)')
+    parser.add_argument('--dest', type=str, help='Backup path (default: configured backup database)')
+    parser.add_argument('--generations', type=int, default=DEFAULT_GENERATIONS,
+                        help=f'Backups to keep (default: {DEFAULT_GENERATIONS})')
+    parser.add_argument('--pages', type=int, default=DEFAULT_STEP_PAGES,
+                        help=f'Pages copied per step (default: {DEFAULT_STEP_PAGES})')
+    parser.add_argument('--force', action='store_true', help='Back up even if the database is unchanged')
+    parser.add_argument('--list', action='store_true', help='List backup generations and exit')
+
+    args = parser.parse_args()
+
+    config = get_config()
+    db_path = Path(args.db) if args.db else config.get_database_path()
+    backup_path = Path(args.dest) if args.dest else config.get_backup_database_path()
+    backup = DatabaseBackup(db_path, backup_path, args.generations, args.pages)
+
+    if args.list:
+        print("\n💾 BACKUP GENERATIONS")
+        print("="*50)
+        for entry in backup.list_generations():
+            icon = "✅" if entry['exists'] else "❌"
+            print(f"  {icon} {entry['created']}  {entry['bytes'] / (1024 * 1024):7.1f} MB  "
+                  f"{entry['sha256'][:12]}  {entry['path']}")
+        return
+
+    logger.info(f"💾 Backing up {db_path}")
+    try:
+        result = backup.run(force=args.force)
+    except (FileNotFoundError, sqlite3.Error, OSError) as e:
+        logger.error(f"❌ Backup failed: {e}")
+        sys.exit(1)
+
+    print("\n💾 BACKUP SUMMARY")
+    print("="*50)
+    if result['status'] == 'unchanged':
+        print(f"  ⏭️  Database unchanged since the last backup ({result['sha256'][:12]})")
+    else:
+        print(f"  ✅ {result['pages']:,} pages ({result['bytes'] / (1024 * 1024):.1f} MB) in {result['seconds']}s")
+        print(f"  sha256: {result['sha256'][:12]}")
+    print(f"  Backup: {result['backup']}")
+
+
+if __name__ == "__main__":
+    main()
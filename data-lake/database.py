@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Database Connections
+One place that opens calgary_data.db: every connection gets the same PRAGMAs (WAL, busy
+timeout, memory-mapped I/O, a larger page cache, in-memory temp tables), so a load and
+the dashboard exports can run side by side instead of failing with "database is locked".
+
+Writers are opened read-write and switch the file to WAL; readers are opened through a
+read-only URI and never create an empty database by accident.
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional
+
+# How long a connection waits for another process's lock before raising
+BUSY_TIMEOUT_MS = 30000
+
+# Applied to every connection
+CONNECTION_PRAGMAS = {
+    'busy_timeout': BUSY_TIMEOUT_MS,
+    'mmap_size': 256 * 1024 * 1024,   # Bytes of the file read through the page cache mapping
+    'cache_size': -64 * 1024,         # Negative = KiB, so 64 MiB per connection
+    'temp_store': 'MEMORY'            # Sorts and GROUP BYs for the exports stay off disk
+}
+
+# Writers only: WAL lets readers keep reading while a load commits, and is recorded in
+# the file itself, so readers opened later use it too. NORMAL sync is durable in WAL
+# mode except against power loss, which a re-run of the load covers.
+WRITER_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL'
+}
+
+# Readers held per database by a ConnectionPool
+DEFAULT_POOL_READERS = 4
+
+
+def apply_pragmas(conn: sqlite3.Connection, pragmas: Dict[str, Any]) -> None:
+    """Set each PRAGMA on an open connection."""
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+def connect(db_path: Path, read_only: bool = False, **kwargs) -> sqlite3.Connection:
+    """Open a tuned connection to a database.
+
+    read_only opens `file:...?mode=ro`, which fails if the database does not exist rather
+    than creating it. Other keyword arguments go to sqlite3.connect (e.g. isolation_level,
+    check_same_thread).
+    """
+    db_path = Path(db_path)
+    kwargs.setdefault('timeout', BUSY_TIMEOUT_MS / 1000)
+    if read_only:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, **kwargs)
+    else:
+        conn = sqlite3.connect(db_path, **kwargs)
+
+    try:
+        apply_pragmas(conn, CONNECTION_PRAGMAS)
+        if not read_only:
+            apply_pragmas(conn, WRITER_PRAGMAS)
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn
+
+
+class ConnectionPool:
+    """Shared read-only connections to one database.
+
+    reader() lends a connection and takes it back when the block exits, so threads (e.g.
+    the read API's request threads) reuse a few connections instead of opening one each.
+    Writers open their own connection with connect().
+    """
+
+    def __init__(self, db_path: Path, max_readers: int = DEFAULT_POOL_READERS):
+        self.db_path = Path(db_path)
+        self.max_readers = max_readers
+        self._idle = queue.LifoQueue()
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection for the duration of the block."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = connect(self.db_path, read_only=True, check_same_thread=False)
+
+        try:
+            yield conn
+        finally:
+            # Keep up to max_readers idle; extra connections from a burst are closed
+            if self._idle.qsize() < self.max_readers:
+                self._idle.put(conn)
+            else:
+                conn.close()
+
+    def close(self) -> None:
+        """Close every idle reader."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: Optional[Path] = None) -> ConnectionPool:
+    """The process-wide pool for a database (default: the configured primary database)."""
+    if db_path is None:
+        import sys
+        sys.path.insert(0, str(Path(__file__).parent.parent))
+        from config.config_manager import get_config
+        db_path = get_config().get_database_path()
+
+    key = Path(db_path).resolve()
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(key)
+        return _pools[key]
+
+
+def main():
+    """Show the journal mode and tuning PRAGMAs a database is opened with."""
+    import argparse
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from config.config_manager import get_config
+
+    parser = argparse.ArgumentParser(description='Show connection settings for the database')
+    parser.add_argument('--db', type=str, help='Database path (default: configured primary database)')
+    parser.add_argument('--wal', action='store_true', help='Switch the database to WAL (opens it as a writer)')
+    args = parser.parse_args()
+
+    db_path = Path(args.db) if args.db else get_config().get_database_path()
+    if not db_path.exists():
+        print(f"❌ Database not found: {db_path}")
+        sys.exit(1)
+
+    conn = connect(db_path, read_only=not args.wal)
+    try:
+        print(f"🗄️  {db_path}")
+        print("=" * 50)
+        for name in ['journal_mode', 'synchronous', 'busy_timeout', 'mmap_size', 'cache_size',
+                     'temp_store', 'page_size', 'page_count']:
+            print(f"  {name:<13} {conn.execute(f'PRAGMA {name}').fetchone()[0]}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
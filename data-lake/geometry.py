@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Boundary Geometry Storage
+Packs community, district and sector boundaries into WKB blobs with precomputed bounding
+boxes and centroids (boundary_geometry), plus a fixed-degree grid index (boundary_grid)
+so spatial lookups only decode the few polygons whose cells contain a point.
+"""
+
+import ast
+import json
+import math
+import struct
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Boundary tables and the code column each feature is keyed by
+BOUNDARY_LAYERS = {
+    'community_boundaries': 'community_code',
+    'community_districts': 'code',
+    'community_sectors': 'code',
+}
+
+# Grid cell size in degrees (about 1.1 km north-south and 0.7 km east-west in Calgary)
+GRID_CELL_DEGREES = 0.01
+
+# WKB geometry type codes (little-endian, 2D)
+WKB_POLYGON = 3
+WKB_MULTIPOLYGON = 6
+
+# A polygon is a list of rings; each ring an (n, 2) float64 array of lon/lat
+Polygon = List[np.ndarray]
+
+
+def parse_geojson(value: Any) -> Optional[Dict[str, Any]]:
+    """Read a geometry as stored by the extractors (JSON text, a Python repr, or a dict)."""
+    if value is None or isinstance(value, dict):
+        return value
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        # extractor_batch.py used to write the API dict's repr straight to CSV
+        return ast.literal_eval(text)
+
+
+def geojson_polygons(geometry: Dict[str, Any]) -> List[Polygon]:
+    """Polygons of a GeoJSON Polygon or MultiPolygon as coordinate arrays."""
+    if geometry['type'] == 'Polygon':
+        polygons = [geometry['coordinates']]
+    elif geometry['type'] == 'MultiPolygon':
+        polygons = geometry['coordinates']
+    else:
+        raise ValueError(f"Unsupported geometry type: {geometry['type']}")
+    return [[np.asarray(ring, dtype='<f8')[:, :2] for ring in polygon] for polygon in polygons]
+
+
+def pack_wkb(polygons: List[Polygon]) -> bytes:
+    """Encode polygons as a little-endian WKB MultiPolygon."""
+    parts = [struct.pack('<BII', 1, WKB_MULTIPOLYGON, len(polygons))]
+    for polygon in polygons:
+        parts.append(struct.pack('<BII', 1, WKB_POLYGON, len(polygon)))
+        for ring in polygon:
+            parts.append(struct.pack('<I', len(ring)))
+            parts.append(np.ascontiguousarray(ring, dtype='<f8').tobytes())
+    return b''.join(parts)
+
+
+def unpack_wkb(blob: bytes) -> List[Polygon]:
+    """Decode a WKB MultiPolygon written by pack_wkb."""
+    _, geometry_type, polygon_count = struct.unpack_from('<BII', blob, 0)
+    if geometry_type != WKB_MULTIPOLYGON:
+        raise ValueError(f"Expected a WKB MultiPolygon, got type {geometry_type}")
+
+    offset = 9
+    polygons = []
+    for _ in range(polygon_count):
+        _, _, ring_count = struct.unpack_from('<BII', blob, offset)
+        offset += 9
+        rings = []
+        for _ in range(ring_count):
+            (point_count,) = struct.unpack_from('<I', blob, offset)
+            offset += 4
+            rings.append(np.frombuffer(blob, dtype='<f8', count=point_count * 2, offset=offset).reshape(-1, 2))
+            offset += point_count * 16
+        polygons.append(rings)
+    return polygons
+
+
+def to_geojson(blob: bytes) -> Dict[str, Any]:
+    """GeoJSON MultiPolygon for a stored geometry (for map exports)."""
+    return {
+        'type': 'MultiPolygon',
+        'coordinates': [[ring.tolist() for ring in polygon] for polygon in unpack_wkb(blob)]
+    }
+
+
+def bounds(polygons: List[Polygon]) -> Tuple[float, float, float, float]:
+    """(min_lon, min_lat, max_lon, max_lat) of the outer rings."""
+    points = np.concatenate([polygon[0] for polygon in polygons])
+    min_lon, min_lat = points.min(axis=0)
+    max_lon, max_lat = points.max(axis=0)
+    return float(min_lon), float(min_lat), float(max_lon), float(max_lat)
+
+
+def _ring_area_centroid(ring: np.ndarray) -> Tuple[float, float, float]:
+    """Unsigned area and centroid of a ring (shoelace formula)."""
+    # Work relative to the first vertex to avoid cancellation at lon/lat magnitudes
+    origin = ring[0]
+    x, y = ring[:, 0] - origin[0], ring[:, 1] - origin[1]
+    x_next, y_next = np.roll(x, -1), np.roll(y, -1)
+    cross = x * y_next - x_next * y
+    area = cross.sum() / 2
+    if area == 0:
+        return 0.0, float(ring[:, 0].mean()), float(ring[:, 1].mean())
+    cx = ((x + x_next) * cross).sum() / (6 * area)
+    cy = ((y + y_next) * cross).sum() / (6 * area)
+    return abs(float(area)), float(cx + origin[0]), float(cy + origin[1])
+
+
+def centroid(polygons: List[Polygon]) -> Tuple[float, float]:
+    """Area-weighted centroid, with holes subtracted."""
+    total_area = weighted_x = weighted_y = 0.0
+    for polygon in polygons:
+        for index, ring in enumerate(polygon):
+            area, cx, cy = _ring_area_centroid(ring)
+            sign = 1 if index == 0 else -1
+            total_area += sign * area
+            weighted_x += sign * area * cx
+            weighted_y += sign * area * cy
+    if total_area == 0:
+        points = np.concatenate([polygon[0] for polygon in polygons])
+        return float(points[:, 0].mean()), float(points[:, 1].mean())
+    return weighted_x / total_area, weighted_y / total_area
+
+
+def grid_cell(lon: float, lat: float) -> Tuple[int, int]:
+    """Grid cell containing a point."""
+    return math.floor(lon / GRID_CELL_DEGREES), math.floor(lat / GRID_CELL_DEGREES)
+
+
+def grid_cells(min_lon: float, min_lat: float, max_lon: float, max_lat: float) -> List[Tuple[int, int]]:
+    """Grid cells overlapped by a bounding box."""
+    min_x, min_y = grid_cell(min_lon, min_lat)
+    max_x, max_y = grid_cell(max_lon, max_lat)
+    return [(x, y) for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)]
+
+
+def store_geometries(cursor, layer: str, features: Iterable[Tuple[str, Any]]) -> int:
+    """Pack (code, GeoJSON) features into boundary_geometry and re-index them in boundary_grid.
+
+    Uses the caller's cursor so geometries commit with the boundary rows they belong to.
+    """
+    stored = 0
+    for code, value in features:
+        geometry = parse_geojson(value)
+        if code is None or not geometry:
+            continue
+
+        polygons = geojson_polygons(geometry)
+        min_lon, min_lat, max_lon, max_lat = bounds(polygons)
+        centroid_lon, centroid_lat = centroid(polygons)
+
+        cursor.execute("""
+            INSERT OR REPLACE INTO boundary_geometry
+                (layer, code, geometry, min_lon, min_lat, max_lon, max_lat,
+                 centroid_lon, centroid_lat, vertex_count, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, (layer, str(code), pack_wkb(polygons), min_lon, min_lat, max_lon, max_lat,
+              centroid_lon, centroid_lat, sum(len(ring) for polygon in polygons for ring in polygon)))
+
+        cursor.execute("DELETE FROM boundary_grid WHERE layer = ? AND code = ?", (layer, str(code)))
+        cursor.executemany(
+            "INSERT INTO boundary_grid (layer, cell_x, cell_y, code) VALUES (?, ?, ?, ?)",
+            [(layer, x, y, str(code)) for x, y in grid_cells(min_lon, min_lat, max_lon, max_lat)]
+        )
+        stored += 1
+    return stored
+
+
+def load_geometry(conn: sqlite3.Connection, layer: str, code: str) -> Optional[List[Polygon]]:
+    """Decoded polygons for one feature."""
+    row = conn.execute("SELECT geometry FROM boundary_geometry WHERE layer = ? AND code = ?",
+                       (layer, code)).fetchone()
+    return unpack_wkb(row[0]) if row else None
+
+
+def candidates(conn: sqlite3.Connection, layer: str, lon: float, lat: float) -> List[str]:
+    """Codes whose bounding box contains a point, found through the grid index."""
+    cell_x, cell_y = grid_cell(lon, lat)
+    cursor = conn.execute("""
+        SELECT g.code
+        FROM boundary_grid i
+        JOIN boundary_geometry g ON g.layer = i.layer AND g.code = i.code
+        WHERE i.layer = ? AND i.cell_x = ? AND i.cell_y = ?
+          AND ? BETWEEN g.min_lon AND g.max_lon
+          AND ? BETWEEN g.min_lat AND g.max_lat
+    """, (layer, cell_x, cell_y, lon, lat))
+    return [row[0] for row in cursor.fetchall()]
+
+
+# Upper bound on the edge x point matrix evaluated in one ray-casting step
+RAY_CAST_BATCH = 2_000_000
+
+# Placeholder community written by the 311 extractor when the API has none
+UNKNOWN_COMMUNITY = 'UNKNOWN'
+
+
+def ring_edges(polygons: List[Polygon]) -> np.ndarray:
+    """All ring edges of a geometry as an (n, 4) array of x1, y1, x2, y2."""
+    return np.concatenate([np.hstack([ring, np.roll(ring, -1, axis=0)])
+                           for polygon in polygons for ring in polygon])
+
+
+def points_in_edges(edges: np.ndarray, lons: np.ndarray, lats: np.ndarray) -> np.ndarray:
+    """Even-odd ray cast of many points against one geometry's edges (holes included)."""
+    x1, y1, x2, y2 = (edges[:, i:i + 1] for i in range(4))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (x2 - x1) / (y2 - y1)  # Horizontal edges never cross, so inf/nan is masked
+
+    inside = np.zeros(len(lons), dtype=bool)
+    step = max(1, RAY_CAST_BATCH // len(edges))
+    for start in range(0, len(lons), step):
+        px, py = lons[start:start + step], lats[start:start + step]
+        crosses = (y1 > py) != (y2 > py)
+        with np.errstate(invalid='ignore'):
+            left_of_edge = px < x1 + (py - y1) * slope
+        inside[start:start + step] = np.count_nonzero(crosses & left_of_edge, axis=0) % 2 == 1
+    return inside
+
+
+class PointLocator:
+    """Assign points to the boundary feature containing them, in bulk.
+
+    Points are bucketed by grid cell, so each feature is only ray-cast against points in
+    the cells its bounding box covers.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, layer: str = 'community_boundaries'):
+        self.layer = layer
+        self.features = []
+        cursor = conn.execute("""
+            SELECT code, geometry, min_lon, min_lat, max_lon, max_lat
+            FROM boundary_geometry
+            WHERE layer = ?
+            ORDER BY code
+        """, (layer,))
+        for code, blob, min_lon, min_lat, max_lon, max_lat in cursor.fetchall():
+            self.features.append({
+                'code': code,
+                'edges': ring_edges(unpack_wkb(blob)),
+                'bbox': (min_lon, min_lat, max_lon, max_lat),
+                'cells': []
+            })
+
+        by_code = {feature['code']: feature for feature in self.features}
+        cursor = conn.execute("SELECT code, cell_x, cell_y FROM boundary_grid WHERE layer = ?", (layer,))
+        for code, cell_x, cell_y in cursor.fetchall():
+            if code in by_code:
+                by_code[code]['cells'].append(self._cell_key(cell_x, cell_y))
+
+    @staticmethod
+    def _cell_key(cell_x, cell_y):
+        # Latitude cells stay within +/-9000, so this is unique per (x, y)
+        return cell_x * 100_000 + cell_y
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def locate(self, lons: Iterable[float], lats: Iterable[float]) -> np.ndarray:
+        """Feature code containing each point (None outside every feature or without coordinates)."""
+        lons = np.asarray(lons, dtype=float)
+        lats = np.asarray(lats, dtype=float)
+        codes = np.full(len(lons), None, dtype=object)
+
+        points = np.flatnonzero(np.isfinite(lons) & np.isfinite(lats))
+        if not len(points) or not self.features:
+            return codes
+
+        keys = self._cell_key(np.floor(lons[points] / GRID_CELL_DEGREES).astype(np.int64),
+                              np.floor(lats[points] / GRID_CELL_DEGREES).astype(np.int64))
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        unassigned = np.ones(len(points), dtype=bool)
+
+        for feature in self.features:
+            cell_keys = np.asarray(feature['cells'], dtype=np.int64)
+            starts = np.searchsorted(sorted_keys, cell_keys, side='left')
+            ends = np.searchsorted(sorted_keys, cell_keys, side='right')
+            spans = [order[start:end] for start, end in zip(starts, ends) if end > start]
+            if not spans:
+                continue
+
+            candidates = np.concatenate(spans)
+            candidates = candidates[unassigned[candidates]]
+            min_lon, min_lat, max_lon, max_lat = feature['bbox']
+            x, y = lons[points[candidates]], lats[points[candidates]]
+            in_bbox = (x >= min_lon) & (x <= max_lon) & (y >= min_lat) & (y <= max_lat)
+            candidates = candidates[in_bbox]
+            if not len(candidates):
+                continue
+
+            hits = candidates[points_in_edges(feature['edges'], x[in_bbox], y[in_bbox])]
+            codes[points[hits]] = feature['code']
+            unassigned[hits] = False
+
+        return codes
+
+
+def assign_communities(conn: sqlite3.Connection, df: Any, code_column: str = 'community_code',
+                       name_column: str = 'community_name') -> int:
+    """Fill missing community code/name on a DataFrame of points from their coordinates.
+
+    Rows with a null or UNKNOWN community and a latitude/longitude are located in
+    community_boundaries. Returns the number of rows recovered.
+    """
+    from rollups import table_exists
+
+    if 'latitude' not in df.columns or 'longitude' not in df.columns:
+        return 0
+    if not table_exists(conn.cursor(), 'boundary_geometry'):
+        return 0
+
+    if code_column not in df.columns:
+        df[code_column] = None
+    missing = (df[code_column].isna() | df[code_column].isin([UNKNOWN_COMMUNITY, ''])).to_numpy()
+    missing = missing & df['latitude'].notna().to_numpy() & df['longitude'].notna().to_numpy()
+    if not missing.any():
+        return 0
+
+    locator = PointLocator(conn, 'community_boundaries')
+    if not len(locator):
+        logger.warning("⚠️  No community boundaries packed - run data-lake/geometry.py")
+        return 0
+
+    codes = locator.locate(df['longitude'].to_numpy()[missing], df['latitude'].to_numpy()[missing])
+    found = codes != None  # noqa: E711 - elementwise on an object array
+    rows = df.index[missing][found]
+
+    df.loc[rows, code_column] = codes[found]
+    if name_column:
+        names = dict(conn.execute("SELECT community_code, name FROM community_boundaries").fetchall())
+        df.loc[rows, name_column] = [names.get(code) for code in codes[found]]
+    return int(found.sum())
+
+
+def rebuild_geometries(conn: sqlite3.Connection, keep_geojson: bool = False) -> Dict[str, int]:
+    """Pack GeoJSON still held in the boundary tables' multipolygon columns."""
+    from rollups import table_exists
+
+    rebuilt = {}
+    cursor = conn.cursor()
+    if not table_exists(cursor, 'boundary_geometry'):
+        logger.warning("⚠️  boundary_geometry missing - run data-lake/migrate.py")
+        return rebuilt
+
+    for layer, code_column in BOUNDARY_LAYERS.items():
+        if not table_exists(cursor, layer):
+            continue
+        cursor.execute(f"SELECT {code_column}, multipolygon FROM {layer} WHERE multipolygon IS NOT NULL")
+        rebuilt[layer] = store_geometries(cursor, layer, cursor.fetchall())
+        if not keep_geojson:
+            cursor.execute(f"UPDATE {layer} SET multipolygon = NULL WHERE multipolygon IS NOT NULL")
+
+    conn.commit()
+    return rebuilt
+
+
+def main():
+    """Pack existing GeoJSON boundaries into boundary_geometry."""
+    import argparse
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from config.config_manager import get_config
+    from database import connect
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Pack boundary GeoJSON into compact indexed geometry')
+    parser.add_argument('--db', type=str, help='Database path (default: configured primary database)')
+    parser.add_argument('--keep-geojson', action='store_true', help='Leave the multipolygon text columns in place')
+
+    args = parser.parse_args()
+
+    db_path = Path(args.db) if args.db else get_config().get_database_path()
+    conn = connect(db_path)
+    try:
+        rebuilt = rebuild_geometries(conn, keep_geojson=args.keep_geojson)
+    finally:
+        conn.close()
+
+    print("\n🗺️  BOUNDARY GEOMETRY SUMMARY")
+    print("="*50)
+    for layer, count in rebuilt.items():
+        print(f"  {layer}: {count:,} features packed")
+    if rebuilt and not args.keep_geojson:
+        print("\n💡 Run VACUUM to reclaim the space freed by the GeoJSON text")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,13 @@ Import Existing CSV Data to Database
 Loads the existing Calgary_CREB_Data.csv and calgary_housing_master_dataset.csv into the database
 """
 
-import sqlite3
 import pandas as pd
 from pathlib import Path
 import logging
 from datetime import datetime
 
+from database import connect
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -18,7 +19,7 @@ class DataImporter:
     
     def __init__(self, db_path: str):
         self.db_path = Path(db_path)
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = connect(self.db_path)
         
     def import_city_data(self, csv_path: str) -> int:
         """Import city-wide data from Calgary_CREB_Data.csv."""
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Database Maintenance
+Keeps calgary_data.db healthy as it grows: planner statistics (ANALYZE / PRAGMA optimize),
+incremental vacuum of freed pages, and integrity checks, plus a report of the pages each
+table and index uses and how selective each index is.
+
+The loader runs post_load_maintenance() after every load: a bounded ANALYZE of the
+tables it wrote, so export query plans keep up with table growth.
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional
+import logging
+
+from database import connect
+from rollups import rollups_for, table_exists
+
+logger = logging.getLogger(__name__)
+
+# Rows sampled per index by the post-load ANALYZE; approximate statistics are enough
+# for the planner and keep the hook well under a second on any table
+POST_LOAD_ANALYSIS_LIMIT = 1000
+
+# Free pages the post-load hook returns to the filesystem at most (4 MB at 4 KB pages)
+POST_LOAD_VACUUM_PAGES = 1024
+
+# PRAGMA auto_vacuum values
+AUTO_VACUUM_MODES = {0: 'NONE', 1: 'FULL', 2: 'INCREMENTAL'}
+
+# An index whose full key still matches this share of its table's rows rarely narrows a scan
+LOW_SELECTIVITY_SHARE = 0.1
+
+# Below this many rows a full scan is as cheap as any index, so selectivity isn't flagged
+MIN_ROWS_FOR_SELECTIVITY = 1000
+
+
+def user_tables(conn: sqlite3.Connection) -> List[str]:
+    """Tables in the database, excluding SQLite's own."""
+    return [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name")]
+
+
+def auto_vacuum_mode(conn: sqlite3.Connection) -> str:
+    """The database's auto_vacuum mode (NONE, FULL or INCREMENTAL)."""
+    return AUTO_VACUUM_MODES.get(conn.execute("PRAGMA auto_vacuum").fetchone()[0], 'UNKNOWN')
+
+
+def analyze(conn: sqlite3.Connection, tables: Optional[Iterable[str]] = None,
+            analysis_limit: int = 0) -> List[str]:
+    """ANALYZE the given tables (default: the whole database), then PRAGMA optimize.
+
+    analysis_limit > 0 samples roughly that many rows per index instead of reading
+    every row. Returns the tables analyzed.
+    """
+    conn.execute(f"PRAGMA analysis_limit = {int(analysis_limit)}")
+    try:
+        if tables is None:
+            conn.execute("ANALYZE")
+            analyzed = user_tables(conn)
+        else:
+            cursor = conn.cursor()
+            analyzed = [table for table in dict.fromkeys(tables) if table_exists(cursor, table)]
+            for table in analyzed:
+                conn.execute(f'ANALYZE "{table}"')
+        conn.execute("PRAGMA optimize")
+        conn.commit()
+    finally:
+        conn.execute("PRAGMA analysis_limit = 0")
+    return analyzed
+
+
+def incremental_vacuum(conn: sqlite3.Connection, max_pages: Optional[int] = None) -> int:
+    """Return free pages to the filesystem. Returns pages freed (0 unless auto_vacuum is INCREMENTAL)."""
+    if auto_vacuum_mode(conn) != 'INCREMENTAL':
+        return 0
+    before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    if not before:
+        return 0
+    # execute() steps the pragma only once, freeing a single page; executescript runs it to completion
+    conn.executescript(f"PRAGMA incremental_vacuum({int(max_pages or 0)})")
+    return before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+
+def enable_incremental_vacuum(conn: sqlite3.Connection) -> None:
+    """Switch auto_vacuum to INCREMENTAL. Rewrites the whole database with VACUUM."""
+    conn.commit()
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+
+
+def integrity_check(conn: sqlite3.Connection, quick: bool = False) -> List[str]:
+    """Problems found by integrity_check (or the faster quick_check); empty when healthy."""
+    pragma = 'quick_check' if quick else 'integrity_check'
+    results = [row[0] for row in conn.execute(f"PRAGMA {pragma}")]
+    return [] if results == ['ok'] else results
+
+
+def object_pages(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Pages used by each table and index (empty if SQLite was built without dbstat)."""
+    try:
+        return dict(conn.execute("SELECT name, COUNT(*) FROM dbstat GROUP BY name").fetchall())
+    except sqlite3.OperationalError:
+        return {}
+
+
+def storage_report(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+    """Rows and pages per table (indexes counted separately), largest first."""
+    pages = object_pages(conn)
+    report = []
+    for table in user_tables(conn):
+        indexes = [row[1] for row in conn.execute(f'PRAGMA index_list("{table}")')]
+        report.append({
+            'table': table,
+            'rows': conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0],
+            'pages': pages.get(table),
+            'index_pages': sum(pages.get(index, 0) for index in indexes) if pages else None,
+            'indexes': len(indexes)
+        })
+    return sorted(report, key=lambda r: (r['pages'] or 0) + (r['index_pages'] or 0), reverse=True)
+
+
+def index_report(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+    """Size, statistics and likely usefulness of every index.
+
+    Uses sqlite_stat1 (written by ANALYZE): its stat column is the index's row count
+    followed by the average rows matching each key prefix. Flags indexes whose columns
+    are a prefix of another index on the same table (redundant), whose full key still
+    matches a large share of the table (low selectivity), or that have no statistics.
+    """
+    pages = object_pages(conn)
+    stats = {}
+    if table_exists(conn.cursor(), 'sqlite_stat1'):
+        stats = {idx: stat for _, idx, stat in conn.execute("SELECT tbl, idx, stat FROM sqlite_stat1")
+                 if idx}
+
+    report = []
+    for table in user_tables(conn):
+        # ANALYZE writes no statistics for an empty table
+        empty = conn.execute(f'SELECT 1 FROM "{table}" LIMIT 1').fetchone() is None
+        indexes = {}
+        for _, name, _, origin, _ in conn.execute(f'PRAGMA index_list("{table}")'):
+            columns = [row[2] for row in conn.execute(f'PRAGMA index_info("{name}")')]
+            indexes[name] = {'origin': origin, 'columns': columns}
+
+        for name, index in indexes.items():
+            entry = {
+                'index': name,
+                'table': table,
+                'columns': index['columns'],
+                'pages': pages.get(name),
+                'rows': None,
+                'rows_per_key': None,
+                'notes': []
+            }
+            if name in stats:
+                numbers = [int(n) for n in stats[name].split()[:len(index['columns']) + 1]
+                           if n.isdigit()]
+                if numbers:
+                    entry['rows'] = numbers[0]
+                    entry['rows_per_key'] = numbers[-1] if len(numbers) > 1 else None
+            elif index['origin'] == 'c' and not empty:
+                entry['notes'].append('no statistics (run --analyze)')
+
+            # UNIQUE / PRIMARY KEY indexes enforce constraints, so they are never flagged
+            if index['origin'] != 'c':
+                entry['notes'].append('constraint')
+            else:
+                for other_name, other in indexes.items():
+                    if (other_name != name and len(other['columns']) > len(index['columns'])
+                            and other['columns'][:len(index['columns'])] == index['columns']):
+                        entry['notes'].append(f'redundant (prefix of {other_name})')
+                        break
+                if (entry['rows'] and entry['rows'] >= MIN_ROWS_FOR_SELECTIVITY and entry['rows_per_key']
+                        and entry['rows_per_key'] >= entry['rows'] * LOW_SELECTIVITY_SHARE):
+                    entry['notes'].append(f"low selectivity ({entry['rows_per_key']:,} rows per key)")
+            report.append(entry)
+    return report
+
+
+def post_load_maintenance(conn: sqlite3.Connection, tables: Iterable[str]) -> Dict[str, Any]:
+    """Cheap maintenance after a load: bounded ANALYZE of the loaded tables (and their
+    rollups), PRAGMA optimize, and a capped incremental vacuum."""
+    started = time.perf_counter()
+    targets = []
+    for table in tables:
+        targets.append(table)
+        targets.extend(rollup['table'] for rollup in rollups_for(table))
+
+    analyzed = analyze(conn, targets, analysis_limit=POST_LOAD_ANALYSIS_LIMIT)
+    freed = incremental_vacuum(conn, POST_LOAD_VACUUM_PAGES)
+    return {'analyzed': analyzed, 'pages_freed': freed,
+            'seconds': round(time.perf_counter() - started, 2)}
+
+
+def main():
+    """Run database maintenance and print the storage and index report."""
+    import argparse
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from config.config_manager import get_config
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Maintain the Calgary data database')
+    parser.add_argument('--db', type=str, help='Database path (default: configured primary database)')
+    parser.add_argument('--analyze', action='store_true', help='Full ANALYZE and PRAGMA optimize')
+    parser.add_argument('--vacuum', action='store_true', help='Return all free pages (incremental vacuum)')
+    parser.add_argument('--check', action='store_true', help='Run PRAGMA integrity_check')
+    parser.add_argument('--all', action='store_true', help='--analyze, --vacuum and --check')
+    parser.add_argument('--enable-incremental-vacuum', action='store_true',
+                        help='Switch auto_vacuum to INCREMENTAL (one-off full VACUUM; blocks writers)')
+    parser.add_argument('--report', action='store_true', help='Only print the storage and index report')
+
+    args = parser.parse_args()
+
+    db_path = Path(args.db) if args.db else get_config().get_database_path()
+    if not db_path.exists():
+        logger.error(f"❌ Database not found: {db_path}")
+        sys.exit(1)
+
+    conn = connect(db_path, read_only=args.report)
+    try:
+        if args.enable_incremental_vacuum:
+            logger.info("🧹 Rewriting the database with auto_vacuum = INCREMENTAL...")
+            enable_incremental_vacuum(conn)
+
+        if args.analyze or args.all:
+            started = time.perf_counter()
+            analyzed = analyze(conn)
+            logger.info(f"📈 Analyzed {len(analyzed)} tables in {time.perf_counter() - started:.1f}s")
+
+        if args.vacuum or args.all:
+            if auto_vacuum_mode(conn) == 'INCREMENTAL':
+                logger.info(f"🧹 Freed {incremental_vacuum(conn):,} pages")
+            else:
+                logger.warning("⚠️  auto_vacuum is not INCREMENTAL - run once with --enable-incremental-vacuum")
+
+        problems = None
+        if args.check or args.all:
+            problems = integrity_check(conn)
+
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+        print("\n🗄️  DATABASE")
+        print("="*50)
+        print(f"  {page_count:,} pages × {page_size:,} B = {page_count * page_size / (1024 * 1024):.1f} MB")
+        print(f"  Free pages: {freelist:,}   auto_vacuum: {auto_vacuum_mode(conn)}")
+        if problems is not None:
+            print(f"  Integrity: {'✅ ok' if not problems else '❌ ' + '; '.join(problems[:5])}")
+
+        print("\n📦 TABLES (largest first)")
+        print("="*50)
+        for row in storage_report(conn):
+            pages = f"{row['pages']:>7,} pages  {row['index_pages']:>7,} in {row['indexes']} indexes" \
+                if row['pages'] is not None else f"{row['indexes']} indexes"
+            print(f"  {row['table']:<40} {row['rows']:>10,} rows  {pages}")
+
+        print("\n🔎 INDEXES")
+        print("="*50)
+        for row in index_report(conn):
+            pages = f"{row['pages']:>6,} pages" if row['pages'] is not None else ' ' * 12
+            notes = ', '.join(row['notes'])
+            icon = '⚠️ ' if notes and notes != 'constraint' else '  '
+            print(f"{icon}{row['index']:<48} {pages}  ({', '.join(row['columns'])}) {notes}")
+    finally:
+        conn.close()
+
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
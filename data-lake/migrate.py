@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Database Migration Runner
+Applies versioned SQL migrations from data-lake/migrations/ and records them in schema_migrations
+"""
+
+import sqlite3
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Any
+import logging
+
+from database import connect
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).parent / 'migrations'
+
+
+class MigrationRunner:
+    """Apply numbered SQL migrations (NNN_description.sql) exactly once per database."""
+
+    def __init__(self, db_path: Path, migrations_dir: Path = MIGRATIONS_DIR):
+        self.db_path = Path(db_path)
+        self.migrations_dir = Path(migrations_dir)
+
+    def connect_db(self) -> sqlite3.Connection:
+        """Connect in autocommit mode so each migration controls its own transaction."""
+        return connect(self.db_path, isolation_level=None)
+
+    def ensure_migrations_table(self, conn: sqlite3.Connection) -> None:
+        """Create the migration bookkeeping table."""
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                checksum TEXT NOT NULL,
+                applied_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+    def discover_migrations(self) -> List[Dict[str, Any]]:
+        """List migration files in version order."""
+        migrations = []
+        for sql_file in sorted(self.migrations_dir.glob('[0-9][0-9][0-9]_*.sql')):
+            sql = sql_file.read_text()
+            migrations.append({
+                'version': sql_file.stem.split('_', 1)[0],
+                'name': sql_file.stem.split('_', 1)[1],
+                'path': sql_file,
+                'sql': sql,
+                'checksum': hashlib.sha256(sql.encode()).hexdigest()[:16]
+            })
+        return migrations
+
+    def get_applied(self, conn: sqlite3.Connection) -> Dict[str, str]:
+        """Applied migration versions and their checksums."""
+        cursor = conn.execute("SELECT version, checksum FROM schema_migrations")
+        return dict(cursor.fetchall())
+
+    @staticmethod
+    def split_statements(sql: str) -> List[str]:
+        """Split a migration script into complete SQL statements."""
+        statements = []
+        buffer = ''
+        for line in sql.splitlines(keepends=True):
+            if not buffer and line.strip().startswith('--'):
+                continue
+            buffer += line
+            if sqlite3.complete_statement(buffer):
+                if buffer.strip():
+                    statements.append(buffer.strip())
+                buffer = ''
+        if buffer.strip():
+            statements.append(buffer.strip())
+        return statements
+
+    def apply_migration(self, conn: sqlite3.Connection, migration: Dict[str, Any]) -> str:
+        """Apply one migration atomically. Returns 'applied', 'deferred' or 'failed'."""
+        label = f"{migration['version']}_{migration['name']}"
+        try:
+            conn.execute("BEGIN")
+            for statement in self.split_statements(migration['sql']):
+                conn.execute(statement)
+            conn.execute(
+                "INSERT INTO schema_migrations (version, name, checksum, applied_at) VALUES (?, ?, ?, ?)",
+                (migration['version'], migration['name'], migration['checksum'], datetime.now().isoformat())
+            )
+            conn.execute("COMMIT")
+            return 'applied'
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            # Tables owned by other pipelines (311, rentals) may not exist yet, or may
+            # predate the columns a migration indexes; retry on a later run
+            if isinstance(e, sqlite3.OperationalError) and ('no such table' in str(e) or 'no such column' in str(e)):
+                logger.warning(f"⏸️  {label} deferred: {e}")
+                return 'deferred'
+            logger.error(f"❌ {label} failed and was rolled back ({type(e).__name__}: {e})")
+            return 'failed'
+
+    def migrate(self, dry_run: bool = False) -> Dict[str, List[str]]:
+        """Apply all pending migrations in order."""
+        results = {'applied': [], 'deferred': [], 'failed': [], 'not_attempted': [], 'already_applied': []}
+
+        conn = self.connect_db()
+        try:
+            self.ensure_migrations_table(conn)
+            applied = self.get_applied(conn)
+
+            for migration in self.discover_migrations():
+                label = f"{migration['version']}_{migration['name']}"
+
+                if migration['version'] in applied:
+                    if applied[migration['version']] != migration['checksum']:
+                        logger.warning(f"⚠️  {label} changed after it was applied (checksum mismatch)")
+                    results['already_applied'].append(label)
+                    continue
+
+                if results['failed']:
+                    # Later migrations may build on the one that failed
+                    results['not_attempted'].append(label)
+                    continue
+
+                if dry_run:
+                    logger.info(f"📋 Would apply {label}")
+                    results['applied'].append(label)
+                    continue
+
+                outcome = self.apply_migration(conn, migration)
+                if outcome == 'applied':
+                    logger.info(f"✅ Applied {label}")
+                results[outcome].append(label)
+
+            if results['applied'] and not dry_run:
+                # Refresh planner statistics so the new indexes get picked up
+                conn.execute("PRAGMA optimize")
+        finally:
+            conn.close()
+
+        return results
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Migration status for every known migration."""
+        conn = self.connect_db()
+        try:
+            self.ensure_migrations_table(conn)
+            cursor = conn.execute("SELECT version, applied_at FROM schema_migrations")
+            applied = dict(cursor.fetchall())
+        finally:
+            conn.close()
+
+        return [{
+            'version': m['version'],
+            'name': m['name'],
+            'applied_at': applied.get(m['version'])
+        } for m in self.discover_migrations()]
+
+
+def main():
+    """Apply pending migrations to the Calgary database."""
+    import argparse
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from config.config_manager import get_config
+
+    parser = argparse.ArgumentParser(description='Apply versioned schema migrations')
+    parser.add_argument('--db', type=str, help='Database path (default: configured primary database)')
+    parser.add_argument('--status', action='store_true', help='Show applied and pending migrations')
+    parser.add_argument('--dry-run', action='store_true', help='Show pending migrations without applying')
+
+    args = parser.parse_args()
+
+    db_path = Path(args.db) if args.db else get_config().get_database_path()
+    if not db_path.exists():
+        logger.error(f"❌ Database not found: {db_path}")
+        sys.exit(1)
+
+    runner = MigrationRunner(db_path)
+
+    if args.status:
+        print("\n📋 MIGRATION STATUS")
+        print("="*50)
+        for migration in runner.status():
+            state = f"applied {migration['applied_at']}" if migration['applied_at'] else "pending"
+            print(f"  {migration['version']} {migration['name']:<40} {state}")
+        return
+
+    results = runner.migrate(dry_run=args.dry_run)
+
+    print("\n🗄️  MIGRATION SUMMARY")
+    print("="*50)
+    print(f"Applied: {len(results['applied'])}")
+    print(f"Already applied: {len(results['already_applied'])}")
+    print(f"Deferred (missing tables): {len(results['deferred'])}")
+    for label in results['deferred']:
+        print(f"  - {label}")
+    if results['failed']:
+        print(f"Failed: {len(results['failed'])}")
+        for label in results['failed']:
+            print(f"  - {label}")
+        print(f"Not attempted (after failure): {len(results['not_attempted'])}")
+        for label in results['not_attempted']:
+            print(f"  - {label}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+-- Migration: Composite index for district history lookups
+-- Purpose: Serve the windowed (district, property_type) history query in generate_district_data.py
+-- Date: 2026-10-18
+
+CREATE INDEX IF NOT EXISTS idx_district_type_date
+    ON housing_district_monthly(district, property_type, date);
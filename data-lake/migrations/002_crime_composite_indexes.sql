@@ -0,0 +1,11 @@
+-- Migration: Covering indexes for crime statistics exports
+-- Purpose: Year/category trends and per-community safety queries read only the index
+-- Date: 2026-10-18
+
+-- get_crime_trends, get_year_over_year_change: WHERE year ... GROUP BY year, crime_category
+CREATE INDEX IF NOT EXISTS idx_crime_year_category
+    ON crime_statistics_monthly(year, crime_category, incident_count);
+
+-- get_community_safety_scores, get_safest_neighborhoods, get_crime_by_category
+CREATE INDEX IF NOT EXISTS idx_crime_community_year_category
+    ON crime_statistics_monthly(community, year, crime_category, incident_count, date);
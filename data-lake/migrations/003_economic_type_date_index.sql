@@ -0,0 +1,6 @@
+-- Migration: Covering index for economic indicator time series
+-- Purpose: Indicator lookups by indicator_type ordered by date without touching the table
+-- Date: 2026-10-18
+
+CREATE INDEX IF NOT EXISTS idx_economic_type_date
+    ON economic_indicators_monthly(indicator_type, date, value);
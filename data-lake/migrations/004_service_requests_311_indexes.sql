@@ -0,0 +1,11 @@
+-- Migration: Covering indexes for 311 monthly exports
+-- Purpose: Month-window and seasonal 311 queries read only the index
+-- Date: 2026-10-18
+
+-- get_recent_trends, get_top_issues: WHERE year_month >= ? GROUP BY ... service_category
+CREATE INDEX IF NOT EXISTS idx_311_monthly_month_category
+    ON service_requests_311_monthly(year_month, service_category, total_requests);
+
+-- get_seasonal_patterns: WHERE service_category IN (...) GROUP BY service_category, month
+CREATE INDEX IF NOT EXISTS idx_311_monthly_category_month
+    ON service_requests_311_monthly(service_category, month, total_requests);
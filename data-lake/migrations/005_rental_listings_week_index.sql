@@ -0,0 +1,6 @@
+-- Migration: Covering index for latest rental snapshot summary
+-- Purpose: Latest extraction_week lookup and per-type rent aggregates read only the index
+-- Date: 2026-10-18
+
+CREATE INDEX IF NOT EXISTS idx_rental_listings_week_type
+    ON rental_listings_snapshot(extraction_week, property_type, rent, bedrooms);
@@ -0,0 +1,39 @@
+-- Migration: Materialised crime_community_rollup
+-- Purpose: Per community x year x category totals so safety scores read a few hundred
+--          pre-aggregated rows instead of the crime fact table. Kept current by
+--          SimpleCSVLoader (see data-lake/rollups.py); rebuild with `python3 rollups.py`.
+-- Date: 2026-10-18
+
+CREATE TABLE IF NOT EXISTS crime_community_rollup (
+    community TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    crime_category TEXT NOT NULL,
+    incident_count INTEGER,
+    record_count INTEGER NOT NULL,
+    months_reported INTEGER NOT NULL,     -- distinct months with this category
+    community_months INTEGER NOT NULL,    -- distinct months with any incident (same for every category row)
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (community, year, crime_category)
+);
+
+CREATE INDEX IF NOT EXISTS idx_crime_rollup_year
+    ON crime_community_rollup(year, crime_category, incident_count);
+
+-- Backfill from existing crime data
+DELETE FROM crime_community_rollup;
+
+INSERT INTO crime_community_rollup
+    (community, year, crime_category, incident_count, record_count, months_reported, community_months)
+SELECT
+    c.community,
+    c.year,
+    c.crime_category,
+    SUM(c.incident_count),
+    COUNT(*),
+    COUNT(DISTINCT strftime('%Y-%m', c.date)),
+    (SELECT COUNT(DISTINCT strftime('%Y-%m', m.date))
+     FROM crime_statistics_monthly m
+     WHERE m.community = c.community AND m.year = c.year)
+FROM crime_statistics_monthly c
+WHERE c.community IS NOT NULL AND c.year IS NOT NULL
+GROUP BY c.community, c.year, c.crime_category;
@@ -0,0 +1,57 @@
+-- Migration: Monthly 311 rollup tables
+-- Purpose: Month x category and month x community x category totals for the service
+--          request export, maintained by SimpleCSVLoader when 311 months load
+--          (see data-lake/rollups.py); rebuild with `python3 rollups.py`.
+-- Date: 2026-10-18
+
+-- Trends, top issues, seasonal patterns and summary totals
+CREATE TABLE IF NOT EXISTS service_requests_311_category_rollup (
+    year_month TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    service_category TEXT NOT NULL,
+    total_requests INTEGER NOT NULL,
+    record_count INTEGER NOT NULL,        -- community rows summed (for per-community averages)
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (year_month, service_category)
+);
+
+CREATE INDEX IF NOT EXISTS idx_311_category_rollup_category_month
+    ON service_requests_311_category_rollup(service_category, month);
+
+-- Neighbourhood scores (communities keyed by name, codes sharing a name are combined)
+CREATE TABLE IF NOT EXISTS service_requests_311_community_rollup (
+    year_month TEXT NOT NULL,
+    community_name TEXT NOT NULL,
+    service_category TEXT NOT NULL,
+    total_requests INTEGER NOT NULL,
+    PRIMARY KEY (year_month, community_name, service_category)
+) WITHOUT ROWID;
+
+-- Backfill from existing 311 data
+DELETE FROM service_requests_311_category_rollup;
+
+INSERT INTO service_requests_311_category_rollup
+    (year_month, year, month, service_category, total_requests, record_count)
+SELECT
+    year_month,
+    MAX(year),
+    MAX(month),
+    service_category,
+    SUM(total_requests),
+    COUNT(*)
+FROM service_requests_311_monthly
+GROUP BY year_month, service_category;
+
+DELETE FROM service_requests_311_community_rollup;
+
+INSERT INTO service_requests_311_community_rollup
+    (year_month, community_name, service_category, total_requests)
+SELECT
+    year_month,
+    community_name,
+    service_category,
+    SUM(total_requests)
+FROM service_requests_311_monthly
+WHERE community_name IS NOT NULL
+GROUP BY year_month, community_name, service_category;
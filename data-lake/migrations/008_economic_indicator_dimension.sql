@@ -0,0 +1,46 @@
+-- Migration: economic_indicator dimension
+-- Purpose: Integer key per indicator_type so exports seek (indicator_id, date) instead of
+--          pattern-matching indicator_name. New indicators are added by SimpleCSVLoader
+--          when economic rows are loaded.
+-- Date: 2026-10-18
+
+CREATE TABLE IF NOT EXISTS economic_indicator (
+    indicator_id INTEGER PRIMARY KEY,
+    indicator_type TEXT NOT NULL UNIQUE,
+    indicator_name TEXT,                  -- source name when first registered (names drift between releases)
+    unit TEXT,
+    category TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT OR IGNORE INTO economic_indicator (indicator_type, indicator_name, unit, category)
+SELECT indicator_type, indicator_name, unit, category
+FROM (
+    SELECT indicator_type, indicator_name, unit, category, MAX(date)
+    FROM economic_indicators_monthly
+    GROUP BY indicator_type
+)
+ORDER BY indicator_type;
+
+ALTER TABLE economic_indicators_monthly
+    ADD COLUMN indicator_id INTEGER REFERENCES economic_indicator(indicator_id);
+
+UPDATE economic_indicators_monthly
+SET indicator_id = (
+    SELECT d.indicator_id
+    FROM economic_indicator d
+    WHERE d.indicator_type = economic_indicators_monthly.indicator_type
+);
+
+-- Source names drift between releases ("unemployment" / "unemployment rate"), so the same
+-- month can be stored once per name; keep the most recently loaded row of each
+DELETE FROM economic_indicators_monthly
+WHERE id NOT IN (
+    SELECT MAX(id)
+    FROM economic_indicators_monthly
+    GROUP BY indicator_id, date
+);
+
+-- One observation per indicator per month
+CREATE UNIQUE INDEX IF NOT EXISTS idx_economic_indicator_date
+    ON economic_indicators_monthly(indicator_id, date);
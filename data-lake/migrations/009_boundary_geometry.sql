@@ -0,0 +1,33 @@
+-- Migration: Compact boundary geometry with grid index
+-- Purpose: Community, district and sector boundaries as WKB blobs with bounding boxes and
+--          centroids, written by SimpleCSVLoader when boundary files load
+--          (see data-lake/geometry.py). Existing GeoJSON text is packed by
+--          `python3 geometry.py`.
+-- Date: 2026-10-18
+
+CREATE TABLE IF NOT EXISTS boundary_geometry (
+    layer TEXT NOT NULL,                  -- source table (community_boundaries, community_districts, community_sectors)
+    code TEXT NOT NULL,                   -- community_code / district code / sector code
+    geometry BLOB NOT NULL,               -- little-endian WKB MultiPolygon, lon/lat
+    min_lon REAL NOT NULL,
+    min_lat REAL NOT NULL,
+    max_lon REAL NOT NULL,
+    max_lat REAL NOT NULL,
+    centroid_lon REAL NOT NULL,
+    centroid_lat REAL NOT NULL,
+    vertex_count INTEGER NOT NULL,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(layer, code)
+);
+
+-- Features overlapping each 0.01 degree cell (geometry.GRID_CELL_DEGREES)
+CREATE TABLE IF NOT EXISTS boundary_grid (
+    layer TEXT NOT NULL,
+    cell_x INTEGER NOT NULL,
+    cell_y INTEGER NOT NULL,
+    code TEXT NOT NULL,
+    PRIMARY KEY (layer, cell_x, cell_y, code)
+) WITHOUT ROWID;
+
+-- Re-indexing a feature deletes its cells by code
+CREATE INDEX IF NOT EXISTS idx_boundary_grid_code ON boundary_grid(layer, code);
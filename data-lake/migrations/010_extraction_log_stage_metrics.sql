@@ -0,0 +1,37 @@
+-- Migration: Per-stage cost columns on extraction_log
+-- Purpose: Extractors log one row per stage (pdf_decode, excel_parse, http_fetch,
+--          transform, save) with its wall/CPU time, peak memory, bytes read and rows
+--          produced (data-engine/pipeline/instrumentation.py), so a source getting
+--          slower month over month shows up in extraction_stage_monthly.
+--          extraction_type holds the source (creb, crime, economic, 311, rentfaster).
+-- Date: 2026-10-18
+
+ALTER TABLE extraction_log ADD COLUMN run_id TEXT;
+ALTER TABLE extraction_log ADD COLUMN stage TEXT;
+ALTER TABLE extraction_log ADD COLUMN wall_seconds REAL;
+ALTER TABLE extraction_log ADD COLUMN cpu_seconds REAL;
+ALTER TABLE extraction_log ADD COLUMN peak_rss_mb REAL;
+ALTER TABLE extraction_log ADD COLUMN traced_peak_mb REAL;  -- Only when run with python -X tracemalloc
+ALTER TABLE extraction_log ADD COLUMN bytes_read INTEGER;
+
+CREATE INDEX IF NOT EXISTS idx_extraction_log_source_stage_date
+    ON extraction_log(extraction_type, stage, extracted_date);
+
+-- Month-over-month cost per source and stage
+CREATE VIEW IF NOT EXISTS extraction_stage_monthly AS
+SELECT
+    extraction_type AS source,
+    stage,
+    substr(extracted_date, 1, 7) AS month,
+    COUNT(DISTINCT run_id) AS runs,
+    SUM(records_extracted) AS rows_produced,
+    ROUND(SUM(wall_seconds), 3) AS wall_seconds,
+    ROUND(SUM(cpu_seconds), 3) AS cpu_seconds,
+    MAX(peak_rss_mb) AS peak_rss_mb,
+    MAX(traced_peak_mb) AS traced_peak_mb,
+    SUM(bytes_read) AS bytes_read,
+    ROUND(SUM(records_extracted) / NULLIF(SUM(wall_seconds), 0), 1) AS rows_per_second,
+    SUM(status = 'failed') AS failures
+FROM extraction_log
+WHERE stage IS NOT NULL
+GROUP BY extraction_type, stage, substr(extracted_date, 1, 7);
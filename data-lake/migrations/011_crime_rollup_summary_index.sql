@@ -0,0 +1,7 @@
+-- Migration: Covering index for the crime export summary
+-- Purpose: Community / category counts, incident total and year range read only the index
+--          instead of scanning crime_statistics_monthly
+-- Date: 2026-10-18
+
+CREATE INDEX IF NOT EXISTS idx_crime_rollup_community_category
+    ON crime_community_rollup(community, crime_category, year, incident_count);
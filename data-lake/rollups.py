@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Rollup Table Maintenance
+Keeps pre-aggregated summary tables in step with the fact tables they summarise.
+
+Each rollup is refreshed per key (e.g. community + year): rows for the affected keys are
+deleted and re-aggregated from the fact table, so a refresh is idempotent and can run in
+the same transaction as the load that touched those keys.
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Sequence, Set, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Rollups by source fact table. `select` aggregates the fact table; `{where}` is replaced
+# with a per-key filter on refresh or a full-table filter on rebuild.
+ROLLUPS = {
+    'crime_statistics_monthly': [
+        {
+            'table': 'crime_community_rollup',
+            'key_columns': ['community', 'year'],
+            'columns': ['community', 'year', 'crime_category', 'incident_count',
+                        'record_count', 'months_reported', 'community_months'],
+            'select': """
+                SELECT
+                    c.community,
+                    c.year,
+                    c.crime_category,
+                    SUM(c.incident_count),
+                    COUNT(*),
+                    COUNT(DISTINCT strftime('%Y-%m', c.date)),
+                    (SELECT COUNT(DISTINCT strftime('%Y-%m', m.date))
+                     FROM crime_statistics_monthly m
+                     WHERE m.community = c.community AND m.year = c.year)
+                FROM crime_statistics_monthly c
+                WHERE c.community IS NOT NULL AND c.year IS NOT NULL {where}
+                GROUP BY c.community, c.year, c.crime_category
+            """,
+            'key_filter': "AND c.community = ? AND c.year = ?"
+        }
+    ],
+    'service_requests_311_monthly': [
+        {
+            'table': 'service_requests_311_category_rollup',
+            'key_columns': ['year_month'],
+            'columns': ['year_month', 'year', 'month', 'service_category',
+                        'total_requests', 'record_count'],
+            'select': """
+                SELECT
+                    year_month,
+                    MAX(year),
+                    MAX(month),
+                    service_category,
+                    SUM(total_requests),
+                    COUNT(*)
+                FROM service_requests_311_monthly
+                WHERE 1 = 1 {where}
+                GROUP BY year_month, service_category
+            """,
+            'key_filter': "AND year_month = ?"
+        },
+        {
+            'table': 'service_requests_311_community_rollup',
+            'key_columns': ['year_month'],
+            'columns': ['year_month', 'community_name', 'service_category', 'total_requests'],
+            'select': """
+                SELECT
+                    year_month,
+                    community_name,
+                    service_category,
+                    SUM(total_requests)
+                FROM service_requests_311_monthly
+                WHERE community_name IS NOT NULL {where}
+                GROUP BY year_month, community_name, service_category
+            """,
+            'key_filter': "AND year_month = ?"
+        }
+    ]
+}
+
+
+def rollups_for(fact_table: str) -> List[Dict[str, Any]]:
+    """Rollup definitions that depend on a fact table."""
+    return ROLLUPS.get(fact_table, [])
+
+
+def table_exists(cursor, table: str) -> bool:
+    """Check whether a table exists."""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+    return cursor.fetchone() is not None
+
+
+def _row_key(rollup: Dict[str, Any], record: Dict[str, Any]) -> Optional[Tuple]:
+    """Extract a rollup key from a loaded row, deriving year from date when needed."""
+    key = []
+    for column in rollup['key_columns']:
+        value = record.get(column)
+        if value is None and column == 'year' and record.get('date'):
+            value = int(str(record['date'])[:4])
+        if value is None:
+            return None
+        key.append(int(value) if column == 'year' else value)
+    return tuple(key)
+
+
+def affected_keys(rollup: Dict[str, Any], columns: Sequence[str],
+                  rows: Sequence[Sequence[Any]]) -> Set[Tuple]:
+    """Distinct rollup keys touched by a batch of loaded rows."""
+    keys = set()
+    for row in rows:
+        key = _row_key(rollup, dict(zip(columns, row)))
+        if key is not None:
+            keys.add(key)
+    return keys
+
+
+def _insert_sql(rollup: Dict[str, Any], where: str) -> str:
+    columns = ', '.join(rollup['columns'])
+    return f"INSERT INTO {rollup['table']} ({columns}) {rollup['select'].format(where=where)}"
+
+
+def refresh_rollups(cursor, fact_table: str, columns: Sequence[str],
+                    rows: Sequence[Sequence[Any]]) -> Dict[str, int]:
+    """Re-aggregate the rollup rows for every key touched by a batch of fact rows.
+
+    Uses the caller's cursor so the refresh commits or rolls back with the load itself.
+    """
+    refreshed = {}
+    for rollup in rollups_for(fact_table):
+        if not table_exists(cursor, rollup['table']):
+            logger.warning(f"⚠️  Rollup {rollup['table']} missing - run data-lake/migrate.py")
+            continue
+
+        keys = affected_keys(rollup, columns, rows)
+        key_match = ' AND '.join(f"{col} = ?" for col in rollup['key_columns'])
+        delete_sql = f"DELETE FROM {rollup['table']} WHERE {key_match}"
+        insert_sql = _insert_sql(rollup, rollup['key_filter'])
+
+        for key in keys:
+            cursor.execute(delete_sql, key)
+            cursor.execute(insert_sql, key)
+
+        refreshed[rollup['table']] = len(keys)
+    return refreshed
+
+
+def rebuild_rollups(conn: sqlite3.Connection, fact_table: Optional[str] = None) -> Dict[str, int]:
+    """Rebuild rollups from scratch (all, or those for one fact table)."""
+    rebuilt = {}
+    cursor = conn.cursor()
+    fact_tables = [fact_table] if fact_table else list(ROLLUPS)
+
+    for table in fact_tables:
+        if not table_exists(cursor, table):
+            continue
+        for rollup in rollups_for(table):
+            if not table_exists(cursor, rollup['table']):
+                logger.warning(f"⚠️  Rollup {rollup['table']} missing - run data-lake/migrate.py")
+                continue
+            cursor.execute(f"DELETE FROM {rollup['table']}")
+            cursor.execute(_insert_sql(rollup, ''))
+            cursor.execute(f"SELECT COUNT(*) FROM {rollup['table']}")
+            rebuilt[rollup['table']] = cursor.fetchone()[0]
+
+    conn.commit()
+    return rebuilt
+
+
+def main():
+    """Rebuild rollup tables from their fact tables."""
+    import argparse
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from config.config_manager import get_config
+    from database import connect
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Rebuild rollup tables from fact tables')
+    parser.add_argument('--db', type=str, help='Database path (default: configured primary database)')
+    parser.add_argument('--table', type=str, choices=list(ROLLUPS), help='Only rebuild rollups for this fact table')
+
+    args = parser.parse_args()
+
+    db_path = Path(args.db) if args.db else get_config().get_database_path()
+    conn = connect(db_path)
+    try:
+        rebuilt = rebuild_rollups(conn, args.table)
+    finally:
+        conn.close()
+
+    print("\n📊 ROLLUP REBUILD SUMMARY")
+    print("="*50)
+    for table, count in rebuilt.items():
+        print(f"  {table}: {count:,} rows")
+
+
+if __name__ == "__main__":
+    main()
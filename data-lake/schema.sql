@@ -1,3 +1,5 @@
+-- Freed pages are returned by data-lake/maintenance.py (must precede the first table)
+PRAGMA auto_vacuum = INCREMENTAL;
 CREATE TABLE housing_city_monthly (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         date TEXT NOT NULL,
@@ -60,6 +62,7 @@ CREATE INDEX idx_city_property ON housing_city_monthly(property_type);
 CREATE INDEX idx_district_date ON housing_district_monthly(date);
 CREATE INDEX idx_district_property ON housing_district_monthly(property_type);
 CREATE INDEX idx_district_name ON housing_district_monthly(district);
+CREATE INDEX idx_district_type_date ON housing_district_monthly(district, property_type, date);
 CREATE VIEW housing_city_validated AS
     SELECT * FROM housing_city_monthly 
     WHERE validation_status = 'approved'
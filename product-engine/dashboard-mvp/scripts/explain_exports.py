@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Explain Dashboard Export Queries
+Runs every export generator against the database, captures each SQL query it issues
+and reports the EXPLAIN QUERY PLAN, flagging full table scans
+"""
+
+import sys
+import re
+import sqlite3
+import tempfile
+import importlib
+import contextlib
+import io
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+import logging
+
+sys.path.insert(0, str(Path(__file__).parents[3] / 'data-lake'))
+from database import connect
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Generator modules and classes, in generate_all_exports.py order
+EXPORT_GENERATORS = [
+    ('generate_market_overview', 'MarketOverviewGenerator'),
+    ('generate_economic_indicators', 'EconomicIndicatorsGenerator'),
+    ('generate_district_data', 'DistrictDataGenerator'),
+    ('generate_rate_data', 'RateDataGenerator'),
+    ('generate_service_requests', 'ServiceRequestsGenerator'),
+    ('generate_rental_market', 'RentalMarketGenerator'),
+    ('generate_crime_statistics', 'CrimeStatisticsGenerator'),
+    ('generate_boundary_tiles', 'BoundaryTilesGenerator'),
+    ('generate_metadata', 'MetadataGenerator'),
+]
+
+# "SCAN <table>" with no index is a full table scan; "SCAN <table> USING ... INDEX" walks an index
+SCAN_PATTERN = re.compile(r'^SCAN (\w+)(?: AS \w+)?(?: USING (COVERING )?INDEX (\w+))?')
+
+# Reading a lookup table this small end to end is cheaper than any index
+SMALL_TABLE_ROWS = 1000
+
+
+class ExportQueryExplainer:
+    """Capture and explain the queries issued by the export generators."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.script_dir = Path(__file__).parent
+        self.db_path = Path(db_path) if db_path else Path(__file__).parents[3] / 'data-lake' / 'calgary_data.db'
+        self.table_rows = {}
+        self.failed = {}  # Generators that raised before their queries could be explained
+
+    def capture_queries(self, module_name: str, class_name: str) -> List[str]:
+        """Run a generator with output redirected to a temp dir and record its SELECTs."""
+        if str(self.script_dir) not in sys.path:
+            sys.path.insert(0, str(self.script_dir))
+        module = importlib.import_module(module_name)
+        generator = getattr(module, class_name)()
+
+        statements = []
+
+        def traced_connect() -> sqlite3.Connection:
+            conn = connect(self.db_path, read_only=True)
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            generator.db_path = self.db_path
+            if hasattr(generator, 'output_path'):
+                generator.output_path = Path(tmp_dir) / generator.output_path.name
+            if hasattr(generator, 'output_dir'):
+                generator.output_dir = Path(tmp_dir)
+            if hasattr(generator, 'archive_path'):
+                generator.archive_path = Path(tmp_dir) / 'archive'
+            generator.connect_db = traced_connect
+
+            # Generators print their own summaries; keep the report readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                generator.generate()
+
+        queries = []
+        for statement in statements:
+            sql = statement.strip()
+            if sql.upper().startswith(('SELECT', 'WITH')) and sql not in queries:
+                queries.append(sql)
+        return queries
+
+    def explain(self, conn: sqlite3.Connection, sql: str) -> Dict[str, Any]:
+        """Get the query plan for a statement and classify table access."""
+        cursor = conn.cursor()
+        if not self.table_rows:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            for (table,) in cursor.fetchall():
+                cursor.execute(f'SELECT COUNT(*) FROM "{table}"')
+                self.table_rows[table] = cursor.fetchone()[0]
+
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        plan = [row[3] for row in cursor.fetchall()]
+
+        full_scans = []
+        small_scans = []
+        index_scans = []
+        for detail in plan:
+            match = SCAN_PATTERN.match(detail)
+            if not match or match.group(1) not in self.table_rows:
+                continue
+            table = match.group(1)
+            if match.group(3):
+                index_scans.append(f"{table} ({match.group(3)})")
+            elif self.table_rows[table] < SMALL_TABLE_ROWS:
+                small_scans.append(f"{table} ({self.table_rows[table]} rows)")
+            else:
+                full_scans.append(table)
+
+        return {
+            'sql': sql,
+            'plan': plan,
+            'full_scans': full_scans,
+            'small_scans': small_scans,
+            'index_scans': index_scans
+        }
+
+    def run(self, only: Optional[str] = None, verbose: bool = False) -> List[Dict[str, Any]]:
+        """Explain every export query and print a report."""
+        results = []
+        conn = connect(self.db_path, read_only=True)
+
+        try:
+            for module_name, class_name in EXPORT_GENERATORS:
+                if only and only not in module_name:
+                    continue
+
+                try:
+                    queries = self.capture_queries(module_name, class_name)
+                except Exception as e:
+                    logger.error(f"❌ {module_name} failed: {e}")
+                    self.failed[module_name] = str(e)
+                    continue
+
+                for sql in queries:
+                    try:
+                        result = self.explain(conn, sql)
+                    except sqlite3.Error as e:
+                        logger.warning(f"⚠️  Could not explain query from {module_name}: {e}")
+                        continue
+                    result['export'] = module_name
+                    results.append(result)
+        finally:
+            conn.close()
+
+        self.print_report(results, verbose)
+        return results
+
+    def print_report(self, results: List[Dict[str, Any]], verbose: bool = False) -> None:
+        """Print the query plan report."""
+        print("\n🔎 EXPORT QUERY PLAN REPORT")
+        print("="*50)
+
+        current_export = None
+        for result in results:
+            if result['export'] != current_export:
+                current_export = result['export']
+                print(f"\n📄 {current_export}")
+
+            if result['full_scans']:
+                status = f"❌ FULL SCAN: {', '.join(result['full_scans'])}"
+            elif result['index_scans']:
+                status = f"🟡 index scan: {', '.join(result['index_scans'])}"
+            elif result['small_scans']:
+                status = f"✅ small table scan: {', '.join(result['small_scans'])}"
+            else:
+                status = "✅ indexed"
+
+            first_line = ' '.join(result['sql'].split())[:90]
+            print(f"  {status}")
+            print(f"     {first_line}...")
+            if verbose or result['full_scans']:
+                for detail in result['plan']:
+                    print(f"       | {detail}")
+
+        full_scan_count = sum(1 for r in results if r['full_scans'])
+        print("\n" + "="*50)
+        print(f"Queries explained: {len(results)}")
+        print(f"Queries with full table scans: {full_scan_count}")
+        if self.failed:
+            print(f"Generators that failed (queries not explained): {len(self.failed)}")
+            for module_name, error in self.failed.items():
+                print(f"  ❌ {module_name}: {error}")
+
+
+def main():
+    """Report query plans for all dashboard export queries."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='EXPLAIN QUERY PLAN report for dashboard export queries')
+    parser.add_argument('--db', type=str, help='Database path (default: data-lake/calgary_data.db)')
+    parser.add_argument('--export', type=str, help='Only explain one export (e.g. "crime")')
+    parser.add_argument('--verbose', action='store_true', help='Show the plan for every query')
+
+    args = parser.parse_args()
+
+    explainer = ExportQueryExplainer(args.db)
+    if not explainer.db_path.exists():
+        logger.error(f"❌ Database not found: {explainer.db_path}")
+        sys.exit(1)
+
+    results = explainer.run(args.export, args.verbose)
+    sys.exit(1 if explainer.failed or any(r['full_scans'] for r in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
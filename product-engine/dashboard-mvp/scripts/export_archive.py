@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Export Archive
+Stores each distinct export version once, gzipped by SHA-256, with an append-only
+index of (export, archived_at, hash) for cheap history listing and restores
+"""
+
+import re
+import sys
+import json
+import gzip
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Timestamped copies written by the generators before the archive was content-addressed
+LEGACY_FILE_PATTERN = re.compile(r'^(?P<export>.+)_(?P<stamp>\d{8}_\d{6})\.json$')
+
+
+class ExportArchive:
+    """Archive of export versions: blobs/<hh>/<sha256>.json.gz plus index.jsonl."""
+
+    def __init__(self, archive_path: Path):
+        self.archive_path = Path(archive_path)
+        self.blob_dir = self.archive_path / 'blobs'
+        self.index_path = self.archive_path / 'index.jsonl'
+
+    def blob_path(self, sha256: str) -> Path:
+        """Location of a blob, fanned out by hash prefix."""
+        return self.blob_dir / sha256[:2] / f"{sha256}.json.gz"
+
+    def history(self, export: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Archived versions, oldest first."""
+        if not self.index_path.exists():
+            return []
+        entries = []
+        with open(self.index_path, 'r') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    if export is None or entry['export'] == export:
+                        entries.append(entry)
+        # Imported legacy copies are appended after newer versions, so order by time
+        return sorted(entries, key=lambda e: e['archived_at'])
+
+    def store(self, export: str, payload: bytes, archived_at: Optional[str] = None,
+              **details: Any) -> Dict[str, Any]:
+        """Record a version of an export, writing its blob only if the content is new."""
+        sha256 = hashlib.sha256(payload).hexdigest()
+        blob_path = self.blob_path(sha256)
+        if not blob_path.exists():
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = blob_path.with_name(f".{blob_path.name}.tmp")
+            tmp_path.write_bytes(gzip.compress(payload, compresslevel=9, mtime=0))
+            tmp_path.replace(blob_path)
+
+        entry = {
+            'export': export,
+            'archived_at': archived_at or datetime.now().isoformat(timespec='seconds'),
+            'sha256': sha256,
+            'size_bytes': len(payload),
+            **details
+        }
+        self.archive_path.mkdir(parents=True, exist_ok=True)
+        with open(self.index_path, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+        return entry
+
+    def read(self, sha256: str) -> bytes:
+        """Raw export bytes for a blob."""
+        return gzip.decompress(self.blob_path(sha256).read_bytes())
+
+    def find(self, export: str, sha256: Optional[str] = None,
+             at: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Pick a version by hash prefix, or the latest one archived at or before a time."""
+        entries = self.history(export)
+        if sha256:
+            entries = [e for e in entries if e['sha256'].startswith(sha256)]
+        if at:
+            entries = [e for e in entries if e['archived_at'] <= at]
+        return entries[-1] if entries else None
+
+    def restore(self, export: str, output_path: Path, sha256: Optional[str] = None,
+                at: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Write an archived version back out, with its .gz/.br siblings and manifest entry."""
+        # export_writer imports this module
+        from export_writer import publish_export, content_hash, from_columnar
+
+        entry = self.find(export, sha256, at)
+        if entry:
+            payload = self.read(entry['sha256'])
+            # Imported legacy copies carry neither; they were written indented
+            encoding = entry.get('encoding') or ('pretty' if b'\n' in payload else 'minified')
+            digest = entry.get('content_hash') or content_hash(from_columnar(json.loads(payload)))
+            publish_export(output_path, payload, encoding, digest)
+        return entry
+
+    def import_legacy(self) -> Dict[str, int]:
+        """Fold archive/YYYY-MM/<export>_<timestamp>.json copies into the content-addressed store."""
+        recorded = {(e['export'], e['archived_at']) for e in self.history()}
+        results = {'imported': 0, 'duplicates': 0, 'skipped': 0}
+
+        for legacy_file in sorted(self.archive_path.glob('[0-9][0-9][0-9][0-9]-[0-9][0-9]/*.json')):
+            match = LEGACY_FILE_PATTERN.match(legacy_file.name)
+            if not match or match.group('export') == 'export_summary':
+                results['skipped'] += 1
+                continue
+
+            export = match.group('export')
+            archived_at = datetime.strptime(match.group('stamp'), '%Y%m%d_%H%M%S').isoformat()
+            if (export, archived_at) in recorded:
+                results['skipped'] += 1
+                continue
+
+            payload = legacy_file.read_bytes()
+            is_duplicate = self.blob_path(hashlib.sha256(payload).hexdigest()).exists()
+            self.store(export, payload, archived_at=archived_at, source=str(legacy_file.relative_to(self.archive_path)))
+            results['duplicates' if is_duplicate else 'imported'] += 1
+
+        return results
+
+
+def main():
+    """List, restore or import archived dashboard exports."""
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    default_archive = Path(__file__).parent.parent / 'archive'
+    parser = argparse.ArgumentParser(description='Content-addressed archive of dashboard exports')
+    parser.add_argument('--archive', type=str, default=str(default_archive), help='Archive directory')
+    parser.add_argument('--list', nargs='?', const='', metavar='EXPORT', help='List archived versions (optionally for one export)')
+    parser.add_argument('--restore', type=str, metavar='EXPORT', help='Restore an export (e.g. "market_overview")')
+    parser.add_argument('--hash', type=str, help='Version to restore (hash prefix)')
+    parser.add_argument('--at', type=str, help='Restore the version current at this ISO timestamp')
+    parser.add_argument('--output', type=str, help='Restore destination (default: data/<export>.json)')
+    parser.add_argument('--import-legacy', action='store_true', help='Import archive/YYYY-MM/*.json copies into the store')
+
+    args = parser.parse_args()
+    archive = ExportArchive(Path(args.archive))
+
+    if args.import_legacy:
+        results = archive.import_legacy()
+        print("\n📦 LEGACY ARCHIVE IMPORT")
+        print("="*50)
+        print(f"New versions: {results['imported']}")
+        print(f"Identical copies (deduplicated): {results['duplicates']}")
+        print(f"Skipped: {results['skipped']}")
+        return
+
+    if args.restore:
+        output_path = Path(args.output) if args.output else Path(__file__).parent.parent / 'data' / f"{args.restore}.json"
+        entry = archive.restore(args.restore, output_path, args.hash, args.at)
+        if not entry:
+            logger.error(f"❌ No archived version of {args.restore} matches")
+            sys.exit(1)
+        logger.info(f"✅ Restored {args.restore} {entry['sha256'][:12]} ({entry['archived_at']}) to {output_path}")
+        return
+
+    entries = archive.history(args.list or None)
+    print("\n📦 EXPORT ARCHIVE")
+    print("="*50)
+    for entry in entries:
+        print(f"  {entry['archived_at']}  {entry['export']:<24} {entry['sha256'][:12]}  {entry['size_bytes']:,} bytes")
+    blob_count = sum(1 for _ in archive.blob_dir.glob('*/*.json.gz')) if archive.blob_dir.exists() else 0
+    print(f"\nVersions: {len(entries)}  Unique blobs: {blob_count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Export State Tracking
+Fingerprints the source tables behind each dashboard export so unchanged exports can be skipped
+"""
+
+import sys
+import sqlite3
+import json
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parents[3] / 'data-lake'))
+from database import connect
+
+# Date column used for each source table's "latest data" marker
+TABLE_DATE_COLUMNS = {
+    'housing_city_monthly': 'date',
+    'housing_district_monthly': 'date',
+    'economic_indicators_monthly': 'date',
+    'crime_statistics_monthly': 'date',
+    'service_requests_311_monthly': 'year_month',
+    'rental_market_annual': 'year',
+    'rental_listings_snapshot': 'extraction_week',
+    'boundary_geometry': 'updated_at',
+}
+
+
+class ExportStateTracker:
+    """Track source table fingerprints for each export script."""
+
+    def __init__(self, db_path: Path, state_path: Path):
+        self.db_path = Path(db_path)
+        self.state_path = Path(state_path)
+        self.state = self._load_state()
+        self._fingerprint_cache = {}
+
+    def _load_state(self) -> Dict[str, Any]:
+        """Load previously recorded export state."""
+        if not self.state_path.exists():
+            return {'exports': {}}
+        try:
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+            state.setdefault('exports', {})
+            return state
+        except (json.JSONDecodeError, OSError):
+            # A corrupt state file just means everything gets regenerated
+            return {'exports': {}}
+
+    def save(self) -> None:
+        """Persist export state."""
+        self.state['updated_at'] = datetime.now().isoformat()
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_path, 'w') as f:
+            json.dump(self.state, f, indent=2)
+
+    @staticmethod
+    def table_fingerprint(conn: sqlite3.Connection, table: str) -> Optional[Dict[str, Any]]:
+        """Cheap fingerprint of a table: schema, row count, max rowid and latest date."""
+        cursor = conn.cursor()
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+        row = cursor.fetchone()
+        if not row:
+            return None
+
+        # WITHOUT ROWID tables (e.g. the 311 community rollup) only have a row count
+        if 'WITHOUT ROWID' in (row[0] or '').upper():
+            cursor.execute(f"SELECT COUNT(*), NULL FROM {table}")
+        else:
+            cursor.execute(f"SELECT COUNT(*), MAX(rowid) FROM {table}")
+        row_count, max_rowid = cursor.fetchone()
+
+        fingerprint = {
+            'schema': hashlib.sha1((row[0] or '').encode()).hexdigest()[:12],
+            'rows': row_count,
+            'max_rowid': max_rowid,
+        }
+
+        date_column = TABLE_DATE_COLUMNS.get(table)
+        if date_column:
+            try:
+                cursor.execute(f"SELECT MAX({date_column}) FROM {table}")
+                fingerprint['max_date'] = cursor.fetchone()[0]
+            except sqlite3.OperationalError:
+                fingerprint['max_date'] = None
+
+        return fingerprint
+
+    def fingerprint_tables(self, tables: List[str]) -> Dict[str, Any]:
+        """Fingerprint a set of tables, reusing results within this run."""
+        missing = [t for t in tables if t not in self._fingerprint_cache]
+        if missing:
+            conn = connect(self.db_path, read_only=True)
+            try:
+                for table in missing:
+                    self._fingerprint_cache[table] = self.table_fingerprint(conn, table)
+            finally:
+                conn.close()
+        return {table: self._fingerprint_cache[table] for table in tables}
+
+    def invalidate(self, tables: Optional[List[str]] = None) -> None:
+        """Drop cached fingerprints (e.g. after a load wrote to the database)."""
+        if tables is None:
+            self._fingerprint_cache.clear()
+        else:
+            for table in tables:
+                self._fingerprint_cache.pop(table, None)
+
+    def current_signature(self, script_path: Path, tables: List[str]) -> Dict[str, Any]:
+        """Everything an export's output depends on."""
+        return {
+            # Several exports use windows relative to today, so refresh at least monthly
+            'period': datetime.now().strftime('%Y-%m'),
+            'script': hashlib.sha1(Path(script_path).read_bytes()).hexdigest()[:12],
+            'tables': self.fingerprint_tables(tables),
+        }
+
+    def needs_export(self, script_path: Path, tables: List[str],
+                     output_files: List[Path]) -> Tuple[bool, str]:
+        """Decide whether an export must run, with the reason."""
+        for output_file in output_files:
+            if not Path(output_file).exists():
+                return True, f"output missing: {Path(output_file).name}"
+
+        previous = self.state['exports'].get(Path(script_path).name)
+        if not previous:
+            return True, "no previous export recorded"
+
+        current = self.current_signature(script_path, tables)
+        if previous.get('period') != current['period']:
+            return True, "new reporting period"
+        if previous.get('script') != current['script']:
+            return True, "export script changed"
+
+        changed = [t for t in tables if previous.get('tables', {}).get(t) != current['tables'][t]]
+        if changed:
+            return True, f"changed tables: {', '.join(changed)}"
+
+        return False, "inputs unchanged"
+
+    def record_export(self, script_path: Path, tables: List[str]) -> None:
+        """Record the signature an export was generated from."""
+        signature = self.current_signature(script_path, tables)
+        signature['exported_at'] = datetime.now().isoformat()
+        self.state['exports'][Path(script_path).name] = signature
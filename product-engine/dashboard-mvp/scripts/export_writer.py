@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Dashboard Export Writer
+Writes export JSON compactly with precompressed .gz/.br siblings, and records each file's
+content hash in data/manifest.json so clients can cache exports by hash.
+Unchanged exports are left untouched; changed ones are added to the export archive.
+"""
+
+import os
+import sys
+import json
+import gzip
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+import logging
+
+from export_archive import ExportArchive
+
+# Tracing spans come from the data-engine pipeline (no-ops unless a --trace run is recording)
+sys.path.insert(0, str(Path(__file__).parents[3] / 'data-engine'))
+from pipeline.tracing import span
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # .br siblings are skipped without the brotli package
+
+logger = logging.getLogger(__name__)
+
+# pretty: indented (the original format), minified: same structure without whitespace,
+# columnar: minified with lists of same-shaped objects stored as parallel arrays
+ENCODINGS = ('pretty', 'minified', 'columnar')
+DEFAULT_ENCODING = 'minified'
+
+# generate_all_exports.py passes the encoding to each generator through the environment
+ENCODING_ENV = 'DASHBOARD_EXPORT_ENCODING'
+
+MANIFEST_NAME = 'manifest.json'
+
+# Marks a columnar list: {"$columns": {"date": [...], "value": [...]}}
+COLUMNAR_KEY = '$columns'
+
+
+def get_encoding(encoding: Optional[str] = None) -> str:
+    """Resolve the export encoding (argument, then environment, then default)."""
+    encoding = encoding or os.environ.get(ENCODING_ENV) or DEFAULT_ENCODING
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown export encoding '{encoding}' (expected one of {', '.join(ENCODINGS)})")
+    return encoding
+
+
+def to_columnar(value: Any) -> Any:
+    """Convert lists of same-shaped objects into parallel arrays, recursively."""
+    if isinstance(value, dict):
+        return {key: to_columnar(item) for key, item in value.items()}
+    if isinstance(value, list):
+        items = [to_columnar(item) for item in value]
+        if len(items) > 1 and all(isinstance(item, dict) for item in items):
+            keys = list(items[0])
+            if all(list(item) == keys for item in items):
+                return {COLUMNAR_KEY: {key: [item[key] for item in items] for key in keys}}
+        return items
+    return value
+
+
+def from_columnar(value: Any) -> Any:
+    """Expand parallel arrays written by to_columnar back into lists of objects."""
+    if isinstance(value, dict):
+        if list(value) == [COLUMNAR_KEY]:
+            columns = value[COLUMNAR_KEY]
+            keys = list(columns)
+            rows = zip(*(columns[key] for key in keys))
+            return [dict(zip(keys, (from_columnar(v) for v in row))) for row in rows]
+        return {key: from_columnar(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [from_columnar(item) for item in value]
+    return value
+
+
+def encode(data: Any, encoding: str) -> bytes:
+    """Serialise export data in the requested encoding."""
+    if encoding == 'pretty':
+        return json.dumps(data, indent=2).encode()
+    if encoding == 'columnar':
+        data = to_columnar(data)
+    return json.dumps(data, separators=(',', ':')).encode()
+
+
+def content_hash(data: Any) -> str:
+    """Hash of an export's content, ignoring its generation timestamp."""
+    metadata = data.get('metadata') if isinstance(data, dict) else None
+    if isinstance(metadata, dict) and 'generated_at' in metadata:
+        data = {**data, 'metadata': {k: v for k, v in metadata.items() if k != 'generated_at'}}
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+def _write_atomic(path: Path, payload: bytes) -> None:
+    """Write via a temp file so a web server never serves a half-written export."""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, path)
+
+
+def read_manifest(data_dir: Path) -> Dict[str, Any]:
+    """Load the export manifest (empty if missing or unreadable)."""
+    manifest_path = Path(data_dir) / MANIFEST_NAME
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        manifest = {}
+    manifest.setdefault('files', {})
+    return manifest
+
+
+def update_manifest(data_dir: Path, entries: List[Dict[str, Any]]) -> None:
+    """Record file entries in the manifest, keeping entries for other exports."""
+    manifest = read_manifest(data_dir)
+    for entry in entries:
+        manifest['files'][entry['file']] = entry
+    manifest['generated_at'] = datetime.now().isoformat()
+    _write_atomic(Path(data_dir) / MANIFEST_NAME, json.dumps(manifest, indent=2).encode())
+
+
+def write_export(output_path: Path, data: Any, encoding: Optional[str] = None,
+                 archive_path: Optional[Path] = None) -> Dict[str, Any]:
+    """Write an export with compressed siblings and record it in the manifest.
+
+    If the content (ignoring metadata.generated_at) and encoding match what is already on
+    disk, nothing is written. Otherwise the new version is also stored in the archive.
+    """
+    output_path = Path(output_path)
+    with span(f"write {output_path.name}", 'export') as trace:
+        entry = _write_export(output_path, data, encoding, archive_path)
+        trace.update(bytes=entry.get('size_bytes'), unchanged=entry.get('unchanged', False))
+    return entry
+
+
+def _write_export(output_path: Path, data: Any, encoding: Optional[str],
+                  archive_path: Optional[Path]) -> Dict[str, Any]:
+    encoding = get_encoding(encoding)
+    digest = content_hash(data)
+
+    # The file hash check catches files replaced outside the writer (e.g. edited by hand)
+    previous = read_manifest(output_path.parent)['files'].get(output_path.name)
+    if (previous and output_path.exists() and previous.get('content_hash') == digest
+            and previous.get('encoding') == encoding
+            and hashlib.sha256(output_path.read_bytes()).hexdigest() == previous['sha256']):
+        logger.info(f"⏭️  {output_path.name} unchanged - keeping existing file")
+        return {**previous, 'unchanged': True}
+
+    return publish_export(output_path, encode(data, encoding), encoding, digest, archive_path)
+
+
+def publish_export(output_path: Path, payload: bytes, encoding: str, digest: str,
+                   archive_path: Optional[Path] = None) -> Dict[str, Any]:
+    """Write encoded export bytes with their compressed siblings and manifest entry.
+
+    Also used to put an archived version back (export_archive.py --restore), so the
+    siblings and manifest never describe a different version than the JSON.
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    _write_atomic(output_path, payload)
+
+    entry = {
+        'file': output_path.name,
+        'encoding': encoding,
+        'sha256': hashlib.sha256(payload).hexdigest(),
+        'content_hash': digest,
+        'size_bytes': len(payload),
+        'written_at': datetime.now().isoformat()
+    }
+
+    # mtime=0 keeps the .gz bytes stable for identical content
+    compressed = {'.gz': gzip.compress(payload, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressed['.br'] = brotli.compress(payload, quality=11)
+
+    for suffix in ('.gz', '.br'):
+        sibling = output_path.with_name(output_path.name + suffix)
+        if suffix in compressed:
+            _write_atomic(sibling, compressed[suffix])
+            entry[f"{suffix[1:]}_bytes"] = len(compressed[suffix])
+        elif sibling.exists():
+            # Never leave a stale sibling that no longer matches the JSON
+            sibling.unlink()
+
+    if archive_path:
+        ExportArchive(archive_path).store(output_path.stem, payload, encoding=encoding, content_hash=digest)
+        logger.info(f"📦 Archived {output_path.name} as {entry['sha256'][:12]}")
+
+    update_manifest(output_path.parent, [entry])
+    return entry
+
+
+def load_export(path: Path) -> Any:
+    """Read an export written in any encoding, returning the expanded structure."""
+    with open(path, 'r') as f:
+        return from_columnar(json.load(f))
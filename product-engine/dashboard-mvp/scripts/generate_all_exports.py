@@ -12,6 +12,13 @@ import logging
 import json
 from typing import Dict, List, Tuple
 
+from export_state import ExportStateTracker
+from export_writer import ENCODINGS, ENCODING_ENV, get_encoding, read_manifest
+
+# Tracing spans come from the data-engine pipeline (no-ops unless --trace is recording)
+sys.path.insert(0, str(Path(__file__).parents[3] / 'data-engine'))
+from pipeline.tracing import span, child_env, start_trace, finish_trace
+
 logging.basicConfig(
     level=logging.INFO, 
     format='%(asctime)s - %(levelname)s - %(message)s',
@@ -25,7 +32,7 @@ logger = logging.getLogger(__name__)
 class DashboardExportRunner:
     """Orchestrate all dashboard data exports."""
     
-    def __init__(self):
+    def __init__(self, encoding: str = None):
         self.script_dir = Path(__file__).parent
         self.data_dir = self.script_dir.parent / 'data'
         self.archive_dir = self.script_dir.parent / 'archive'
@@ -36,14 +43,65 @@ class DashboardExportRunner:
             ('generate_economic_indicators.py', 'Economic Indicators'),
             ('generate_district_data.py', 'District Data'),
             ('generate_rate_data.py', 'Rate Data'),
-            ('generate_metadata.py', 'Metadata'),
             # Additional data exports (optional use)
             ('generate_service_requests.py', 'Service Requests (311)'),
             ('generate_rental_market.py', 'Rental Market'),
-            ('generate_crime_statistics.py', 'Crime Statistics')
+            ('generate_crime_statistics.py', 'Crime Statistics'),
+            ('generate_boundary_tiles.py', 'Boundary Tiles'),
+            # Metadata describes the other exports, so it runs last
+            ('generate_metadata.py', 'Metadata')
         ]
         
+        # Source tables and output file for each export (used for change detection)
+        self.export_inputs = {
+            'generate_market_overview.py': {
+                'tables': ['housing_city_monthly', 'economic_indicators_monthly'],
+                'output': 'market_overview.json'
+            },
+            'generate_economic_indicators.py': {
+                'tables': ['economic_indicators_monthly'],
+                'output': 'economic_indicators.json'
+            },
+            'generate_district_data.py': {
+                'tables': ['housing_district_monthly'],
+                'output': 'district_data.json'
+            },
+            'generate_rate_data.py': {
+                'tables': ['economic_indicators_monthly', 'housing_district_monthly'],
+                'output': 'rate_data.json'
+            },
+            'generate_metadata.py': {
+                'tables': ['housing_city_monthly', 'housing_district_monthly', 'economic_indicators_monthly'],
+                'output': 'metadata.json'
+            },
+            'generate_service_requests.py': {
+                'tables': ['service_requests_311_monthly', 'service_requests_311_category_rollup',
+                           'service_requests_311_community_rollup'],
+                'output': 'service_requests_311.json'
+            },
+            'generate_rental_market.py': {
+                'tables': ['rental_market_annual', 'rental_listings_snapshot'],
+                'output': 'rental_market.json'
+            },
+            'generate_crime_statistics.py': {
+                'tables': ['crime_statistics_monthly', 'crime_community_rollup'],
+                'output': 'crime_statistics.json'
+            },
+            'generate_boundary_tiles.py': {
+                'tables': ['boundary_geometry', 'community_boundaries', 'community_sectors'],
+                'output': 'boundaries_z10.json',
+                # One file per zoom level; any missing one triggers a rebuild
+                'outputs': ['boundaries_z10.json', 'boundaries_z12.json', 'boundaries_z14.json']
+            }
+        }
+        
+        self.db_path = Path(__file__).parents[3] / 'data-lake' / 'calgary_data.db'
+        self.state_tracker = ExportStateTracker(self.db_path, self.script_dir.parent / 'export_state.json')
+        
+        self.encoding = get_encoding(encoding)
+        
         self.results = []
+        self.skipped = []
     
     def run_script(self, script_name: str, description: str) -> Tuple[bool, str]:
         """Run a single export script."""
@@ -58,12 +116,15 @@ class DashboardExportRunner:
         
         try:
             # Run the script
-            result = subprocess.run(
-                [sys.executable, str(script_path)],
-                capture_output=True,
-                text=True,
-                cwd=str(self.script_dir)
-            )
+            with span(description, 'export', script=script_name, encoding=self.encoding) as trace:
+                result = subprocess.run(
+                    [sys.executable, str(script_path)],
+                    capture_output=True,
+                    text=True,
+                    cwd=str(self.script_dir),
+                    env={**child_env(script_name), ENCODING_ENV: self.encoding}
+                )
+                trace['returncode'] = result.returncode
             
             if result.returncode == 0:
                 logger.info(f"✅ {description} completed successfully")
@@ -83,9 +144,8 @@ class DashboardExportRunner:
         logger.info("🔍 Checking prerequisites...")
         
         # Check if database exists
-        db_path = Path(__file__).parents[3] / 'data-lake' / 'calgary_data.db'
-        if not db_path.exists():
-            logger.error(f"❌ Database not found: {db_path}")
+        if not self.db_path.exists():
+            logger.error(f"❌ Database not found: {self.db_path}")
             return False
         
         # Check if all scripts exist
@@ -111,6 +171,7 @@ class DashboardExportRunner:
             'total_exports': len(self.results),
             'successful': successful,
             'failed': failed,
+            'skipped': len(self.skipped),
             'details': []
         }
         
@@ -119,6 +180,7 @@ class DashboardExportRunner:
                 'export': desc,
                 'script': script,
                 'success': success,
+                'skipped': script in self.skipped,
                 'order': i + 1
             })
         
@@ -149,8 +211,38 @@ class DashboardExportRunner:
         
         logger.info(f"📄 Summary saved to: {summary_path}")
     
-    def run_all_exports(self) -> bool:
-        """Run all export scripts in sequence."""
+    def check_for_changes(self, script_name: str, force: bool = False,
+                          upstream_ran: bool = False) -> Tuple[bool, str]:
+        """Decide whether an export needs regenerating."""
+        if force:
+            return True, "forced"
+        
+        inputs = self.export_inputs.get(script_name)
+        if not inputs:
+            return True, "no change tracking configured"
+        
+        # Metadata describes the other exports, so refresh it whenever any of them ran
+        if script_name == 'generate_metadata.py' and upstream_ran:
+            return True, "upstream exports regenerated"
+        
+        written = read_manifest(self.data_dir)['files'].get(inputs['output'])
+        if written and written.get('encoding') != self.encoding:
+            return True, f"encoding changed to {self.encoding}"
+        
+        return self.state_tracker.needs_export(
+            self.script_dir / script_name,
+            inputs['tables'],
+            [self.data_dir / output for output in inputs.get('outputs', [inputs['output']])]
+        )
+    
+    def record_export(self, script_name: str) -> None:
+        """Record the input fingerprints a successful export was built from."""
+        inputs = self.export_inputs.get(script_name)
+        if inputs:
+            self.state_tracker.record_export(self.script_dir / script_name, inputs['tables'])
+    
+    def run_all_exports(self, force: bool = False) -> bool:
+        """Run all export scripts in sequence, skipping those with unchanged inputs."""
         logger.info("="*70)
         logger.info("🎯 CALGARY HOUSING DASHBOARD - MONTHLY DATA EXPORT")
         logger.info("="*70)
@@ -162,14 +254,28 @@ class DashboardExportRunner:
             return False
         
         # Run each export script
+        any_ran = False
         for script_name, description in self.export_scripts:
+            needed, reason = self.check_for_changes(script_name, force, upstream_ran=any_ran)
+            if not needed:
+                logger.info(f"⏭️  {description} skipped ({reason})")
+                self.skipped.append(script_name)
+                self.results.append((True, reason))
+                continue
+            
+            logger.info(f"🔄 {description}: {reason}")
             success, output = self.run_script(script_name, description)
             self.results.append((success, output))
             
-            if not success and script_name != 'generate_metadata.py':
+            if success:
+                any_ran = True
+                self.record_export(script_name)
+            elif script_name != 'generate_metadata.py':
                 # Don't stop for metadata failures
                 logger.warning(f"⚠️  {description} failed, but continuing...")
         
+        self.state_tracker.save()
+        
         # Create and save summary
         summary = self.create_summary_report()
         self.save_summary(summary)
@@ -180,6 +286,7 @@ class DashboardExportRunner:
         logger.info("="*70)
         logger.info(f"Total exports: {summary['total_exports']}")
         logger.info(f"Successful: {summary['successful']}")
+        logger.info(f"Skipped (unchanged): {summary['skipped']}")
         logger.info(f"Failed: {summary['failed']}")
         
         if summary['generated_files']:
@@ -213,6 +320,8 @@ class DashboardExportRunner:
         
         if success:
             logger.info(f"✅ {description} completed successfully")
+            self.record_export(script_name)
+            self.state_tracker.save()
         
         return success
 
@@ -231,27 +340,55 @@ def main():
         action='store_true',
         help='Show what would be run without executing'
     )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Regenerate all exports even if their source tables are unchanged'
+    )
+    parser.add_argument(
+        '--encoding',
+        choices=ENCODINGS,
+        help='JSON encoding for exports (default: minified; columnar stores time series as parallel arrays)'
+    )
+    parser.add_argument(
+        '--trace',
+        type=Path,
+        metavar='OUT.json',
+        help='Write a Chrome trace of the run, including each generator subprocess'
+    )
     
     args = parser.parse_args()
     
-    runner = DashboardExportRunner()
+    runner = DashboardExportRunner(encoding=args.encoding)
     
     if args.dry_run:
         print("🔍 DRY RUN - Exports that would be generated:")
+        upstream_ran = False
         for script_name, description in runner.export_scripts:
-            print(f"  - {description} ({script_name})")
+            if runner.db_path.exists():
+                needed, reason = runner.check_for_changes(script_name, args.force, upstream_ran)
+            else:
+                needed, reason = True, "database not found"
+            upstream_ran = upstream_ran or needed
+            status = "run" if needed else "skip"
+            print(f"  - [{status}] {description} ({script_name}) - {reason}")
         print(f"\n📂 Output directory: {runner.data_dir}")
         print(f"📦 Archive directory: {runner.archive_dir}")
         return
     
-    if args.single:
-        # Run single export
-        success = runner.run_single_export(args.single)
-        sys.exit(0 if success else 1)
-    else:
-        # Run all exports
-        success = runner.run_all_exports()
-        sys.exit(0 if success else 1)
+    tracing = start_trace('generate_all_exports') if args.trace else False
+    try:
+        if args.single:
+            # Run single export
+            success = runner.run_single_export(args.single)
+        else:
+            # Run all exports
+            success = runner.run_all_exports(force=args.force)
+    finally:
+        if tracing:
+            events = finish_trace(args.trace)
+            logger.info(f"🔬 Trace with {events:,} events written to {args.trace}")
+    sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Generate Boundary Tiles for Calgary Housing Dashboard
+Outputs boundaries_z<zoom>.json: TopoJSON community and sector outlines simplified for
+each map zoom level. Borders shared by neighbouring communities are stored once as arcs
+and simplified once, so simplified neighbours never gap or overlap.
+"""
+
+import sys
+import math
+import sqlite3
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Any, Tuple
+import logging
+
+import numpy as np
+
+from export_writer import write_export
+
+# Packed boundary geometry lives with the schema in data-lake/
+sys.path.insert(0, str(Path(__file__).parents[3] / 'data-lake'))
+from geometry import unpack_wkb
+from database import connect
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Boundary layers exported as TopoJSON objects, with the properties carried for each feature
+TILE_LAYERS = {
+    'communities': {
+        'layer': 'community_boundaries',
+        'properties': """
+            SELECT community_code, name, community_sector, community_class, res_units
+            FROM community_boundaries
+        """,
+        'columns': ['name', 'sector', 'class', 'res_units']
+    },
+    'sectors': {
+        'layer': 'community_sectors',
+        'properties': "SELECT code, name FROM community_sectors",
+        'columns': ['name']
+    }
+}
+
+# Zoom levels to export; each drops detail smaller than one screen pixel at that zoom
+ZOOM_LEVELS = [10, 12, 14]
+TILE_SIZE = 256
+
+# Coordinates are snapped to this grid (about 0.1 m) so shared borders match exactly
+QUANTUM_DEGREES = 1e-6
+
+
+def pixel_degrees(zoom: int) -> float:
+    """Longitude span of one Web Mercator pixel at a zoom level."""
+    return 360 / (TILE_SIZE * 2 ** zoom)
+
+
+def simplification_weights(points: np.ndarray) -> np.ndarray:
+    """Douglas-Peucker significance of each vertex of an arc.
+
+    Simplifying to tolerance t keeps exactly the vertices with weight >= t, so one pass
+    serves every zoom level. Endpoints are always kept.
+    """
+    weights = np.zeros(len(points))
+    weights[0] = weights[-1] = np.inf
+    stack = [(0, len(points) - 1, np.inf)]
+    while stack:
+        start, end, cap = stack.pop()
+        if end - start < 2:
+            continue
+        segment = points[end] - points[start]
+        offsets = points[start + 1:end] - points[start]
+        length = math.hypot(segment[0], segment[1])
+        if length == 0:
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        else:
+            distances = np.abs(segment[0] * offsets[:, 1] - segment[1] * offsets[:, 0]) / length
+        index = int(np.argmax(distances))
+        # A vertex can't outlast the vertex that split its parent segment
+        weight = min(float(distances[index]), cap)
+        weights[start + 1 + index] = weight
+        stack.append((start, start + 1 + index, weight))
+        stack.append((start + 1 + index, end, weight))
+    return weights
+
+
+class BoundaryTilesGenerator:
+    """Generate multi-resolution TopoJSON boundaries for dashboard maps."""
+
+    def __init__(self):
+        self.db_path = Path(__file__).parents[3] / 'data-lake' / 'calgary_data.db'
+        self.output_dir = Path(__file__).parent.parent / 'data'
+        self.zoom_levels = ZOOM_LEVELS
+
+    def connect_db(self) -> sqlite3.Connection:
+        """Connect to the Calgary data database."""
+        return connect(self.db_path, read_only=True)
+
+    def get_features(self, conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+        """Boundary features with their rings and display properties."""
+        features = []
+        cursor = conn.cursor()
+        for object_name, config in TILE_LAYERS.items():
+            try:
+                cursor.execute(config['properties'])
+                properties = {row[0]: dict(zip(config['columns'], row[1:])) for row in cursor.fetchall()}
+            except sqlite3.OperationalError:
+                properties = {}
+
+            cursor.execute("SELECT code, geometry FROM boundary_geometry WHERE layer = ? ORDER BY code",
+                           (config['layer'],))
+            for code, blob in cursor.fetchall():
+                features.append({
+                    'object': object_name,
+                    'code': code,
+                    'properties': properties.get(code, {}),
+                    'polygons': unpack_wkb(blob)
+                })
+        return features
+
+    def quantize(self, features: List[Dict[str, Any]]) -> Tuple[np.ndarray, List[List[List[List[Tuple[int, int]]]]]]:
+        """Snap every ring to the integer grid, returning the origin and rings as point tuples."""
+        origin = np.min([ring.min(axis=0) for f in features for polygon in f['polygons'] for ring in polygon], axis=0)
+        quantized = []
+        for feature in features:
+            polygons = []
+            for polygon in feature['polygons']:
+                rings = []
+                for ring in polygon:
+                    grid = np.round((ring - origin) / QUANTUM_DEGREES).astype(np.int64)
+                    # Drop repeated vertices, then make sure the ring is closed
+                    keep = np.ones(len(grid), dtype=bool)
+                    keep[1:] = np.any(grid[1:] != grid[:-1], axis=1)
+                    points = [tuple(p) for p in grid[keep].tolist()]
+                    if points[0] != points[-1]:
+                        points.append(points[0])
+                    if len(points) >= 4:
+                        rings.append(points)
+                if rings:
+                    polygons.append(rings)
+            quantized.append(polygons)
+        return origin, quantized
+
+    def build_topology(self, quantized: List) -> Tuple[List[List[Tuple[int, int]]], List]:
+        """Cut rings into arcs at the vertices where neighbouring features change.
+
+        Returns the distinct arcs and, per feature, its polygons as lists of arc references
+        (TopoJSON style: ~i means arc i reversed).
+        """
+        # Which features use each undirected edge
+        edge_owners = {}
+        for feature_index, polygons in enumerate(quantized):
+            for rings in polygons:
+                for ring in rings:
+                    for a, b in zip(ring, ring[1:]):
+                        edge_owners.setdefault((a, b) if a < b else (b, a), set()).add(feature_index)
+
+        def owners(a, b):
+            return frozenset(edge_owners[(a, b) if a < b else (b, a)])
+
+        arcs = []
+        arc_index = {}
+
+        def add_arc(points: List[Tuple[int, int]]) -> int:
+            key = tuple(points)
+            if key in arc_index:
+                return arc_index[key]
+            reverse = key[::-1]
+            if reverse in arc_index:
+                return ~arc_index[reverse]
+            arc_index[key] = len(arcs)
+            arcs.append(points)
+            return arc_index[key]
+
+        topology = []
+        for polygons in quantized:
+            feature_polygons = []
+            for rings in polygons:
+                ring_refs = []
+                for ring in rings:
+                    vertices = ring[:-1]
+                    count = len(vertices)
+                    junctions = [i for i in range(count)
+                                 if owners(vertices[i - 1], vertices[i]) != owners(vertices[i], vertices[(i + 1) % count])]
+
+                    if not junctions:
+                        # One closed arc: start at the smallest vertex so a shared ring matches either way round
+                        start = vertices.index(min(vertices))
+                        rotated = vertices[start:] + vertices[:start]
+                        forward = rotated + [rotated[0]]
+                        backward = [rotated[0]] + rotated[:0:-1] + [rotated[0]]
+                        ring_refs.append([add_arc(forward) if forward <= backward else ~add_arc(backward)])
+                        continue
+
+                    refs = []
+                    for position, start in enumerate(junctions):
+                        end = junctions[(position + 1) % len(junctions)]
+                        if end <= start:
+                            end += count
+                        refs.append(add_arc([vertices[i % count] for i in range(start, end + 1)]))
+                    ring_refs.append(refs)
+                feature_polygons.append(ring_refs)
+            topology.append(feature_polygons)
+
+        return arcs, topology
+
+    def arc_weights(self, arcs: List[List[Tuple[int, int]]], origin: np.ndarray) -> List[np.ndarray]:
+        """Simplification weights per arc, measured in degrees of latitude."""
+        # Scale longitude so distances match on screen at Calgary's latitude
+        lon_scale = math.cos(math.radians(origin[1]))
+        weights = []
+        for arc in arcs:
+            points = np.asarray(arc, dtype=float) * QUANTUM_DEGREES
+            points[:, 0] *= lon_scale
+            arc_weights = simplification_weights(points)
+            if arc[0] == arc[-1] and len(arc) > 4:
+                # A closed arc is a whole ring: keep at least a triangle
+                interior = np.argsort(arc_weights[1:-1])[-2:] + 1
+                arc_weights[interior] = np.inf
+            weights.append(arc_weights)
+        return weights
+
+    def encode_arcs(self, arcs: List, weights: List[np.ndarray], tolerance: float,
+                    step: int) -> Tuple[List[List[List[int]]], int]:
+        """Simplify, coarsen to the zoom's grid and delta-encode every arc."""
+        encoded = []
+        kept = 0
+        for arc, arc_weights in zip(arcs, weights):
+            points = np.asarray(arc, dtype=np.int64)[arc_weights >= tolerance]
+            points = np.round(points / step).astype(np.int64)
+
+            keep = np.ones(len(points), dtype=bool)
+            keep[1:] = np.any(points[1:] != points[:-1], axis=1)
+            keep[-1] = True
+            points = points[keep]
+
+            deltas = np.vstack([points[:1], np.diff(points, axis=0)])
+            encoded.append(deltas.tolist())
+            kept += len(points)
+        return encoded, kept
+
+    def build_tile(self, features: List[Dict[str, Any]], topology: List, arcs: List,
+                   weights: List[np.ndarray], origin: np.ndarray, zoom: int) -> Dict[str, Any]:
+        """TopoJSON topology for one zoom level."""
+        tolerance = pixel_degrees(zoom) * math.cos(math.radians(origin[1]))
+        # Quantise no finer than a quarter pixel
+        step = max(1, int(pixel_degrees(zoom) / 4 / QUANTUM_DEGREES))
+        encoded, kept = self.encode_arcs(arcs, weights, tolerance, step)
+
+        objects = {name: {'type': 'GeometryCollection', 'geometries': []} for name in TILE_LAYERS}
+        for feature, polygons in zip(features, topology):
+            if polygons:
+                objects[feature['object']]['geometries'].append({
+                    'type': 'MultiPolygon',
+                    'id': feature['code'],
+                    'properties': feature['properties'],
+                    'arcs': polygons
+                })
+
+        return {
+            'metadata': {
+                'generated_at': datetime.now().isoformat(),
+                'version': '1.0',
+                'format': 'TopoJSON',
+                'zoom': zoom,
+                'tolerance_degrees': round(tolerance, 8),
+                'source_vertices': sum(len(arc) for arc in arcs),
+                'vertices': kept,
+                'note': 'Decode with topojson-client feature(); geometry ids are community / sector codes'
+            },
+            'type': 'Topology',
+            'transform': {
+                'scale': [round(QUANTUM_DEGREES * step, 9)] * 2,
+                'translate': [float(origin[0]), float(origin[1])]
+            },
+            'objects': objects,
+            'arcs': encoded
+        }
+
+    def empty_tile(self, zoom: int) -> Dict[str, Any]:
+        """TopoJSON topology with no geometries, for a database without packed boundaries."""
+        return {
+            'metadata': {
+                'generated_at': datetime.now().isoformat(),
+                'version': '1.0',
+                'format': 'TopoJSON',
+                'zoom': zoom,
+                'source_vertices': 0,
+                'vertices': 0,
+                'note': 'No packed boundaries in boundary_geometry yet'
+            },
+            'type': 'Topology',
+            'objects': {name: {'type': 'GeometryCollection', 'geometries': []} for name in TILE_LAYERS},
+            'arcs': []
+        }
+
+    def generate(self) -> None:
+        """Generate boundary tiles for every zoom level."""
+        try:
+            conn = self.connect_db()
+            features = self.get_features(conn)
+            conn.close()
+
+            if not features:
+                # Empty tiles still count as the export's output, so unchanged runs skip it
+                logger.warning("⚠️  No packed boundaries in boundary_geometry - load boundary files or run data-lake/geometry.py")
+                for zoom in self.zoom_levels:
+                    write_export(self.output_dir / f"boundaries_z{zoom}.json", self.empty_tile(zoom))
+                logger.info(f"✅ Empty boundary tiles written to {self.output_dir}")
+                return
+
+            origin, quantized = self.quantize(features)
+            arcs, topology = self.build_topology(quantized)
+            weights = self.arc_weights(arcs, origin)
+            shared = sum(1 for count in np.bincount(
+                [ref if ref >= 0 else ~ref for polygons in topology for rings in polygons
+                 for refs in rings for ref in refs], minlength=len(arcs)) if count > 1)
+
+            print("\n🗺️  BOUNDARY TILES EXPORT SUMMARY")
+            print("="*50)
+            print(f"Features: {len(features)}")
+            print(f"Arcs: {len(arcs):,} ({shared:,} shared between features)")
+
+            for zoom in self.zoom_levels:
+                tile = self.build_tile(features, topology, arcs, weights, origin, zoom)
+                output_path = self.output_dir / f"boundaries_z{zoom}.json"
+                entry = write_export(output_path, tile)
+                size = entry['gz_bytes'] if 'gz_bytes' in entry else entry['size_bytes']
+                print(f"  z{zoom}: {tile['metadata']['vertices']:,} of {tile['metadata']['source_vertices']:,} vertices, "
+                      f"{size / 1024:.1f} KB gzipped")
+
+            logger.info(f"✅ Boundary tiles generated in {self.output_dir}")
+
+        except Exception as e:
+            logger.error(f"❌ Error generating boundary tiles: {e}")
+            raise
+
+def main():
+    """Generate boundary tile exports."""
+    generator = BoundaryTilesGenerator()
+    generator.generate()
+
+if __name__ == "__main__":
+    main()
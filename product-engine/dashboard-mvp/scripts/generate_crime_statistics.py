@@ -4,26 +4,61 @@ Generate Crime Statistics JSON for Calgary Housing Dashboard
 Outputs crime_statistics.json with community safety indicators
 """
 
-import json
+import sys
 import sqlite3
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any
 import logging
 
+from export_writer import write_export
+
+# Tuned, read-only connections come from data-lake/
+sys.path.insert(0, str(Path(__file__).parents[3] / 'data-lake'))
+from database import connect
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Same shape as crime_community_rollup, aggregated on the fly for databases that
+# haven't run data-lake/migrations/006_crime_community_rollup.sql yet
+CRIME_ROLLUP_FALLBACK = """(
+    SELECT 
+        c.community,
+        c.year,
+        c.crime_category,
+        SUM(c.incident_count) as incident_count,
+        (SELECT COUNT(DISTINCT strftime('%Y-%m', m.date))
+         FROM crime_statistics_monthly m
+         WHERE m.community = c.community AND m.year = c.year) as community_months
+    FROM crime_statistics_monthly c
+    WHERE c.community IS NOT NULL AND c.year IS NOT NULL
+    GROUP BY c.community, c.year, c.crime_category
+)"""
+
 class CrimeStatisticsGenerator:
     """Generate crime statistics data for dashboard."""
     
     def __init__(self):
         self.db_path = Path(__file__).parents[3] / 'data-lake' / 'calgary_data.db'
         self.output_path = Path(__file__).parent.parent / 'data' / 'crime_statistics.json'
+        self._rollup_source = None
         
     def connect_db(self) -> sqlite3.Connection:
         """Connect to the Calgary data database."""
-        return sqlite3.connect(self.db_path)
+        return connect(self.db_path, read_only=True)
+    
+    def get_rollup_source(self, conn: sqlite3.Connection) -> str:
+        """Per community × year × category totals: the rollup table if it exists."""
+        if self._rollup_source is None:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'crime_community_rollup'")
+            if cursor.fetchone():
+                self._rollup_source = 'crime_community_rollup'
+            else:
+                logger.warning("⚠️  crime_community_rollup not found - aggregating crime_statistics_monthly (run data-lake/migrate.py)")
+                self._rollup_source = CRIME_ROLLUP_FALLBACK
+        return self._rollup_source
     
     def get_crime_trends(self, conn: sqlite3.Connection) -> Dict[str, List]:
         """Get crime trends by category over time."""
@@ -32,11 +67,11 @@ class CrimeStatisticsGenerator:
             year,
             crime_category,
             SUM(incident_count) as total_incidents
-        FROM crime_statistics_monthly
+        FROM {rollup}
         WHERE year >= 2020
         GROUP BY year, crime_category
         ORDER BY year DESC, crime_category
-        """
+        """.format(rollup=self.get_rollup_source(conn))
         
         cursor = conn.cursor()
         cursor.execute(query)
@@ -59,7 +94,7 @@ class CrimeStatisticsGenerator:
     
     def get_community_safety_scores(self, conn: sqlite3.Connection) -> Dict[str, Any]:
         """Calculate community safety scores."""
-        # Get recent crime data by community
+        # Get recent crime data by community (pre-aggregated per community × year × category)
         query = """
         WITH community_crime AS (
             SELECT 
@@ -70,7 +105,7 @@ class CrimeStatisticsGenerator:
                     THEN incident_count ELSE 0 END) as violent_crimes,
                 SUM(CASE WHEN crime_category IN ('Property', 'Theft', 'Break and Enter') 
                     THEN incident_count ELSE 0 END) as property_crimes
-            FROM crime_statistics_monthly
+            FROM {rollup}
             WHERE year >= 2023
             AND community != 'UNKNOWN'
             GROUP BY community
@@ -97,7 +132,7 @@ class CrimeStatisticsGenerator:
         FROM community_crime cc
         CROSS JOIN community_stats cs
         ORDER BY safety_score DESC
-        """
+        """.format(rollup=self.get_rollup_source(conn))
         
         cursor = conn.cursor()
         cursor.execute(query)
@@ -147,18 +182,27 @@ class CrimeStatisticsGenerator:
     
     def get_safest_neighborhoods(self, conn: sqlite3.Connection, limit: int = 10) -> List[Dict[str, Any]]:
         """Get safest neighborhoods based on crime data."""
+        # community_months repeats on each category row, so take it once per community-year
         query = """
+        WITH community_years AS (
+            SELECT 
+                community,
+                SUM(incident_count) as incidents,
+                MAX(community_months) as months
+            FROM {rollup}
+            WHERE year >= 2023
+            AND community != 'UNKNOWN'
+            GROUP BY community, year
+        )
         SELECT 
             community,
-            SUM(incident_count) as total_incidents,
-            ROUND(SUM(incident_count) * 1.0 / COUNT(DISTINCT strftime('%Y-%m', date)), 1) as avg_monthly
-        FROM crime_statistics_monthly
-        WHERE year >= 2023
-        AND community != 'UNKNOWN'
+            SUM(incidents) as total_incidents,
+            ROUND(SUM(incidents) * 1.0 / SUM(months), 1) as avg_monthly
+        FROM community_years
         GROUP BY community
         ORDER BY total_incidents ASC
         LIMIT ?
-        """
+        """.format(rollup=self.get_rollup_source(conn))
         
         cursor = conn.cursor()
         cursor.execute(query, (limit,))
@@ -181,7 +225,7 @@ class CrimeStatisticsGenerator:
             SELECT 
                 year,
                 SUM(incident_count) as total_incidents
-            FROM crime_statistics_monthly
+            FROM {rollup}
             WHERE year IN (2023, 2024)
             GROUP BY year
         )
@@ -190,7 +234,7 @@ class CrimeStatisticsGenerator:
             total_incidents
         FROM yearly_totals
         ORDER BY year
-        """
+        """.format(rollup=self.get_rollup_source(conn))
         
         cursor = conn.cursor()
         cursor.execute(query)
@@ -248,7 +292,7 @@ class CrimeStatisticsGenerator:
             safest = self.get_safest_neighborhoods(conn)
             yoy = self.get_year_over_year_change(conn)
             
-            # Get summary stats
+            # Get summary stats (the rollup has the same totals per community x year x category)
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT 
@@ -257,7 +301,7 @@ class CrimeStatisticsGenerator:
                     SUM(incident_count) as total_incidents,
                     MIN(year) as first_year,
                     MAX(year) as last_year
-                FROM crime_statistics_monthly
+                FROM crime_community_rollup
                 WHERE community != 'UNKNOWN'
             """)
             communities, cat_count, total, first_year, last_year = cursor.fetchone()
@@ -289,9 +333,7 @@ class CrimeStatisticsGenerator:
             }
             
             # Save the file
-            self.output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.output_path, 'w') as f:
-                json.dump(output, f, indent=2)
+            write_export(self.output_path, output)
                 
             logger.info(f"✅ Crime statistics data generated: {self.output_path}")
             
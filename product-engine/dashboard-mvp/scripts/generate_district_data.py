@@ -4,13 +4,19 @@ Generate District Data JSON for Calgary Housing Dashboard MVP
 Outputs district_data.json with pricing and trends by district and property type
 """
 
-import json
+import sys
 import sqlite3
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 import logging
 
+from export_writer import write_export
+
+# Tuned, read-only connections come from data-lake/
+sys.path.insert(0, str(Path(__file__).parents[3] / 'data-lake'))
+from database import connect
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -39,7 +45,7 @@ class DistrictDataGenerator:
     
     def connect_db(self) -> sqlite3.Connection:
         """Connect to the Calgary data database."""
-        return sqlite3.connect(self.db_path)
+        return connect(self.db_path, read_only=True)
     
     def get_latest_district_data(self, conn: sqlite3.Connection) -> Dict[str, Any]:
         """Get the latest month's data for all districts."""
@@ -93,40 +99,49 @@ class DistrictDataGenerator:
         
         return district_data, latest_date
     
-    def get_district_history(self, conn: sqlite3.Connection, district: str, 
-                           months: int = 24) -> Dict[str, List]:
-        """Get historical data for a specific district."""
+    def query_district_histories(self, conn: sqlite3.Connection, months: int = 24,
+                                 district: Optional[str] = None) -> Dict[str, Dict[str, List]]:
+        """Get the last N months per district and property type in a single query."""
+        # Window per (district, property_type) so series with gaps or extra
+        # property types are neither truncated nor over-fetched.
+        # Served by idx_district_type_date (district, property_type, date).
         query = """
-        SELECT 
-            date,
-            property_type,
-            benchmark_price
-        FROM housing_district_monthly
-        WHERE district = ?
-        ORDER BY date DESC, property_type
-        LIMIT ?
+        SELECT district, property_type, date, benchmark_price
+        FROM (
+            SELECT 
+                district,
+                property_type,
+                date,
+                benchmark_price,
+                ROW_NUMBER() OVER (
+                    PARTITION BY district, property_type
+                    ORDER BY date DESC
+                ) AS rn
+            FROM housing_district_monthly
+            WHERE (? IS NULL OR district = ?)
+        )
+        WHERE rn <= ?
+        ORDER BY district, property_type, date
         """
         
         cursor = conn.cursor()
-        cursor.execute(query, (district, months * 4))  # 4 property types
-        results = cursor.fetchall()
+        cursor.execute(query, (district, district, months))
         
-        # Organize by property type
-        history = {}
-        for date, prop_type, price in results:
+        # Organize by district and property type (rows arrive date ascending for charts)
+        histories = {}
+        for district_name, prop_type, date, price in cursor.fetchall():
             display_type = self.property_type_display.get(prop_type, prop_type)
-            if display_type not in history:
-                history[display_type] = []
-            history[display_type].append({
+            histories.setdefault(district_name, {}).setdefault(display_type, []).append({
                 'date': date,
                 'price': price
             })
         
-        # Sort each by date ascending for charts
-        for prop_type in history:
-            history[prop_type].sort(key=lambda x: x['date'])
-            
-        return history
+        return histories
+    
+    def get_district_history(self, conn: sqlite3.Connection, district: str, 
+                           months: int = 24) -> Dict[str, List]:
+        """Get historical data for a specific district."""
+        return self.query_district_histories(conn, months, district).get(district, {})
     
     def calculate_district_averages(self, district_data: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate average prices and YoY changes by district."""
@@ -258,19 +273,10 @@ class DistrictDataGenerator:
         
         return best_value
     
-    def get_all_district_histories(self, conn: sqlite3.Connection) -> Dict[str, Any]:
+    def get_all_district_histories(self, conn: sqlite3.Connection, 
+                                   months: int = 24) -> Dict[str, Any]:
         """Get historical data for all districts."""
-        histories = {}
-        
-        # Get list of all districts
-        cursor = conn.cursor()
-        cursor.execute("SELECT DISTINCT district FROM housing_district_monthly")
-        districts = [row[0] for row in cursor.fetchall()]
-        
-        for district in districts:
-            histories[district] = self.get_district_history(conn, district)
-        
-        return histories
+        return self.query_district_histories(conn, months)
     
     def calculate_district_rankings(self, averages: Dict[str, Any]) -> List[Tuple[str, float]]:
         """Rank districts by YoY appreciation."""
@@ -336,18 +342,8 @@ class DistrictDataGenerator:
                 }
             }
             
-            # Archive previous version if exists
-            if self.output_path.exists():
-                archive_dir = self.archive_path / datetime.now().strftime('%Y-%m')
-                archive_dir.mkdir(parents=True, exist_ok=True)
-                archive_file = archive_dir / f"district_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                self.output_path.rename(archive_file)
-                logger.info(f"📦 Archived previous version to {archive_file}")
-            
-            # Save the new file
-            self.output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.output_path, 'w') as f:
-                json.dump(output, f, indent=2)
+            # Save the new file (skipped if unchanged; new versions go to the archive)
+            write_export(self.output_path, output, archive_path=self.archive_path)
                 
             logger.info(f"✅ District data generated: {self.output_path}")
             
@@ -4,13 +4,20 @@ Generate Economic Indicators JSON for Calgary Housing Dashboard MVP
 Outputs economic_indicators.json with all economic metrics and trends
 """
 
-import json
+import sys
 import sqlite3
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 import logging
 
+from export_writer import write_export
+from indicator_lookup import indicator_keys
+
+# Tuned, read-only connections come from data-lake/
+sys.path.insert(0, str(Path(__file__).parents[3] / 'data-lake'))
+from database import connect
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -22,164 +29,173 @@ class EconomicIndicatorsGenerator:
         self.output_path = Path(__file__).parent.parent / 'data' / 'economic_indicators.json'
         self.archive_path = Path(__file__).parent.parent / 'archive'
         
-        # Map database indicator names to clean display names
+        # Map database indicator types to clean display names
         self.indicator_mappings = {
             'employment': {
-                'db_pattern': 'Employment - CER%',
+                'indicator_type': 'employment',
                 'display_name': 'Employment (Calgary Economic Region)',
                 'unit': 'thousands',
                 'category': 'labour_market'
             },
             'avg_hourly_wage_calgary': {
-                'db_pattern': 'avg_hourly_wage_calgary',
+                'indicator_type': 'avg_hourly_wage_calgary',
                 'display_name': 'Avg Hourly Wage Growth (Calgary)',
                 'unit': 'percent',
                 'category': 'labour_market',
                 'is_yoy_change': True
             },
             'unemployment_rate': {
-                'db_pattern': 'Unemployment Rate - Calgary Economic Region%',
+                'indicator_type': 'unemployment_rate',
                 'display_name': 'Unemployment Rate',
                 'unit': 'percent',
                 'category': 'labour_market'
             },
             'unemployment_rate_canada': {
-                'db_pattern': 'Unemployment Rate - Canada%',
+                'indicator_type': 'unemployment_rate_canada',
                 'display_name': 'Unemployment Rate (Canada)',
                 'unit': 'percent',
                 'category': 'labour_market'
             },
             'population': {
-                'db_pattern': 'City of Calgary Population%',
+                'indicator_type': 'population',
                 'display_name': 'Calgary Population',
                 'unit': 'thousands',
                 'category': 'demographics'
             },
             'inflation_calgary': {
-                'db_pattern': 'Inflation Rate - Calgary CMA%',
+                'indicator_type': 'inflation_rate_calgary',
                 'display_name': 'Inflation Rate (Calgary)',
                 'unit': 'percent',
                 'category': 'prices'
             },
             'inflation_canada': {
-                'db_pattern': 'Inflation Rate - Canada%',
+                'indicator_type': 'inflation_rate_canada',
                 'display_name': 'Inflation Rate (Canada)',
                 'unit': 'percent',
                 'category': 'prices'
             },
             'oil_price': {
-                'db_pattern': 'West Texas Intermediate%',
+                'indicator_type': 'oil_price_wti',
                 'display_name': 'Oil Price (WTI)',
                 'unit': 'USD/barrel',
                 'category': 'energy'
             },
             'natural_gas': {
-                'db_pattern': 'Alberta Natural Gas%',
+                'indicator_type': 'natural_gas_price',
                 'display_name': 'Natural Gas Price',
                 'unit': 'CAD/GJ',
                 'category': 'energy'
             },
             'housing_starts': {
-                'db_pattern': 'Housing Starts - Calgary%',
+                'indicator_type': 'housing_starts',
                 'display_name': 'Housing Starts',
                 'unit': 'units',
                 'category': 'construction'
             },
             'building_permits': {
-                'db_pattern': 'City of Calgary Total Value of Building Permits%',
+                'indicator_type': 'building_permits_value',
                 'display_name': 'Building Permits Value',
                 'unit': 'millions',
                 'category': 'construction'
             },
             'retail_sales': {
-                'db_pattern': 'Retail Sales - Alberta%',
+                'indicator_type': 'retail_sales_alberta',
                 'display_name': 'Retail Sales (Alberta)',
                 'unit': 'billions',
                 'category': 'consumer'
             },
             'bankruptcies': {
-                'db_pattern': 'Number of Personal Bankruptcies%',
+                'indicator_type': 'bankruptcies_personal',
                 'display_name': 'Personal Bankruptcies (Alberta)',
                 'unit': 'count',
                 'category': 'financial_stress'
             },
             'gdp_growth': {
-                'db_pattern': "Canada's Real GDP growth%",
+                'indicator_type': 'gdp_growth_canada',
                 'display_name': 'GDP Growth (Canada)',
                 'unit': 'percent',
                 'category': 'economy'
             },
             'ei_beneficiaries_calgary': {
-                'db_pattern': 'Employment insurance Calgary%',
+                'indicator_type': 'ei_recipients_calgary',
                 'display_name': 'EI Recipients (Calgary)',
                 'unit': 'persons',
                 'category': 'labour_market'
             },
             'ei_beneficiaries_alberta': {
-                'db_pattern': 'Employment insurance Alberta%',
+                'indicator_type': 'ei_recipients_alberta',
                 'display_name': 'EI Recipients (Alberta)',
                 'unit': 'persons',
                 'category': 'labour_market'
             },
             'housing_starts_calgary': {
-                'db_pattern': 'housing_starts',
+                'indicator_type': 'housing_starts',
                 'display_name': 'Housing Starts (Calgary CMA)',
                 'unit': 'units',
-                'category': 'construction',
-                'is_exact_match': True
+                'category': 'construction'
             }
         }
     
     def connect_db(self) -> sqlite3.Connection:
         """Connect to the Calgary data database."""
-        return sqlite3.connect(self.db_path)
+        return connect(self.db_path, read_only=True)
     
-    def get_indicator_data(self, conn: sqlite3.Connection, indicator_key: str, 
-                          months: int = 24) -> Optional[Dict[str, Any]]:
-        """Get data for a specific indicator."""
-        mapping = self.indicator_mappings.get(indicator_key)
-        if not mapping:
-            return None
-            
-        # Use indicator_type for exact matches (like wage data)
-        if mapping.get('is_yoy_change') or mapping.get('is_exact_match') or '%' not in mapping['db_pattern']:
-            query = """
-            SELECT date, value
-            FROM economic_indicators_monthly
-            WHERE indicator_type = ?
-            ORDER BY date DESC
-            LIMIT ?
-            """
-        else:
-            query = """
-            SELECT date, value
+    def query_indicator_series(self, conn: sqlite3.Connection, indicator_types: List[str],
+                               months: int = 24) -> Dict[str, List[tuple]]:
+        """Fetch the last N months for several indicator types in one windowed query.
+
+        Each row is (date, value, previous_value, year_ago_value), newest first. A month
+        stored under several indicator names counts once, using the most recently loaded row.
+        """
+        column, keys = indicator_keys(conn, indicator_types)
+        if not keys:
+            return {}
+
+        placeholders = ', '.join('?' for _ in keys)
+        query = f"""
+        WITH observations AS (
+            SELECT
+                {column} AS indicator_key,
+                date,
+                value,
+                ROW_NUMBER() OVER (PARTITION BY {column}, date ORDER BY id DESC) AS version
             FROM economic_indicators_monthly
-            WHERE indicator_name LIKE ?
-            ORDER BY date DESC
-            LIMIT ?
-            """
-        
+            WHERE {column} IN ({placeholders})
+        ),
+        ranked AS (
+            SELECT
+                indicator_key,
+                date,
+                value,
+                ROW_NUMBER() OVER w AS rn,
+                LEAD(value, 1) OVER w AS previous_value,
+                LEAD(value, 12) OVER w AS year_ago_value
+            FROM observations
+            WHERE version = 1
+            WINDOW w AS (PARTITION BY indicator_key ORDER BY date DESC)
+        )
+        SELECT indicator_key, date, value, previous_value, year_ago_value
+        FROM ranked
+        WHERE rn <= ?
+        ORDER BY indicator_key, rn
+        """
+
         cursor = conn.cursor()
-        cursor.execute(query, (mapping['db_pattern'], months))
-        results = cursor.fetchall()
-        
-        if not results:
-            logger.warning(f"No data found for {indicator_key}")
-            return None
-        
-        # Get current value and history
-        current_value = results[0][1]
-        
-        # Build time series
-        time_series = []
-        for date, value in results:
-            time_series.append({
-                'date': date,
-                'value': value
-            })
-        
+        cursor.execute(query, (*keys.values(), months))
+
+        types_by_key = {key: indicator_type for indicator_type, key in keys.items()}
+        series = {}
+        for key, date, value, previous_value, year_ago_value in cursor.fetchall():
+            series.setdefault(types_by_key[key], []).append((date, value, previous_value, year_ago_value))
+        return series
+
+    def build_indicator(self, indicator_key: str, results: List[tuple]) -> Dict[str, Any]:
+        """Build an indicator entry from its windowed rows (newest first)."""
+        mapping = self.indicator_mappings[indicator_key]
+        last_updated, current_value, last_month_value, last_year_value = results[0]
+
         # Sort ascending for charts
-        time_series.sort(key=lambda x: x['date'])
+        time_series = [{'date': date, 'value': value} for date, value, _, _ in reversed(results)]
         
         # Calculate changes
         changes = {}
@@ -187,20 +203,15 @@ class EconomicIndicatorsGenerator:
         # For YoY indicators, the value IS the year-over-year change
         if mapping.get('is_yoy_change'):
             changes['yoy'] = current_value  # The value itself is YoY%
-            if len(results) >= 2:
-                last_month_value = results[1][1]
+            if last_month_value is not None:
                 changes['mom'] = current_value - last_month_value  # Difference in YoY rates
         else:
             # For absolute values, calculate changes normally
-            if len(results) >= 2:
-                last_month_value = results[1][1]
-                if last_month_value and last_month_value != 0:
-                    changes['mom'] = ((current_value - last_month_value) / abs(last_month_value)) * 100
+            if last_month_value and last_month_value != 0:
+                changes['mom'] = ((current_value - last_month_value) / abs(last_month_value)) * 100
             
-            if len(results) >= 13:
-                last_year_value = results[12][1]
-                if last_year_value and last_year_value != 0:
-                    changes['yoy'] = ((current_value - last_year_value) / abs(last_year_value)) * 100
+            if last_year_value and last_year_value != 0:
+                changes['yoy'] = ((current_value - last_year_value) / abs(last_year_value)) * 100
         
         return {
             'key': indicator_key,
@@ -208,20 +219,38 @@ class EconomicIndicatorsGenerator:
             'current_value': current_value,
             'unit': mapping['unit'],
             'category': mapping['category'],
-            'last_updated': results[0][0],
+            'last_updated': last_updated,
             'changes': changes,
             'time_series': time_series,
             'sparkline_data': [item['value'] for item in time_series[-12:]]  # Last 12 months for sparkline
         }
     
-    def get_all_indicators(self, conn: sqlite3.Connection) -> Dict[str, Any]:
-        """Get all economic indicators."""
+    def get_indicator_data(self, conn: sqlite3.Connection, indicator_key: str, 
+                          months: int = 24) -> Optional[Dict[str, Any]]:
+        """Get data for a specific indicator."""
+        mapping = self.indicator_mappings.get(indicator_key)
+        if not mapping:
+            return None
+
+        results = self.query_indicator_series(conn, [mapping['indicator_type']], months)
+        if mapping['indicator_type'] not in results:
+            logger.warning(f"No data found for {indicator_key}")
+            return None
+
+        return self.build_indicator(indicator_key, results[mapping['indicator_type']])
+    
+    def get_all_indicators(self, conn: sqlite3.Connection, months: int = 24) -> Dict[str, Any]:
+        """Get all economic indicators from a single scan of the indicators table."""
+        indicator_types = sorted({m['indicator_type'] for m in self.indicator_mappings.values()})
+        series = self.query_indicator_series(conn, indicator_types, months)
+
         indicators = {}
-        
-        for key in self.indicator_mappings:
-            data = self.get_indicator_data(conn, key)
-            if data:
-                indicators[key] = data
+        for key, mapping in self.indicator_mappings.items():
+            results = series.get(mapping['indicator_type'])
+            if not results:
+                logger.warning(f"No data found for {key}")
+                continue
+            indicators[key] = self.build_indicator(key, results)
         
         return indicators
     
@@ -359,18 +388,8 @@ class EconomicIndicatorsGenerator:
                 }
             }
             
-            # Archive previous version if exists
-            if self.output_path.exists():
-                archive_dir = self.archive_path / datetime.now().strftime('%Y-%m')
-                archive_dir.mkdir(parents=True, exist_ok=True)
-                archive_file = archive_dir / f"economic_indicators_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                self.output_path.rename(archive_file)
-                logger.info(f"📦 Archived previous version to {archive_file}")
-            
-            # Save the new file
-            self.output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.output_path, 'w') as f:
-                json.dump(output, f, indent=2)
+            # Save the new file (skipped if unchanged; new versions go to the archive)
+            write_export(self.output_path, output, archive_path=self.archive_path)
                 
             logger.info(f"✅ Economic indicators generated: {self.output_path}")
             
@@ -4,13 +4,20 @@ Generate Market Overview JSON for Calgary Housing Dashboard MVP
 Outputs market_overview.json with current snapshot and historical trends
 """
 
-import json
+import sys
 import sqlite3
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import logging
 
+from export_writer import write_export
+from indicator_lookup import get_indicator_history
+
+# Tuned, read-only connections come from data-lake/
+sys.path.insert(0, str(Path(__file__).parents[3] / 'data-lake'))
+from database import connect
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -24,7 +31,7 @@ class MarketOverviewGenerator:
         
     def connect_db(self) -> sqlite3.Connection:
         """Connect to the Calgary data database."""
-        return sqlite3.connect(self.db_path)
+        return connect(self.db_path, read_only=True)
     
     def get_latest_housing_data(self, conn: sqlite3.Connection) -> Dict[str, Any]:
         """Get the latest month's housing data."""
@@ -180,19 +187,10 @@ class MarketOverviewGenerator:
         drivers = {}
         
         # Get latest population
-        query = """
-        SELECT value, date 
-        FROM economic_indicators_monthly 
-        WHERE indicator_name LIKE '%Population%' 
-        ORDER BY date DESC 
-        LIMIT 13
-        """
-        cursor = conn.cursor()
-        cursor.execute(query)
-        pop_results = cursor.fetchall()
+        pop_results = get_indicator_history(conn, 'population', 13)
         
         if pop_results:
-            current_pop = pop_results[0][0]
+            current_pop = pop_results[0][1]
             drivers['population'] = {
                 'value': int(current_pop * 1000) if current_pop < 10000 else int(current_pop),  # Convert if needed
                 'formatted': f"{current_pop:.1f}M" if current_pop < 10000 else f"{int(current_pop):,}"
@@ -200,23 +198,15 @@ class MarketOverviewGenerator:
             
             # Calculate YoY growth if we have 13 months
             if len(pop_results) >= 13:
-                last_year_pop = pop_results[12][0]
+                last_year_pop = pop_results[12][1]
                 pop_growth = ((current_pop - last_year_pop) / last_year_pop) * 100
                 drivers['population']['change_yoy'] = round(pop_growth, 1)
         
         # Get latest housing starts
-        query = """
-        SELECT value, date 
-        FROM economic_indicators_monthly 
-        WHERE indicator_name LIKE '%Housing Starts%' 
-        ORDER BY date DESC 
-        LIMIT 2
-        """
-        cursor.execute(query)
-        starts_results = cursor.fetchall()
+        starts_results = get_indicator_history(conn, 'housing_starts', 2)
         
         if starts_results:
-            current_starts = starts_results[0][0]
+            current_starts = starts_results[0][1]
             drivers['housing_starts'] = {
                 'value': int(current_starts),
                 'formatted': f"{int(current_starts):,}"
@@ -224,7 +214,7 @@ class MarketOverviewGenerator:
             
             # Calculate MoM change
             if len(starts_results) >= 2:
-                last_month_starts = starts_results[1][0]
+                last_month_starts = starts_results[1][1]
                 starts_change = ((current_starts - last_month_starts) / last_month_starts) * 100
                 drivers['housing_starts']['change_mom'] = round(starts_change, 1)
         
@@ -235,33 +225,16 @@ class MarketOverviewGenerator:
         rates = {}
         
         # Bank of Canada rate
-        query = """
-        SELECT value 
-        FROM economic_indicators_monthly 
-        WHERE indicator_name LIKE '%Bank of Canada Interest Rate%' 
-        ORDER BY date DESC 
-        LIMIT 1
-        """
-        cursor = conn.cursor()
-        cursor.execute(query)
-        result = cursor.fetchone()
+        result = get_indicator_history(conn, 'bank_of_canada_rate', 1)
         
         if result:
-            rates['bank_of_canada'] = result[0]
+            rates['bank_of_canada'] = result[0][1]
             
         # Prime rate
-        query = """
-        SELECT value 
-        FROM economic_indicators_monthly 
-        WHERE indicator_name LIKE '%Prime Lending Rate%' 
-        ORDER BY date DESC 
-        LIMIT 1
-        """
-        cursor.execute(query)
-        result = cursor.fetchone()
+        result = get_indicator_history(conn, 'prime_lending_rate', 1)
         
         if result:
-            rates['prime'] = result[0]
+            rates['prime'] = result[0][1]
             
         # Placeholder for mortgage rates (to be updated manually)
         rates['five_year_fixed'] = 6.95  # Placeholder from spec
@@ -344,18 +317,8 @@ class MarketOverviewGenerator:
                 })
             }
             
-            # Archive previous version if exists
-            if self.output_path.exists():
-                archive_dir = self.archive_path / datetime.now().strftime('%Y-%m')
-                archive_dir.mkdir(parents=True, exist_ok=True)
-                archive_file = archive_dir / f"market_overview_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                self.output_path.rename(archive_file)
-                logger.info(f"📦 Archived previous version to {archive_file}")
-            
-            # Save the new file
-            self.output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.output_path, 'w') as f:
-                json.dump(output, f, indent=2)
+            # Save the new file (skipped if unchanged; new versions go to the archive)
+            write_export(self.output_path, output, archive_path=self.archive_path)
                 
             logger.info(f"✅ Market overview generated: {self.output_path}")
             
@@ -4,13 +4,19 @@ Generate Metadata JSON for Calgary Housing Dashboard MVP
 Outputs metadata.json with data freshness, quality scores, and source information
 """
 
-import json
+import sys
 import sqlite3
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 import logging
 
+from export_writer import write_export, read_manifest, MANIFEST_NAME
+
+# Tuned, read-only connections come from data-lake/
+sys.path.insert(0, str(Path(__file__).parents[3] / 'data-lake'))
+from database import connect
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -25,7 +31,7 @@ class MetadataGenerator:
     
     def connect_db(self) -> sqlite3.Connection:
         """Connect to the Calgary data database."""
-        return sqlite3.connect(self.db_path)
+        return connect(self.db_path, read_only=True)
     
     def get_data_freshness(self, conn: sqlite3.Connection) -> Dict[str, Any]:
         """Check freshness of all data sources."""
@@ -157,9 +163,10 @@ class MetadataGenerator:
     def get_export_info(self) -> Dict[str, Any]:
         """Get information about exported JSON files."""
         exports = {}
+        manifest = read_manifest(self.data_path)['files']
         
         for json_file in self.data_path.glob('*.json'):
-            if json_file.name != 'metadata.json':
+            if json_file.name not in ('metadata.json', MANIFEST_NAME):
                 stat = json_file.stat()
                 exports[json_file.stem] = {
                     'filename': json_file.name,
@@ -168,6 +175,14 @@ class MetadataGenerator:
                     'last_modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
                     'exists': True
                 }
+                
+                # Content hash and compressed size from the export manifest
+                entry = manifest.get(json_file.name)
+                if entry:
+                    exports[json_file.stem]['sha256'] = entry['sha256']
+                    exports[json_file.stem]['encoding'] = entry['encoding']
+                    if 'gz_bytes' in entry:
+                        exports[json_file.stem]['gzip_size_formatted'] = self.format_file_size(entry['gz_bytes'])
         
         # Check for expected files that might be missing
         expected_files = ['market_overview', 'economic_indicators', 'district_data', 'rate_data']
@@ -322,9 +337,7 @@ class MetadataGenerator:
             # No need to archive metadata (it's meta!)
             
             # Save the file
-            self.output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.output_path, 'w') as f:
-                json.dump(output, f, indent=2)
+            write_export(self.output_path, output)
                 
             logger.info(f"✅ Metadata generated: {self.output_path}")
             
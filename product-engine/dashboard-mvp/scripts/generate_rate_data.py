@@ -4,13 +4,21 @@ Generate Rate Data JSON for Calgary Housing Dashboard MVP
 Outputs rate_data.json with interest rates and mortgage calculations
 """
 
-import json
+import sys
 import sqlite3
+import numpy as np
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 import logging
 
+from export_writer import write_export
+from indicator_lookup import get_indicator_history
+
+# Tuned, read-only connections come from data-lake/
+sys.path.insert(0, str(Path(__file__).parents[3] / 'data-lake'))
+from database import connect
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -30,37 +38,28 @@ class RateDataGenerator:
             'variable': 6.70,  # Typically Prime - 0.50
             'last_updated': '2025-07-01'
         }
+        
+        # Affordability surface axes (home prices come from district benchmark prices)
+        self.surface_down_payments = [5, 10, 15, 20, 25]
+        self.surface_amortizations = [25, 30]
+        self.surface_rate_months = 24  # Historical variable rates (prime + current spread)
+        
+        # Qualification assumptions, shared with generate_affordability_metrics
+        self.gds_ratio = 0.32
+        self.property_tax_rate = 0.01  # ~1% annually
+        self.monthly_heating = 150  # Estimated
     
     def connect_db(self) -> sqlite3.Connection:
         """Connect to the Calgary data database."""
-        return sqlite3.connect(self.db_path)
+        return connect(self.db_path, read_only=True)
     
     def get_rate_history(self, conn: sqlite3.Connection, months: int = 60) -> Dict[str, List]:
         """Get historical rate data (5 years)."""
         # Bank of Canada rate
-        query = """
-        SELECT date, value
-        FROM economic_indicators_monthly
-        WHERE indicator_name LIKE '%Bank of Canada Interest Rate%'
-        ORDER BY date DESC
-        LIMIT ?
-        """
-        
-        cursor = conn.cursor()
-        cursor.execute(query, (months,))
-        boc_results = cursor.fetchall()
+        boc_results = get_indicator_history(conn, 'bank_of_canada_rate', months)
         
         # Prime rate
-        query = """
-        SELECT date, value
-        FROM economic_indicators_monthly
-        WHERE indicator_name LIKE '%Prime Lending Rate%'
-        ORDER BY date DESC
-        LIMIT ?
-        """
-        
-        cursor.execute(query, (months,))
-        prime_results = cursor.fetchall()
+        prime_results = get_indicator_history(conn, 'prime_lending_rate', months)
         
         # Convert to time series format
         boc_history = []
@@ -85,38 +84,21 @@ class RateDataGenerator:
         rates = {}
         
         # Bank of Canada rate
-        query = """
-        SELECT value, date
-        FROM economic_indicators_monthly
-        WHERE indicator_name LIKE '%Bank of Canada Interest Rate%'
-        ORDER BY date DESC
-        LIMIT 1
-        """
-        cursor = conn.cursor()
-        cursor.execute(query)
-        result = cursor.fetchone()
+        result = get_indicator_history(conn, 'bank_of_canada_rate', 1)
         
         if result:
             rates['bank_of_canada'] = {
-                'value': result[0],
-                'date': result[1]
+                'value': result[0][1],
+                'date': result[0][0]
             }
         
         # Prime rate
-        query = """
-        SELECT value, date
-        FROM economic_indicators_monthly
-        WHERE indicator_name LIKE '%Prime Lending Rate%'
-        ORDER BY date DESC
-        LIMIT 1
-        """
-        cursor.execute(query)
-        result = cursor.fetchone()
+        result = get_indicator_history(conn, 'prime_lending_rate', 1)
         
         if result:
             rates['prime'] = {
-                'value': result[0],
-                'date': result[1]
+                'value': result[0][1],
+                'date': result[0][0]
             }
         
         # Add mortgage rates (manual for now)
@@ -197,6 +179,113 @@ class RateDataGenerator:
         """Calculate stress test rate (higher of rate + 2% or 5.25%)."""
         return max(rate + 2.0, 5.25)
     
+    def get_benchmark_prices(self, conn: sqlite3.Connection) -> List[Dict[str, Any]]:
+        """Latest benchmark price for every district and property type."""
+        query = """
+        SELECT district, property_type, benchmark_price
+        FROM housing_district_monthly
+        WHERE date = (SELECT MAX(date) FROM housing_district_monthly)
+          AND benchmark_price > 0
+        ORDER BY district, property_type
+        """
+        cursor = conn.cursor()
+        cursor.execute(query)
+        return [
+            {'district': district, 'property_type': property_type, 'price': int(price)}
+            for district, property_type, price in cursor.fetchall()
+        ]
+    
+    def get_surface_rates(self, current_rates: Dict[str, Any],
+                          history: Dict[str, List]) -> List[Dict[str, Any]]:
+        """Rate axis: current posted rates plus what a variable mortgage cost each recent month."""
+        rates = [
+            {'label': product, 'date': self.mortgage_rates['last_updated'], 'rate': self.mortgage_rates[product]}
+            for product in ('five_year_fixed', 'three_year_fixed', 'variable')
+        ]
+        
+        if 'prime' in current_rates and history.get('prime_rate'):
+            spread = self.mortgage_rates['variable'] - current_rates['prime']['value']
+            for point in history['prime_rate'][-self.surface_rate_months:]:
+                rates.append({
+                    'label': 'variable_historical',
+                    'date': point['date'],
+                    'rate': round(point['value'] + spread, 2)
+                })
+        
+        return rates
+    
+    def calculate_payment_factors(self, rates: np.ndarray, amortizations: np.ndarray) -> np.ndarray:
+        """Monthly payment per dollar borrowed, shape (amortizations, rates).
+        
+        Same formula as calculate_mortgage_payment, broadcast over both axes.
+        """
+        monthly_rate = (rates / 100 / 12)[np.newaxis, :]
+        num_payments = (amortizations * 12)[:, np.newaxis]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth = (1 + monthly_rate) ** num_payments
+            factors = monthly_rate * growth / (growth - 1)
+        return np.where(monthly_rate > 0, factors, 1 / num_payments)
+    
+    def calculate_minimum_down_payment(self, prices: np.ndarray) -> np.ndarray:
+        """Minimum down payment: 5% of the first $500k, 10% of the rest, 20% from $1M."""
+        tiered = 0.05 * np.minimum(prices, 500000) + 0.10 * np.maximum(prices - 500000, 0)
+        return np.where(prices >= 1000000, 0.20 * prices, tiered)
+    
+    def generate_affordability_surface(self, homes: List[Dict[str, Any]],
+                                       rates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Payment, interest and qualifying income over price x down payment x amortization x rate."""
+        prices = np.array([home['price'] for home in homes], dtype=float)
+        down_pcts = np.array(self.surface_down_payments, dtype=float)
+        amortizations = np.array(self.surface_amortizations, dtype=float)
+        contract_rates = np.array([rate['rate'] for rate in rates], dtype=float)
+        
+        # Axes: p = price, d = down payment, a = amortization, r = rate
+        principal = prices[:, np.newaxis] * (1 - down_pcts / 100)                     # (p, d)
+        eligible = prices[:, np.newaxis] * down_pcts / 100 >= \
+            self.calculate_minimum_down_payment(prices)[:, np.newaxis]                  # (p, d)
+        
+        payment = principal[:, :, np.newaxis, np.newaxis] * \
+            self.calculate_payment_factors(contract_rates, amortizations)              # (p, d, a, r)
+        total_interest = payment * (amortizations * 12)[:, np.newaxis] - \
+            principal[:, :, np.newaxis, np.newaxis]
+        
+        # Lenders qualify borrowers at the stress test rate, not the contract rate
+        stress_rates = np.maximum(contract_rates + 2.0, 5.25)
+        stress_payment = principal[:, :, np.newaxis, np.newaxis] * \
+            self.calculate_payment_factors(stress_rates, amortizations)
+        monthly_costs = prices * self.property_tax_rate / 12 + self.monthly_heating
+        qualifying_income = (stress_payment + monthly_costs[:, np.newaxis, np.newaxis, np.newaxis]) * 12 / self.gds_ratio
+        
+        # Cells below the minimum down payment are not financeable
+        mask = np.broadcast_to(eligible[:, :, np.newaxis, np.newaxis], payment.shape)
+        
+        def to_grid(values: np.ndarray) -> List:
+            grid = np.rint(values).astype(np.int64).astype(object)
+            grid[~mask] = None
+            return grid.tolist()
+        
+        return {
+            'dimensions': ['home', 'down_payment_percent', 'amortization_years', 'rate'],
+            'axes': {
+                'home': homes,
+                'down_payment_percent': self.surface_down_payments,
+                'amortization_years': self.surface_amortizations,
+                'rate': rates
+            },
+            'monthly_payment': to_grid(payment),
+            'total_interest': to_grid(total_interest),
+            'qualifying_income': to_grid(qualifying_income),
+            'assumptions': {
+                'gds_ratio': self.gds_ratio,
+                'property_tax_rate': self.property_tax_rate,
+                'monthly_heating': self.monthly_heating,
+                'stress_test': 'higher of contract rate + 2% or 5.25%',
+                'minimum_down_payment': '5% of first $500k, 10% of remainder, 20% from $1M',
+                'note': 'Null cells are below the minimum down payment'
+            }
+        }
+    
     def get_rate_environment_summary(self, current_rates: Dict[str, Any], 
                                    history: Dict[str, List]) -> Dict[str, Any]:
         """Generate summary of current rate environment."""
@@ -245,7 +334,7 @@ class RateDataGenerator:
         
         # Income required for different price points
         # Using standard 32% GDS ratio
-        gds_ratio = 0.32
+        gds_ratio = self.gds_ratio
         
         price_points = [300000, 450000, 600000, 770000]
         
@@ -258,8 +347,8 @@ class RateDataGenerator:
             )['monthly_payment']
             
             # Add estimated property tax and heating
-            property_tax = price * 0.01 / 12  # ~1% annually
-            heating = 150  # Estimated
+            property_tax = price * self.property_tax_rate / 12
+            heating = self.monthly_heating
             
             total_housing_cost = payment + property_tax + heating
             required_income = (total_housing_cost * 12) / gds_ratio
@@ -299,6 +388,12 @@ class RateDataGenerator:
             # Generate affordability metrics
             affordability = self.generate_affordability_metrics()
             
+            # Full affordability grid for heatmaps
+            surface = self.generate_affordability_surface(
+                self.get_benchmark_prices(conn),
+                self.get_surface_rates(current_rates, rate_history)
+            )
+            
             # Build output structure
             output = {
                 'metadata': {
@@ -313,6 +408,7 @@ class RateDataGenerator:
                 'stress_test_rates': stress_test_rates,
                 'rate_environment': rate_summary,
                 'affordability_metrics': affordability,
+                'affordability_surface': surface,
                 'calculator_defaults': {
                     'amortization_years': 25,
                     'payment_frequency': 'monthly',
@@ -320,18 +416,8 @@ class RateDataGenerator:
                 }
             }
             
-            # Archive previous version if exists
-            if self.output_path.exists():
-                archive_dir = self.archive_path / datetime.now().strftime('%Y-%m')
-                archive_dir.mkdir(parents=True, exist_ok=True)
-                archive_file = archive_dir / f"rate_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                self.output_path.rename(archive_file)
-                logger.info(f"📦 Archived previous version to {archive_file}")
-            
-            # Save the new file
-            self.output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.output_path, 'w') as f:
-                json.dump(output, f, indent=2)
+            # Save the new file (skipped if unchanged; new versions go to the archive)
+            write_export(self.output_path, output, archive_path=self.archive_path)
                 
             logger.info(f"✅ Rate data generated: {self.output_path}")
             
@@ -343,6 +429,7 @@ class RateDataGenerator:
             print(f"5-Year Fixed (manual): {self.mortgage_rates['five_year_fixed']}%")
             print(f"Variable (manual): {self.mortgage_rates['variable']}%")
             print(f"\nPayment scenarios generated: {len(payment_scenarios)}")
+            print(f"Affordability surface cells: {np.prod([len(v) for v in surface['axes'].values()]):,}")
             print(f"Historical data points: {len(rate_history['bank_of_canada'])}")
             print(f"Rate environment: {rate_summary['current_environment']}")
             print(f"Trend: {rate_summary['trend']}")
@@ -4,13 +4,19 @@ Generate Rental Market JSON for Calgary Housing Dashboard
 Outputs rental_market.json with CMHC data and rental market insights
 """
 
-import json
+import sys
 import sqlite3
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any
 import logging
 
+from export_writer import write_export
+
+# Tuned, read-only connections come from data-lake/
+sys.path.insert(0, str(Path(__file__).parents[3] / 'data-lake'))
+from database import connect
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -23,7 +29,7 @@ class RentalMarketGenerator:
         
     def connect_db(self) -> sqlite3.Connection:
         """Connect to the Calgary data database."""
-        return sqlite3.connect(self.db_path)
+        return connect(self.db_path, read_only=True)
     
     def get_cmhc_data(self, conn: sqlite3.Connection) -> Dict[str, Any]:
         """Get CMHC rental market data."""
@@ -272,9 +278,7 @@ class RentalMarketGenerator:
             }
             
             # Save the file
-            self.output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.output_path, 'w') as f:
-                json.dump(output, f, indent=2)
+            write_export(self.output_path, output)
                 
             logger.info(f"✅ Rental market data generated: {self.output_path}")
             
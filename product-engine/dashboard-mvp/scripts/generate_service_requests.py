@@ -4,26 +4,70 @@ Generate Service Requests (311) JSON for Calgary Housing Dashboard
 Outputs service_requests_311.json with neighborhood quality indicators
 """
 
-import json
+import sys
 import sqlite3
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any
 import logging
 
+from export_writer import write_export
+
+# Tuned, read-only connections come from data-lake/
+sys.path.insert(0, str(Path(__file__).parents[3] / 'data-lake'))
+from database import connect
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Same shape as the 311 rollup tables, aggregated on the fly for databases that
+# haven't run data-lake/migrations/007_service_requests_311_rollups.sql yet
+ROLLUP_FALLBACKS = {
+    'service_requests_311_category_rollup': """(
+        SELECT 
+            year_month,
+            MAX(month) as month,
+            service_category,
+            SUM(total_requests) as total_requests,
+            COUNT(*) as record_count
+        FROM service_requests_311_monthly
+        GROUP BY year_month, service_category
+    )""",
+    'service_requests_311_community_rollup': """(
+        SELECT 
+            year_month,
+            community_name,
+            service_category,
+            SUM(total_requests) as total_requests
+        FROM service_requests_311_monthly
+        WHERE community_name IS NOT NULL
+        GROUP BY year_month, community_name, service_category
+    )"""
+}
+
 class ServiceRequestsGenerator:
     """Generate 311 service request data for dashboard."""
     
     def __init__(self):
         self.db_path = Path(__file__).parents[3] / 'data-lake' / 'calgary_data.db'
         self.output_path = Path(__file__).parent.parent / 'data' / 'service_requests_311.json'
+        self._rollup_sources = {}
         
     def connect_db(self) -> sqlite3.Connection:
         """Connect to the Calgary data database."""
-        return sqlite3.connect(self.db_path)
+        return connect(self.db_path, read_only=True)
+    
+    def get_rollup_source(self, conn: sqlite3.Connection, rollup: str) -> str:
+        """Monthly 311 rollup table if it exists, otherwise an equivalent aggregate."""
+        if rollup not in self._rollup_sources:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (rollup,))
+            if cursor.fetchone():
+                self._rollup_sources[rollup] = rollup
+            else:
+                logger.warning(f"⚠️  {rollup} not found - aggregating service_requests_311_monthly (run data-lake/migrate.py)")
+                self._rollup_sources[rollup] = ROLLUP_FALLBACKS[rollup]
+        return self._rollup_sources[rollup]
     
     def get_recent_trends(self, conn: sqlite3.Connection, months: int = 12) -> Dict[str, Any]:
         """Get recent 311 request trends."""
@@ -40,12 +84,11 @@ class ServiceRequestsGenerator:
         SELECT 
             year_month,
             service_category,
-            SUM(total_requests) as total_requests
-        FROM service_requests_311_monthly
+            total_requests
+        FROM {rollup}
         WHERE year_month >= ?
-        GROUP BY year_month, service_category
         ORDER BY year_month DESC, service_category
-        """
+        """.format(rollup=self.get_rollup_source(conn, 'service_requests_311_category_rollup'))
         
         cursor = conn.cursor()
         cursor.execute(query, (cutoff_year_month,))
@@ -75,17 +118,18 @@ class ServiceRequestsGenerator:
         cutoff_month = cutoff_date.month
         cutoff_year_month = f"{cutoff_year:04d}-{cutoff_month:02d}"
         
+        # Average per community-month row, as record_count tracks the rows summed
         query = """
         SELECT 
             service_category,
             SUM(total_requests) as total_requests,
-            AVG(total_requests) as avg_monthly_requests
-        FROM service_requests_311_monthly
+            SUM(total_requests) * 1.0 / SUM(record_count) as avg_monthly_requests
+        FROM {rollup}
         WHERE year_month >= ?
         GROUP BY service_category
         ORDER BY total_requests DESC
         LIMIT 10
-        """
+        """.format(rollup=self.get_rollup_source(conn, 'service_requests_311_category_rollup'))
         
         cursor = conn.cursor()
         cursor.execute(query, (cutoff_year_month,))
@@ -110,12 +154,15 @@ class ServiceRequestsGenerator:
         SELECT 
             service_category,
             month,
-            AVG(total_requests) as avg_requests
-        FROM service_requests_311_monthly
-        WHERE service_category IN ({})
+            SUM(total_requests) * 1.0 / SUM(record_count) as avg_requests
+        FROM {rollup}
+        WHERE service_category IN ({placeholders})
         GROUP BY service_category, month
         ORDER BY service_category, month
-        """.format(','.join('?' * len(seasonal_categories)))
+        """.format(
+            rollup=self.get_rollup_source(conn, 'service_requests_311_category_rollup'),
+            placeholders=','.join('?' * len(seasonal_categories))
+        )
         
         cursor = conn.cursor()
         cursor.execute(query, seasonal_categories)
@@ -147,9 +194,8 @@ class ServiceRequestsGenerator:
                 community_name,
                 SUM(total_requests) as total_requests,
                 COUNT(DISTINCT service_category) as issue_diversity
-            FROM service_requests_311_monthly
+            FROM {rollup}
             WHERE year_month >= ?
-            AND community_name IS NOT NULL
             GROUP BY community_name
         ),
         community_stats AS (
@@ -173,7 +219,7 @@ class ServiceRequestsGenerator:
         CROSS JOIN community_stats cs
         ORDER BY quality_score DESC
         LIMIT 20
-        """
+        """.format(rollup=self.get_rollup_source(conn, 'service_requests_311_community_rollup'))
         
         cursor = conn.cursor()
         cursor.execute(query, (cutoff_year_month,))
@@ -216,10 +262,14 @@ class ServiceRequestsGenerator:
                     COUNT(DISTINCT year_month) as months,
                     SUM(total_requests) as total_requests,
                     COUNT(DISTINCT service_category) as categories,
-                    COUNT(DISTINCT community_name) as communities
-                FROM service_requests_311_monthly
+                    (SELECT COUNT(DISTINCT community_name) FROM {community_rollup}
+                     WHERE year_month >= ?) as communities
+                FROM {category_rollup}
                 WHERE year_month >= ?
-            """, (cutoff_year_month,))
+            """.format(
+                community_rollup=self.get_rollup_source(conn, 'service_requests_311_community_rollup'),
+                category_rollup=self.get_rollup_source(conn, 'service_requests_311_category_rollup')
+            ), (cutoff_year_month, cutoff_year_month))
             months, total, categories, communities = cursor.fetchone()
             
             # Build output
@@ -248,9 +298,7 @@ class ServiceRequestsGenerator:
             }
             
             # Save the file
-            self.output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.output_path, 'w') as f:
-                json.dump(output, f, indent=2)
+            write_export(self.output_path, output)
                 
             logger.info(f"✅ Service requests data generated: {self.output_path}")
             
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Economic Indicator Lookup
+Resolves indicator types to integer keys in the economic_indicator dimension so exports
+seek the (indicator_id, date) index instead of pattern-matching indicator names
+"""
+
+import sqlite3
+from typing import Dict, List, Any, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+_warned_missing_dimension = False
+
+
+def indicator_keys(conn: sqlite3.Connection, indicator_types: List[str]) -> Tuple[str, Dict[str, Any]]:
+    """Column to filter economic_indicators_monthly on, and each indicator type's key in it.
+
+    Uses integer ids from economic_indicator when the dimension exists; falls back to
+    indicator_type on databases that predate migration 008.
+    """
+    global _warned_missing_dimension
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'economic_indicator'")
+    if not cursor.fetchone():
+        if not _warned_missing_dimension:
+            logger.warning("⚠️  economic_indicator dimension missing - run data-lake/migrate.py")
+            _warned_missing_dimension = True
+        return 'indicator_type', {t: t for t in indicator_types}
+
+    placeholders = ', '.join('?' for _ in indicator_types)
+    cursor.execute(f"""
+        SELECT indicator_type, indicator_id
+        FROM economic_indicator
+        WHERE indicator_type IN ({placeholders})
+    """, list(indicator_types))
+    return 'indicator_id', dict(cursor.fetchall())
+
+
+def get_indicator_history(conn: sqlite3.Connection, indicator_type: str,
+                          limit: int) -> List[Tuple[str, float]]:
+    """Latest (date, value) observations for one indicator, newest first."""
+    column, keys = indicator_keys(conn, [indicator_type])
+    if indicator_type not in keys:
+        return []
+
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT date, value
+        FROM economic_indicators_monthly
+        WHERE {column} = ?
+        ORDER BY date DESC
+        LIMIT ?
+    """, (keys[indicator_type], limit))
+    return cursor.fetchall()
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Local Dashboard Read API
+Serves the generated JSON exports and filtered slices of calgary_data.db over HTTP,
+with an LRU result cache keyed on source table fingerprints, ETags and gzip
+"""
+
+import sys
+import json
+import gzip
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+from typing import Dict, Any, Optional, Tuple
+import logging
+
+from export_state import ExportStateTracker
+from indicator_lookup import indicator_keys
+
+sys.path.insert(0, str(Path(__file__).parents[3] / 'data-lake'))
+from database import get_pool
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Parameterised slices: each filter is only added to the WHERE clause when supplied
+API_QUERIES = {
+    'housing/city': {
+        'tables': ['housing_city_monthly'],
+        'select': """
+            SELECT date, property_type, sales, new_listings, inventory, days_on_market,
+                   benchmark_price, median_price, average_price
+            FROM housing_city_monthly
+        """,
+        'filters': {
+            'property_type': 'property_type = ?',
+            'start': 'date >= ?',
+            'end': 'date <= ?'
+        },
+        'order_by': 'date, property_type'
+    },
+    'housing/district': {
+        'tables': ['housing_district_monthly'],
+        'select': """
+            SELECT date, district, property_type, new_sales, new_listings, inventory,
+                   months_supply, benchmark_price, yoy_price_change, mom_price_change
+            FROM housing_district_monthly
+        """,
+        'filters': {
+            'district': 'district = ?',
+            'property_type': 'property_type = ?',
+            'start': 'date >= ?',
+            'end': 'date <= ?'
+        },
+        'order_by': 'district, property_type, date'
+    },
+    'economic': {
+        'tables': ['economic_indicators_monthly'],
+        'select': """
+            SELECT date, indicator_type, indicator_name, value, unit
+            FROM economic_indicators_monthly
+        """,
+        # Resolved through the economic_indicator dimension in query()
+        'filters': {
+            'indicator': '{indicator_column} = ?',
+            'start': 'date >= ?',
+            'end': 'date <= ?'
+        },
+        'order_by': 'indicator_type, date'
+    }
+}
+
+# Bodies smaller than this go out uncompressed
+GZIP_MIN_BYTES = 1024
+
+
+def normalise_date(value: str, end: bool = False) -> str:
+    """Accept YYYY, YYYY-MM or YYYY-MM-DD and return a comparable YYYY-MM-DD bound."""
+    parts = value.split('-')
+    if not all(p.isdigit() for p in parts) or len(parts) > 3 or len(parts[0]) != 4:
+        raise ValueError(f"Invalid date '{value}' (expected YYYY, YYYY-MM or YYYY-MM-DD)")
+    defaults = ['12', '31'] if end else ['01', '01']
+    parts = parts + defaults[len(parts) - 1:]
+    return '-'.join(p.zfill(2) for p in parts)
+
+
+class CachedResponse:
+    """A serialised response body with its compressed form and ETag."""
+
+    def __init__(self, body: bytes, content_type: str = 'application/json',
+                 gzipped: Optional[bytes] = None, etag: Optional[str] = None):
+        self.body = body
+        self.content_type = content_type
+        self.etag = etag or f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+        if gzipped is None and len(body) >= GZIP_MIN_BYTES:
+            gzipped = gzip.compress(body, compresslevel=6, mtime=0)
+        self.gzipped = gzipped
+
+
+class DashboardDataAPI:
+    """Query layer with an LRU cache invalidated by table fingerprints."""
+
+    def __init__(self, db_path: Path, data_dir: Path, cache_size: int = 256,
+                 fingerprint_ttl: float = 2.0):
+        self.db_path = Path(db_path)
+        self.data_dir = Path(data_dir)
+        self.cache_size = cache_size
+        self.fingerprint_ttl = fingerprint_ttl
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool = get_pool(self.db_path)  # Read-only connections shared by the server threads
+        self._fingerprints = {}  # table -> (checked_at, fingerprint)
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def table_fingerprint(self, table: str) -> Any:
+        """Table fingerprint, re-read at most once per fingerprint_ttl seconds."""
+        now = time.monotonic()
+        checked = self._fingerprints.get(table)
+        if checked and now - checked[0] < self.fingerprint_ttl:
+            return checked[1]
+
+        with self._pool.reader() as conn:
+            fingerprint = ExportStateTracker.table_fingerprint(conn, table)
+        self._fingerprints[table] = (now, fingerprint)
+        return fingerprint
+
+    def _cache_get(self, key: Tuple) -> Optional[CachedResponse]:
+        with self._lock:
+            response = self._cache.get(key)
+            if response is not None:
+                self._cache.move_to_end(key)
+                self.stats['hits'] += 1
+            else:
+                self.stats['misses'] += 1
+            return response
+
+    def _cache_put(self, key: Tuple, response: CachedResponse) -> None:
+        with self._lock:
+            self._cache[key] = response
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def query(self, endpoint: str, params: Dict[str, str]) -> CachedResponse:
+        """Run (or serve from cache) a parameterised slice."""
+        spec = API_QUERIES[endpoint]
+        unknown = set(params) - set(spec['filters'])
+        if unknown:
+            raise ValueError(f"Unknown parameter(s): {', '.join(sorted(unknown))}")
+
+        values = {}
+        for name, value in params.items():
+            values[name] = normalise_date(value, end=(name == 'end')) if name in ('start', 'end') else value
+
+        # Any change to a source table changes the key, so stale entries simply age out
+        fingerprints = json.dumps([self.table_fingerprint(t) for t in spec['tables']], sort_keys=True)
+        key = (endpoint, tuple(sorted(values.items())), fingerprints)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        with self._pool.reader() as conn:
+            conditions = [spec['filters'][name] for name in values]
+            args = list(values.values())
+            if 'indicator' in values:
+                column, keys = indicator_keys(conn, [values['indicator']])
+                position = list(values).index('indicator')
+                conditions[position] = conditions[position].format(indicator_column=column)
+                args[position] = keys.get(values['indicator'])
+            sql = spec['select']
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
+            sql += f" ORDER BY {spec['order_by']}"
+
+            cursor = conn.cursor()
+            cursor.execute(sql, args)
+            columns = [d[0] for d in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+        body = json.dumps({
+            'endpoint': endpoint,
+            'filters': values,
+            'count': len(rows),
+            'data': rows
+        }, separators=(',', ':')).encode()
+        response = CachedResponse(body)
+        self._cache_put(key, response)
+        return response
+
+    def export_file(self, name: str) -> Optional[CachedResponse]:
+        """Serve a generated export, reusing its precompressed .gz sibling."""
+        path = self.data_dir / name
+        if path.suffix != '.json' or path.parent != self.data_dir or not path.exists():
+            return None
+
+        stat = path.stat()
+        key = ('file', name, stat.st_mtime_ns, stat.st_size)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        body = path.read_bytes()
+        gz_path = path.with_name(path.name + '.gz')
+        gzipped = gz_path.read_bytes() if gz_path.exists() and gz_path.stat().st_mtime_ns >= stat.st_mtime_ns else None
+        response = CachedResponse(body, gzipped=gzipped, etag=f'"{hashlib.sha256(body).hexdigest()[:20]}"')
+        self._cache_put(key, response)
+        return response
+
+
+class DashboardRequestHandler(BaseHTTPRequestHandler):
+    """Route /data/<export>.json, /api/<slice> and /api/health."""
+
+    api = None  # DashboardDataAPI, set by serve()
+    server_version = 'CalgaryAnalyticaAPI/1.0'
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        try:
+            if url.path.startswith('/data/'):
+                response = self.api.export_file(url.path[len('/data/'):])
+                if response is None:
+                    return self.send_error_json(404, f"No export at {url.path}")
+            elif url.path == '/api/health':
+                body = json.dumps({'status': 'ok', 'cache': {**self.api.stats, 'entries': len(self.api._cache)}})
+                response = CachedResponse(body.encode())
+            elif url.path.startswith('/api/') and url.path[len('/api/'):] in API_QUERIES:
+                params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                response = self.api.query(url.path[len('/api/'):], params)
+            else:
+                return self.send_error_json(404, f"Unknown endpoint {url.path}")
+        except ValueError as e:
+            return self.send_error_json(400, str(e))
+        except sqlite3.Error as e:
+            logger.error(f"❌ Query failed for {self.path}: {e}")
+            return self.send_error_json(500, 'Database error')
+
+        self.send_cached(response)
+
+    def send_cached(self, response: CachedResponse) -> None:
+        """Send a response, honouring If-None-Match and Accept-Encoding."""
+        use_gzip = response.gzipped is not None and 'gzip' in self.headers.get('Accept-Encoding', '')
+        # Each encoding is its own representation, so it gets its own strong ETag
+        etag = f'{response.etag[:-1]}-gz"' if use_gzip else response.etag
+
+        if self.etag_matches(etag):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return
+
+        body = response.gzipped if use_gzip else response.body
+
+        self.send_response(200)
+        self.send_header('Content-Type', response.content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')  # Revalidate with ETag on every use
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def etag_matches(self, etag: str) -> bool:
+        """Whether If-None-Match lists this ETag (a comma-separated list, weak comparison, or *)."""
+        header = self.headers.get('If-None-Match')
+        if not header:
+            return False
+        tags = {tag.strip().removeprefix('W/') for tag in header.split(',')}
+        return '*' in tags or etag in tags
+
+    def send_error_json(self, status: int, message: str) -> None:
+        body = json.dumps({'error': message}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+def serve(api: DashboardDataAPI, host: str = '127.0.0.1', port: int = 8765) -> ThreadingHTTPServer:
+    """Create the HTTP server (call serve_forever() to run it)."""
+    handler = type('BoundDashboardRequestHandler', (DashboardRequestHandler,), {'api': api})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    """Run the local dashboard read API."""
+    import argparse
+
+    default_db = Path(__file__).parents[3] / 'data-lake' / 'calgary_data.db'
+    default_data = Path(__file__).parent.parent / 'data'
+
+    parser = argparse.ArgumentParser(description='Local read API for dashboard data')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Bind address')
+    parser.add_argument('--port', type=int, default=8765, help='Port')
+    parser.add_argument('--db', type=str, default=str(default_db), help='Database path')
+    parser.add_argument('--data-dir', type=str, default=str(default_data), help='Directory of generated exports')
+    parser.add_argument('--cache-size', type=int, default=256, help='Maximum cached responses')
+
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        logger.error(f"❌ Database not found: {args.db}")
+        sys.exit(1)
+
+    api = DashboardDataAPI(Path(args.db), Path(args.data_dir), cache_size=args.cache_size)
+    server = serve(api, args.host, args.port)
+
+    logger.info(f"🌐 Serving dashboard API on http://{args.host}:{args.port}")
+    logger.info(f"   Exports: /data/<export>.json   Slices: {', '.join('/api/' + e for e in API_QUERIES)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("👋 Shutting down")
+    finally:
+        server.server_close()
+        api._pool.close()
+
+
+if __name__ == "__main__":
+    main()
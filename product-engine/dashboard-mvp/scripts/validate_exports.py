@@ -9,6 +9,8 @@ from pathlib import Path
 from typing import Dict, List, Tuple
 import sys
 
+from export_writer import load_export
+
 class ExportValidator:
     """Validate dashboard JSON exports against requirements."""
     
@@ -151,8 +153,8 @@ class ExportValidator:
                 continue
             
             try:
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
+                # Columnar exports are expanded so validators see the original structure
+                data = load_export(filepath)
                 validator(data)
             except json.JSONDecodeError as e:
                 self.errors.append(f"{filename}: Invalid JSON - {e}")